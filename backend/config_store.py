@@ -1,4 +1,4 @@
-# File Version: 0.30.8
+# File Version: 0.30.10
 from __future__ import annotations
 
 import json
@@ -251,6 +251,7 @@ class CameraConfig:
     stream_resolution: str = "1280x720"
     stream_framerate: int = 15
     jpeg_quality: int = 80
+    adaptive_quality: bool = False  # Lower JPEG quality while encoding can't keep up
     stream_auth_enabled: bool = False  # HTTP Basic auth for stream access
     # Motion detection
     motion_detection_enabled: bool = True
@@ -291,6 +292,7 @@ class CameraConfig:
             "stream_resolution": self.stream_resolution,
             "stream_framerate": self.stream_framerate,
             "jpeg_quality": self.jpeg_quality,
+            "adaptive_quality": self.adaptive_quality,
             "stream_auth_enabled": self.stream_auth_enabled,
             "motion_detection_enabled": self.motion_detection_enabled,
             "motion_threshold": self.motion_threshold,
@@ -328,6 +330,7 @@ class CameraConfig:
             stream_resolution=data.get("stream_resolution", data.get("resolution", "1280x720")),
             stream_framerate=data.get("stream_framerate", data.get("framerate", 15)),
             jpeg_quality=data.get("jpeg_quality", 80),
+            adaptive_quality=data.get("adaptive_quality", False),
             motion_detection_enabled=data.get("motion_detection_enabled", True),
             motion_threshold=data.get("motion_threshold", 1500),
             motion_frames=data.get("motion_frames", 1),
@@ -964,6 +967,7 @@ class ConfigStore:
                 ], "value": cam.stream_resolution},
                 {"id": "streamFramerate", "label": "Images/sec sortie", "type": "number", "value": cam.stream_framerate, "min": 1, "max": 30},
                 {"id": "jpegQuality", "label": "Qualité JPEG (%)", "type": "range", "value": cam.jpeg_quality, "min": 10, "max": 100},
+                {"id": "adaptiveQuality", "label": "Qualité adaptative", "type": "bool", "value": cam.adaptive_quality},
                 {"id": "streamAuthEnabled", "label": "Authentification requise", "type": "bool", "value": cam.stream_auth_enabled},
                 {"id": "streamUrl", "label": "URL du stream", "type": "html", "html": self._get_stream_url_html(cam, camera_id)},
             ],
@@ -1157,6 +1161,8 @@ class ConfigStore:
             camera.stream_framerate = _safe_int(payload["streamFramerate"], camera.stream_framerate)
         if "jpegQuality" in payload:
             camera.jpeg_quality = _safe_int(payload["jpegQuality"], camera.jpeg_quality)
+        if "adaptiveQuality" in payload:
+            camera.adaptive_quality = payload["adaptiveQuality"] in (True, "true", "1", "on")
         
         # Motion detection
         if "motionEnabled" in payload:
@@ -1327,19 +1333,43 @@ class ConfigStore:
         self._save_config()
         logger.info("Updated audio filter patterns: %s", patterns)
 
-    def add_audio_filter_pattern(self, pattern: str) -> None:
-        """Add a new audio filter pattern."""
-        if pattern and pattern not in self._audio_filter_patterns:
-            self._audio_filter_patterns.append(pattern)
+    def add_audio_filter_pattern(self, pattern: str) -> List[str]:
+        """Add a new audio filter pattern and return the updated list."""
+        return self.add_audio_filter_patterns([pattern])
+
+    def remove_audio_filter_pattern(self, pattern: str) -> List[str]:
+        """Remove an audio filter pattern and return the updated list."""
+        return self.remove_audio_filter_patterns([pattern])
+
+    def add_audio_filter_patterns(self, patterns: List[str]) -> List[str]:
+        """Add several audio filter patterns with a single config save.
+
+        Returns:
+            The updated list of audio filter patterns.
+        """
+        added = []
+        for pattern in patterns:
+            if pattern and pattern not in self._audio_filter_patterns:
+                self._audio_filter_patterns.append(pattern)
+                added.append(pattern)
+        if added:
             self._save_config()
-            logger.info("Added audio filter pattern: %s", pattern)
+            logger.info("Added audio filter patterns: %s", added)
+        return self._audio_filter_patterns.copy()
+
+    def remove_audio_filter_patterns(self, patterns: List[str]) -> List[str]:
+        """Remove several audio filter patterns with a single config save.
 
-    def remove_audio_filter_pattern(self, pattern: str) -> None:
-        """Remove an audio filter pattern."""
-        if pattern in self._audio_filter_patterns:
-            self._audio_filter_patterns.remove(pattern)
+        Returns:
+            The updated list of audio filter patterns.
+        """
+        to_remove = set(patterns)
+        remaining = [p for p in self._audio_filter_patterns if p not in to_remove]
+        if len(remaining) != len(self._audio_filter_patterns):
+            self._audio_filter_patterns = remaining
             self._save_config()
-            logger.info("Removed audio filter pattern: %s", pattern)
+            logger.info("Removed audio filter patterns: %s", patterns)
+        return self._audio_filter_patterns.copy()
 
     # Audio device management methods
     def get_audio_devices(self) -> List[Dict[str, Any]]:
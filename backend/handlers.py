@@ -1,16 +1,20 @@
-# File Version: 0.30.2
+# File Version: 0.30.29
 from __future__ import annotations
 
 import aiohttp
+import asyncio
 import base64
+import contextlib
+import functools
 import hashlib
 import json
 import logging
+import os
 import platform
 import secrets
-from datetime import datetime
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import tornado.web
 import tornado.escape
@@ -29,10 +33,35 @@ from .user_manager import get_user_manager, UserManager, UserRole, User
 
 logger = logging.getLogger(__name__)
 
+# Optional faster JSON parser for request bodies (stdlib json otherwise)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Platform is fixed for the process lifetime
+_IS_LINUX = platform.system() == "Linux"
+
+# Pre-encoded constant JSON error bodies (shared by many handlers)
+_ERR_ADMIN = json.dumps({"error": "Admin access required"}).encode()
+_ERR_BAD_JSON = json.dumps({"error": "Invalid JSON"}).encode()
+_ERR_UNAUTH = json.dumps({"error": "Non authentifié"}).encode()
+_ERR_USER_REQ = json.dumps({"error": "Nom d'utilisateur requis"}).encode()
+_ERR_CAMERA_NOT_FOUND = json.dumps({"error": "Camera not found"}).encode()
+_ERR_AUDIO_NOT_FOUND = json.dumps({"error": "Audio device not found"}).encode()
+_ERR_PATTERN_REQ = json.dumps({"error": "pattern is required"}).encode()
+_ERR_PATTERNS_LIST = json.dumps({"error": "patterns must be a list"}).encode()
+
 _PLACEHOLDER_FRAME = base64.b64decode(
     b"iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mP8\n/w8AAuMBg6RYw1cAAAAASUVORK5CYII="
 )
 
+# Log file served by LogDownloadHandler (same location as server.LOG_FILE_PATH)
+_LOG_FILE = Path(__file__).resolve().parent.parent / "logs" / "motion_frontend.log"
+_LOG_CHUNK_SIZE = 256 * 1024
+_LOG_DISPOSITION_FMT = 'attachment; filename="motion_frontend_{}.log"'
+
 # Session store with file persistence for "remember me"
 _SESSIONS_FILE = Path("config/sessions.json")
 _SESSIONS: Dict[str, str] = {}
@@ -63,6 +92,134 @@ def _save_sessions() -> None:
 _load_sessions()
 
 
+def _json_decode(value: Any) -> Any:
+    """Decode a JSON request body, using orjson when installed.
+    
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers keep
+    catching json.JSONDecodeError either way.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(value)
+    return tornado.escape.json_decode(value)
+
+
+# Shared aiohttp session for the HLS proxy (keep-alive pool to MediaMTX)
+_HLS_SESSION: Optional[aiohttp.ClientSession] = None
+
+
+def _get_hls_session() -> aiohttp.ClientSession:
+    """Return the shared HLS proxy session, creating it lazily."""
+    global _HLS_SESSION
+    if _HLS_SESSION is None or _HLS_SESSION.closed:
+        connector = aiohttp.TCPConnector(limit=64, limit_per_host=32, keepalive_timeout=30)
+        _HLS_SESSION = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=10),
+        )
+    return _HLS_SESSION
+
+
+async def close_hls_session() -> None:
+    """Close the shared HLS proxy session (called on server shutdown)."""
+    global _HLS_SESSION
+    if _HLS_SESSION is not None and not _HLS_SESSION.closed:
+        await _HLS_SESSION.close()
+    _HLS_SESSION = None
+
+
+# Short-lived HLS response cache: coalesces identical fetches from concurrent viewers.
+# Entries are (expiry, content_type, body); kept small since segments weigh hundreds of KB.
+_HLS_CACHE_TTL = {".m3u8": 1.0, ".ts": 3.0}
+_HLS_CACHE_MAX_ENTRIES = 64
+# Bodies above this are streamed through in chunks instead of being cached
+_HLS_CACHE_MAX_BODY = 512 * 1024
+_HLS_CACHE: Dict[str, Tuple[float, str, bytes]] = {}
+# Paths found too large to cache -> expiry; their later requests stream directly
+_HLS_UNCACHEABLE: Dict[str, float] = {}
+# One fetch lock per path, dropped when its last user (holder or waiter) leaves
+_HLS_LOCKS: Dict[str, Tuple[asyncio.Lock, int]] = {}
+
+
+# Static HLS response headers, precomputed per file suffix
+_HLS_CORS_HEADERS = (
+    ("Access-Control-Allow-Origin", "*"),
+    ("Access-Control-Allow-Methods", "GET, OPTIONS"),
+    ("Access-Control-Allow-Headers", "Content-Type"),
+)
+_HLS_HEADER_SETS = {
+    # Playlist files should not be cached long
+    ".m3u8": (("Cache-Control", "no-cache, no-store, must-revalidate"),),
+    # Video segments can be cached briefly
+    ".ts": (("Cache-Control", "public, max-age=2"),),
+}
+
+
+def _hls_cache_ttl(path: str) -> Optional[float]:
+    """Return the cache TTL for an HLS path, or None if it should not be cached."""
+    return _HLS_CACHE_TTL.get(os.path.splitext(path)[1])
+
+
+def _hls_cache_get(path: str) -> Optional[Tuple[str, bytes]]:
+    """Return cached (content_type, body) for path if still fresh."""
+    entry = _HLS_CACHE.get(path)
+    if entry is None:
+        return None
+    expiry, content_type, body = entry
+    if expiry < time.monotonic():
+        _HLS_CACHE.pop(path, None)
+        return None
+    return content_type, body
+
+
+def _hls_cache_put(path: str, ttl: float, content_type: str, body: bytes) -> None:
+    """Store an HLS response, evicting expired then oldest entries when full."""
+    now = time.monotonic()
+    if len(_HLS_CACHE) >= _HLS_CACHE_MAX_ENTRIES:
+        for key in [k for k, entry in _HLS_CACHE.items() if entry[0] < now]:
+            del _HLS_CACHE[key]
+        while len(_HLS_CACHE) >= _HLS_CACHE_MAX_ENTRIES:
+            _HLS_CACHE.pop(next(iter(_HLS_CACHE)))
+    _HLS_CACHE[path] = (now + ttl, content_type, body)
+
+
+def _hls_too_large(path: str) -> bool:
+    """True if path was recently seen above _HLS_CACHE_MAX_BODY (stream it instead)."""
+    expiry = _HLS_UNCACHEABLE.get(path)
+    if expiry is None:
+        return False
+    if expiry < time.monotonic():
+        del _HLS_UNCACHEABLE[path]
+        return False
+    return True
+
+
+def _hls_mark_too_large(path: str, ttl: float) -> None:
+    """Remember that path is too large to cache for ttl seconds."""
+    now = time.monotonic()
+    if len(_HLS_UNCACHEABLE) >= _HLS_CACHE_MAX_ENTRIES:
+        for key in [k for k, expiry in _HLS_UNCACHEABLE.items() if expiry < now]:
+            del _HLS_UNCACHEABLE[key]
+    _HLS_UNCACHEABLE[path] = now + ttl
+
+
+@contextlib.asynccontextmanager
+async def _hls_path_lock(path: str):
+    """Hold the per-path fetch lock; the entry lives while anyone holds or waits on it."""
+    lock, users = _HLS_LOCKS.get(path, (None, 0))
+    if lock is None:
+        lock = asyncio.Lock()
+    _HLS_LOCKS[path] = (lock, users + 1)
+    try:
+        async with lock:
+            yield
+    finally:
+        lock, users = _HLS_LOCKS[path]
+        if users <= 1:
+            del _HLS_LOCKS[path]
+        else:
+            _HLS_LOCKS[path] = (lock, users - 1)
+
+
 class BaseHandler(tornado.web.RequestHandler):
     @property
     def config_store(self) -> ConfigStore:
@@ -84,22 +241,37 @@ class BaseHandler(tornado.web.RequestHandler):
         return None
     
     def get_current_user_info(self) -> Optional[User]:
-        """Get full User object for current authenticated user."""
-        username = self.get_current_user()
-        if username:
-            return self.user_manager.get_user(username)
-        return None
+        """Get full User object for current authenticated user (memoized per request)."""
+        if not hasattr(self, "_current_user_info"):
+            username = self.current_user
+            self._current_user_info = self.user_manager.get_user(username) if username else None
+        return self._current_user_info
     
     def is_admin(self) -> bool:
-        """Check if current user is an admin."""
-        user = self.get_current_user_info()
-        return user is not None and user.role == UserRole.ADMIN
+        """Check if current user is an enabled admin.
+
+        Users are held in memory by UserManager, so the lookup is a dict hit and
+        role/enabled changes apply immediately without any cache invalidation.
+        The signed session cookie is decoded at most once per request through
+        Tornado's cached ``current_user``.
+        """
+        username = self.current_user
+        if not username:
+            return False
+        user = self.user_manager.get_user(username)
+        return user is not None and user.enabled and user.role == UserRole.ADMIN
 
     def write_json(self, payload: Dict[str, Any], status: int = 200) -> None:
         self.set_status(status)
         self.set_header("Content-Type", "application/json")
         self.finish(json.dumps(payload))
 
+    def write_json_bytes(self, body: bytes, status: int = 200) -> None:
+        """Like write_json() for an already-encoded JSON body (constant responses)."""
+        self.set_status(status)
+        self.set_header("Content-Type", "application/json")
+        self.finish(body)
+
 
 class TemplateHandler(BaseHandler):
     template_name: str = "main.html"
@@ -118,7 +290,7 @@ class LoginHandler(TemplateHandler):
     template_name = "login.html"
 
     async def get(self) -> None:
-        if self.get_current_user():
+        if self.current_user:
             self.redirect("/")
             return
         self.render_template(error=None, lingvo="fr")
@@ -215,7 +387,7 @@ class VersionHandler(BaseHandler):
     async def get(self) -> None:
         from . import updater
         
-        # Get current version dynamically from CHANGELOG (not cached)
+        # Current version from CHANGELOG (re-parsed whenever the file changes)
         current_version = updater.get_current_version()
         
         payload = self.config_store.get_version_payload(
@@ -230,7 +402,7 @@ class ConfigMainHandler(BaseHandler):
         self.write_json(self.config_store.get_main_config())
 
     async def post(self) -> None:
-        payload = tornado.escape.json_decode(self.request.body or b"{}")
+        payload = _json_decode(self.request.body or b"{}")
         result = self.config_store.save_main_config(payload)
         self.write_json(result)
 
@@ -244,7 +416,7 @@ class ConfigCameraHandler(BaseHandler):
     async def get(self, camera_id: str) -> None:
         camera = self.config_store.get_camera_config(camera_id)
         if not camera:
-            self.write_json({"error": "Camera not found"}, status=404)
+            self.write_json_bytes(_ERR_CAMERA_NOT_FOUND, status=404)
             return
         self.write_json(camera)
 
@@ -252,7 +424,7 @@ class ConfigCameraHandler(BaseHandler):
         from . import mjpeg_server
         from . import rtsp_server
         
-        payload = tornado.escape.json_decode(self.request.body or b"{}")
+        payload = _json_decode(self.request.body or b"{}")
         
         # Check if stream is running before saving
         server = mjpeg_server.get_mjpeg_server()
@@ -268,7 +440,7 @@ class ConfigCameraHandler(BaseHandler):
         try:
             result = self.config_store.save_camera_config(camera_id, payload)
         except KeyError:
-            self.write_json({"error": "Camera not found"}, status=404)
+            self.write_json_bytes(_ERR_CAMERA_NOT_FOUND, status=404)
             return
         
         # If stream was running, restart it to apply new settings
@@ -324,6 +496,7 @@ class ConfigCameraHandler(BaseHandler):
                     overlay_text_scale=camera.overlay_text_scale,
                     stream_auth_enabled=camera.stream_auth_enabled,
                     stream_auth_verify=verify_stream_auth if camera.stream_auth_enabled else None,
+                    adaptive_quality=camera.adaptive_quality,
                 )
                 # Restart stream
                 server.start_camera(camera_id)
@@ -331,6 +504,8 @@ class ConfigCameraHandler(BaseHandler):
         
         # Handle RTSP enable/disable
         rtsp = rtsp_server.get_rtsp_server()
+        # Probe FFmpeg off the event loop; the availability checks below read the cache
+        await rtsp.load_caps()
         logger.info("RTSP config change: old_enabled=%s, new_enabled=%s, audio=%s", 
                     old_rtsp_enabled, new_rtsp_enabled, new_rtsp_audio)
         
@@ -346,7 +521,7 @@ class ConfigCameraHandler(BaseHandler):
                 if camera and rtsp.is_ffmpeg_available():
                     # On Linux, check if Motion is running and using the camera
                     # Motion holds exclusive access to cameras, so RTSP/FFmpeg will fail
-                    if platform.system().lower() == "linux":
+                    if _IS_LINUX:
                         motion_port = camera.motion_stream_port or 8081
                         if system_info.is_motion_running(motion_port):
                             logger.warning("RTSP: Motion daemon detected on port %d - camera may be busy", motion_port)
@@ -450,7 +625,7 @@ class CameraAddHandler(BaseHandler):
     """Handle camera addition requests."""
     
     async def post(self) -> None:
-        payload = tornado.escape.json_decode(self.request.body or b"{}")
+        payload = _json_decode(self.request.body or b"{}")
         name = payload.get("name", "")
         device_url = payload.get("device_url", "")
         
@@ -466,7 +641,7 @@ class CameraDeleteHandler(BaseHandler):
             result = self.config_store.remove_camera(camera_id)
             self.write_json(result)
         except KeyError:
-            self.write_json({"error": "Camera not found"}, status=404)
+            self.write_json_bytes(_ERR_CAMERA_NOT_FOUND, status=404)
 
 
 class CameraConfigSectionsHandler(BaseHandler):
@@ -475,14 +650,14 @@ class CameraConfigSectionsHandler(BaseHandler):
     async def get(self, camera_id: str) -> None:
         sections = self.config_store.get_camera_config_sections(camera_id)
         if not sections:
-            self.write_json({"error": "Camera not found"}, status=404)
+            self.write_json_bytes(_ERR_CAMERA_NOT_FOUND, status=404)
             return
         self.write_json({"sections": sections})
 
 
 class LoggingConfigHandler(BaseHandler):
     async def post(self) -> None:
-        payload = tornado.escape.json_decode(self.request.body or b"{}")
+        payload = _json_decode(self.request.body or b"{}")
         level = payload.get("level", "INFO")
         self.config_store.set_logging_level(level)
         self.write_json({"status": "ok", "level": self.config_store.get_logging_level()})
@@ -513,6 +688,8 @@ class CameraDetectHandler(BaseHandler):
         
         # Detect cameras
         cameras = detector.detect_cameras(include_filtered=include_filtered)
+        # Explicit rescan: RTSP starts must see newly plugged DirectShow devices too
+        rtsp_server.get_rtsp_server().invalidate_device_cache()
         
         self.write_json({
             "cameras": [c.to_dict() for c in cameras],
@@ -591,7 +768,7 @@ class CameraControlsHandler(BaseHandler):
         import urllib.parse
         
         device_path = urllib.parse.unquote(device_path)
-        payload = tornado.escape.json_decode(self.request.body or b"{}")
+        payload = _json_decode(self.request.body or b"{}")
         
         control_id = payload.get("control_id")
         value = payload.get("value")
@@ -636,11 +813,11 @@ class CameraFilterPatternsHandler(BaseHandler):
     
     async def post(self) -> None:
         """Set filter patterns."""
-        payload = tornado.escape.json_decode(self.request.body or b"{}")
+        payload = _json_decode(self.request.body or b"{}")
         patterns = payload.get("patterns", [])
         
         if not isinstance(patterns, list):
-            self.write_json({"error": "patterns must be a list"}, status=400)
+            self.write_json_bytes(_ERR_PATTERNS_LIST, status=400)
             return
         
         self.config_store.set_camera_filter_patterns(patterns)
@@ -648,11 +825,11 @@ class CameraFilterPatternsHandler(BaseHandler):
     
     async def put(self) -> None:
         """Add a filter pattern."""
-        payload = tornado.escape.json_decode(self.request.body or b"{}")
+        payload = _json_decode(self.request.body or b"{}")
         pattern = payload.get("pattern", "")
         
         if not pattern:
-            self.write_json({"error": "pattern is required"}, status=400)
+            self.write_json_bytes(_ERR_PATTERN_REQ, status=400)
             return
         
         self.config_store.add_camera_filter_pattern(pattern)
@@ -660,11 +837,11 @@ class CameraFilterPatternsHandler(BaseHandler):
     
     async def delete(self) -> None:
         """Remove a filter pattern."""
-        payload = tornado.escape.json_decode(self.request.body or b"{}")
+        payload = _json_decode(self.request.body or b"{}")
         pattern = payload.get("pattern", "")
         
         if not pattern:
-            self.write_json({"error": "pattern is required"}, status=400)
+            self.write_json_bytes(_ERR_PATTERN_REQ, status=400)
             return
         
         self.config_store.remove_camera_filter_pattern(pattern)
@@ -694,7 +871,7 @@ class FrameHandler(BaseHandler):
         # Check stream source - Motion or internal
         camera = self.config_store.get_camera(camera_id)
         motion_running = False
-        if platform.system().lower() == "linux":
+        if _IS_LINUX:
             motion_running = system_info.is_motion_running()
         
         stream_source = camera.stream_source if camera else "auto"
@@ -796,7 +973,7 @@ class MJPEGStreamHandler(BaseHandler):
         
         # Check stream source - Motion or internal
         motion_running = False
-        if platform.system().lower() == "linux":
+        if _IS_LINUX:
             motion_running = system_info.is_motion_running()
         
         stream_source = camera_config.stream_source if camera_config else "auto"
@@ -815,8 +992,7 @@ class MJPEGStreamHandler(BaseHandler):
         # Check if camera exists and is running
         status = server.get_camera_status(camera_id)
         if not status.get("exists"):
-            self.set_status(404)
-            self.write_json({"error": "Camera not found"})
+            self.write_json_bytes(_ERR_CAMERA_NOT_FOUND, status=404)
             return
         
         # Set headers for MJPEG stream
@@ -902,7 +1078,7 @@ class MJPEGControlHandler(BaseHandler):
         
         # Check if Motion is running (Linux only)
         motion_running = False
-        if platform.system().lower() == "linux":
+        if _IS_LINUX:
             motion_running = system_info.is_motion_running()
         
         # Add Motion stream info for cameras and fill in config-based stats
@@ -940,13 +1116,14 @@ class MJPEGControlHandler(BaseHandler):
         
         self.write_json({
             "opencv_available": mjpeg_server.is_opencv_available(),
+            "jpeg_encoder": mjpeg_server.get_jpeg_encoder(),
             "motion_running": motion_running,
             "cameras": status
         })
     
     async def post(self) -> None:
         """Start or stop a camera stream."""
-        payload = tornado.escape.json_decode(self.request.body or b"{}")
+        payload = _json_decode(self.request.body or b"{}")
         action = payload.get("action", "")
         camera_id = payload.get("camera_id", "")
         
@@ -956,7 +1133,7 @@ class MJPEGControlHandler(BaseHandler):
             # Get camera config
             camera = self.config_store.get_camera(camera_id)
             if not camera:
-                self.write_json({"error": "Camera not found"}, status=404)
+                self.write_json_bytes(_ERR_CAMERA_NOT_FOUND, status=404)
                 return
             
             # Check if RTSP is enabled for this camera - don't start MJPEG if so
@@ -990,7 +1167,7 @@ class MJPEGControlHandler(BaseHandler):
                 # User explicitly wants Motion
                 logger.debug("MJPEG: Camera %s using Motion source (explicit)", camera_id)
                 use_motion = True
-            elif stream_source == "auto" and platform.system().lower() == "linux":
+            elif stream_source == "auto" and _IS_LINUX:
                 # Auto-detect: use Motion if running on Linux
                 if system_info.is_motion_running(motion_port):
                     logger.info("MJPEG: Camera %s auto-detected Motion on port %d", camera_id, motion_port)
@@ -1070,6 +1247,7 @@ class MJPEGControlHandler(BaseHandler):
                     overlay_text_scale=camera.overlay_text_scale,
                     stream_auth_enabled=camera.stream_auth_enabled,
                     stream_auth_verify=verify_stream_auth if camera.stream_auth_enabled else None,
+                    adaptive_quality=camera.adaptive_quality,
                 )
             else:
                 # Update overlay settings if camera already exists
@@ -1080,6 +1258,7 @@ class MJPEGControlHandler(BaseHandler):
                     overlay_right_text=camera.overlay_right_text,
                     overlay_right_custom=camera.overlay_right_custom,
                     overlay_text_scale=camera.overlay_text_scale,
+                    adaptive_quality=camera.adaptive_quality,
                 )
             
             # Start the camera
@@ -1094,7 +1273,7 @@ class MJPEGControlHandler(BaseHandler):
             camera = self.config_store.get_camera(camera_id)
             stream_source = camera.stream_source if camera else "auto"
             motion_running = False
-            if platform.system().lower() == "linux":
+            if _IS_LINUX:
                 motion_port = camera.motion_stream_port if camera else 8081
                 motion_running = system_info.is_motion_running(motion_port)
             
@@ -1145,7 +1324,7 @@ class MeetingHandler(BaseHandler):
     
     async def post(self) -> None:
         """Control Meeting service - start/stop/heartbeat."""
-        payload = tornado.escape.json_decode(self.request.body or b"{}")
+        payload = _json_decode(self.request.body or b"{}")
         action = payload.get("action", "")
         
         service = meeting_service.get_meeting_service()
@@ -1224,6 +1403,26 @@ class MeetingHandler(BaseHandler):
 # User Management Handlers
 # ====================
 
+def _admin_json(method):
+    """Decorate an admin-only handler method taking a decoded JSON body.
+    
+    Rejects non-admins with 403 and malformed bodies with 400, then calls
+    ``method(self, data, *args)``. Apply below ``@tornado.web.authenticated``.
+    """
+    @functools.wraps(method)
+    async def wrapper(self: BaseHandler, *args: Any) -> None:
+        if not self.is_admin():
+            self.write_json_bytes(_ERR_ADMIN, status=403)
+            return
+        try:
+            data = _json_decode(self.request.body or b"{}")
+        except json.JSONDecodeError:
+            self.write_json_bytes(_ERR_BAD_JSON, status=400)
+            return
+        await method(self, data, *args)
+    return wrapper
+
+
 class PasswordChangeHandler(BaseHandler):
     """Handler for changing user password."""
     
@@ -1231,9 +1430,9 @@ class PasswordChangeHandler(BaseHandler):
     async def post(self) -> None:
         """Change the current user's password."""
         try:
-            data = tornado.escape.json_decode(self.request.body)
+            data = _json_decode(self.request.body)
         except json.JSONDecodeError:
-            self.write_json({"error": "Invalid JSON"}, status=400)
+            self.write_json_bytes(_ERR_BAD_JSON, status=400)
             return
         
         current_password = data.get("current_password", "")
@@ -1252,9 +1451,9 @@ class PasswordChangeHandler(BaseHandler):
             self.write_json({"error": "Le nouveau mot de passe doit contenir au moins 6 caractères"}, status=400)
             return
         
-        username = self.get_current_user()
+        username = self.current_user
         if not username:
-            self.write_json({"error": "Non authentifié"}, status=401)
+            self.write_json_bytes(_ERR_UNAUTH, status=401)
             return
         
         success, message = self.user_manager.change_password(username, current_password, new_password)
@@ -1273,17 +1472,10 @@ class CurrentUserHandler(BaseHandler):
         """Get info about the current user."""
         user = self.get_current_user_info()
         if not user:
-            self.write_json({"error": "Non authentifié"}, status=401)
+            self.write_json_bytes(_ERR_UNAUTH, status=401)
             return
         
-        self.write_json({
-            "username": user.username,
-            "role": user.role.value,
-            "enabled": user.enabled,
-            "must_change_password": user.must_change_password,
-            "created_at": user.created_at,
-            "last_login": user.last_login
-        })
+        self.write_json(user.to_dict())
 
 
 class UserHandler(BaseHandler):
@@ -1293,36 +1485,16 @@ class UserHandler(BaseHandler):
     async def get(self) -> None:
         """List all users (admin only)."""
         if not self.is_admin():
-            self.write_json({"error": "Admin access required"}, status=403)
+            self.write_json_bytes(_ERR_ADMIN, status=403)
             return
         
-        users = self.user_manager.list_users()
-        user_list = []
-        for user in users:
-            user_list.append({
-                "username": user.username,
-                "role": user.role.value,
-                "enabled": user.enabled,
-                "must_change_password": user.must_change_password,
-                "created_at": user.created_at,
-                "last_login": user.last_login
-            })
-        
-        self.write_json({"users": user_list})
+        # Pre-serialized by UserManager, invalidated on any user change
+        self.write_json_bytes(self.user_manager.list_users_json())
     
     @tornado.web.authenticated
-    async def post(self) -> None:
+    @_admin_json
+    async def post(self, data: Dict[str, Any]) -> None:
         """Create a new user (admin only)."""
-        if not self.is_admin():
-            self.write_json({"error": "Admin access required"}, status=403)
-            return
-        
-        try:
-            data = tornado.escape.json_decode(self.request.body)
-        except json.JSONDecodeError:
-            self.write_json({"error": "Invalid JSON"}, status=400)
-            return
-        
         username = data.get("username", "").strip()
         password = data.get("password", "")
         role_str = data.get("role", "user")
@@ -1363,25 +1535,16 @@ class UserHandler(BaseHandler):
             self.write_json({"error": f"Impossible de créer l'utilisateur (existe déjà ?)"}, status=400)
     
     @tornado.web.authenticated
-    async def delete(self) -> None:
+    @_admin_json
+    async def delete(self, data: Dict[str, Any]) -> None:
         """Delete a user (admin only)."""
-        if not self.is_admin():
-            self.write_json({"error": "Admin access required"}, status=403)
-            return
-        
-        try:
-            data = tornado.escape.json_decode(self.request.body)
-        except json.JSONDecodeError:
-            self.write_json({"error": "Invalid JSON"}, status=400)
-            return
-        
         username = data.get("username", "").strip()
         if not username:
-            self.write_json({"error": "Nom d'utilisateur requis"}, status=400)
+            self.write_json_bytes(_ERR_USER_REQ, status=400)
             return
         
         # Prevent deleting self
-        if username == self.get_current_user():
+        if username == self.current_user:
             self.write_json({"error": "Impossible de supprimer son propre compte"}, status=400)
             return
         
@@ -1395,18 +1558,9 @@ class UserPasswordResetHandler(BaseHandler):
     """Handler for admin to reset user password."""
     
     @tornado.web.authenticated
-    async def post(self) -> None:
+    @_admin_json
+    async def post(self, data: Dict[str, Any]) -> None:
         """Reset a user's password (admin only)."""
-        if not self.is_admin():
-            self.write_json({"error": "Admin access required"}, status=403)
-            return
-        
-        try:
-            data = tornado.escape.json_decode(self.request.body)
-        except json.JSONDecodeError:
-            self.write_json({"error": "Invalid JSON"}, status=400)
-            return
-        
         username = data.get("username", "").strip()
         new_password = data.get("new_password", "")
         force_change = data.get("must_change_password", True)
@@ -1432,27 +1586,18 @@ class UserEnableHandler(BaseHandler):
     """Handler for enabling/disabling users."""
     
     @tornado.web.authenticated
-    async def post(self) -> None:
+    @_admin_json
+    async def post(self, data: Dict[str, Any]) -> None:
         """Enable or disable a user (admin only)."""
-        if not self.is_admin():
-            self.write_json({"error": "Admin access required"}, status=403)
-            return
-        
-        try:
-            data = tornado.escape.json_decode(self.request.body)
-        except json.JSONDecodeError:
-            self.write_json({"error": "Invalid JSON"}, status=400)
-            return
-        
         username = data.get("username", "").strip()
         enabled = data.get("enabled", True)
         
         if not username:
-            self.write_json({"error": "Nom d'utilisateur requis"}, status=400)
+            self.write_json_bytes(_ERR_USER_REQ, status=400)
             return
         
         # Prevent disabling self
-        if username == self.get_current_user() and not enabled:
+        if username == self.current_user and not enabled:
             self.write_json({"error": "Impossible de désactiver son propre compte"}, status=400)
             return
         
@@ -1471,6 +1616,29 @@ class UserEnableHandler(BaseHandler):
 # Audio Device Handlers
 # =====================================================
 
+# Audio detection shells out (arecord/PowerShell/FFmpeg); results are reused
+# briefly since devices rarely hotplug. Key: (include_filtered, patterns).
+_AUDIO_DETECT_CACHE_TTL = 5.0
+_audio_detect_cache: Dict[Tuple[bool, Tuple[str, ...]], Tuple[float, List[audio_detector.DetectedAudioDevice]]] = {}
+
+
+async def _detect_audio_devices_cached(
+    detector: audio_detector.AudioDetector,
+    include_filtered: bool,
+) -> List[audio_detector.DetectedAudioDevice]:
+    """Run audio device detection in a worker thread, cached for a few seconds."""
+    key = (include_filtered, tuple(detector.filter_patterns))
+    cached = _audio_detect_cache.get(key)
+    if cached and time.monotonic() - cached[0] < _AUDIO_DETECT_CACHE_TTL:
+        return cached[1]
+    
+    loop = asyncio.get_running_loop()
+    devices = await loop.run_in_executor(None, detector.detect_devices, include_filtered)
+    _audio_detect_cache.clear()
+    _audio_detect_cache[key] = (time.monotonic(), devices)
+    return devices
+
+
 class AudioDetectHandler(BaseHandler):
     """Detect available audio input devices on the system."""
     
@@ -1489,8 +1657,8 @@ class AudioDetectHandler(BaseHandler):
         detector = audio_detector.get_detector()
         detector.filter_patterns = filter_patterns
         
-        # Detect audio devices
-        devices = detector.detect_devices(include_filtered=include_filtered)
+        # Detect audio devices (off the event loop, briefly cached)
+        devices = await _detect_audio_devices_cached(detector, include_filtered)
         
         self.write_json({
             "devices": [d.to_dict() for d in devices],
@@ -1509,39 +1677,53 @@ class AudioFilterPatternsHandler(BaseHandler):
     
     async def post(self) -> None:
         """Set audio filter patterns."""
-        payload = tornado.escape.json_decode(self.request.body or b"{}")
+        payload = _json_decode(self.request.body or b"{}")
         patterns = payload.get("patterns", [])
         
         if not isinstance(patterns, list):
-            self.write_json({"error": "patterns must be a list"}, status=400)
+            self.write_json_bytes(_ERR_PATTERNS_LIST, status=400)
             return
         
         self.config_store.set_audio_filter_patterns(patterns)
         self.write_json({"status": "ok", "patterns": patterns})
     
     async def put(self) -> None:
-        """Add an audio filter pattern."""
-        payload = tornado.escape.json_decode(self.request.body or b"{}")
-        pattern = payload.get("pattern", "")
-        
-        if not pattern:
-            self.write_json({"error": "pattern is required"}, status=400)
+        """Add audio filter patterns ("pattern": str or "patterns": list)."""
+        patterns = self._get_payload_patterns()
+        if patterns is None:
             return
         
-        self.config_store.add_audio_filter_pattern(pattern)
-        self.write_json({"status": "ok", "patterns": self.config_store.get_audio_filter_patterns()})
+        patterns = self.config_store.add_audio_filter_patterns(patterns)
+        self.write_json({"status": "ok", "patterns": patterns})
     
     async def delete(self) -> None:
-        """Remove an audio filter pattern."""
-        payload = tornado.escape.json_decode(self.request.body or b"{}")
-        pattern = payload.get("pattern", "")
-        
-        if not pattern:
-            self.write_json({"error": "pattern is required"}, status=400)
+        """Remove audio filter patterns ("pattern": str or "patterns": list)."""
+        patterns = self._get_payload_patterns()
+        if patterns is None:
             return
         
-        self.config_store.remove_audio_filter_pattern(pattern)
-        self.write_json({"status": "ok", "patterns": self.config_store.get_audio_filter_patterns()})
+        patterns = self.config_store.remove_audio_filter_patterns(patterns)
+        self.write_json({"status": "ok", "patterns": patterns})
+    
+    def _get_payload_patterns(self) -> Optional[List[str]]:
+        """Read "patterns" (list) or "pattern" (str) from the JSON body.
+        
+        Returns:
+            Non-empty list of patterns, or None after writing a 400 error.
+        """
+        payload = _json_decode(self.request.body or b"{}")
+        patterns = payload.get("patterns")
+        if patterns is None:
+            pattern = payload.get("pattern", "")
+            patterns = [pattern] if pattern else []
+        
+        if not isinstance(patterns, list):
+            self.write_json_bytes(_ERR_PATTERNS_LIST, status=400)
+            return None
+        if not patterns:
+            self.write_json_bytes(_ERR_PATTERN_REQ, status=400)
+            return None
+        return patterns
 
 
 class AudioListHandler(BaseHandler):
@@ -1558,18 +1740,18 @@ class AudioConfigHandler(BaseHandler):
         """Get configuration of an audio device."""
         audio = self.config_store.get_audio_device(audio_id)
         if not audio:
-            self.write_json({"error": "Audio device not found"}, status=404)
+            self.write_json_bytes(_ERR_AUDIO_NOT_FOUND, status=404)
             return
         self.write_json(audio.to_dict())
 
     async def post(self, audio_id: str) -> None:
         """Update audio device configuration."""
-        payload = tornado.escape.json_decode(self.request.body or b"{}")
+        payload = _json_decode(self.request.body or b"{}")
         
         try:
             result = self.config_store.save_audio_config(audio_id, payload)
         except KeyError:
-            self.write_json({"error": "Audio device not found"}, status=404)
+            self.write_json_bytes(_ERR_AUDIO_NOT_FOUND, status=404)
             return
         
         self.write_json(result)
@@ -1581,7 +1763,7 @@ class AudioConfigSectionsHandler(BaseHandler):
     async def get(self, audio_id: str) -> None:
         sections = self.config_store.get_audio_config_sections(audio_id)
         if not sections:
-            self.write_json({"error": "Audio device not found"}, status=404)
+            self.write_json_bytes(_ERR_AUDIO_NOT_FOUND, status=404)
             return
         self.write_json({"sections": sections})
 
@@ -1590,7 +1772,7 @@ class AudioAddHandler(BaseHandler):
     """Handle audio device addition requests."""
     
     async def post(self) -> None:
-        payload = tornado.escape.json_decode(self.request.body or b"{}")
+        payload = _json_decode(self.request.body or b"{}")
         name = payload.get("name", "")
         device_id = payload.get("device_id", "")
         
@@ -1606,7 +1788,7 @@ class AudioDeleteHandler(BaseHandler):
             result = self.config_store.remove_audio_device(audio_id)
             self.write_json(result)
         except KeyError:
-            self.write_json({"error": "Audio device not found"}, status=404)
+            self.write_json_bytes(_ERR_AUDIO_NOT_FOUND, status=404)
 
 
 # ============================================================================
@@ -1619,20 +1801,14 @@ class RTSPStatusHandler(BaseHandler):
     async def get(self) -> None:
         """Get RTSP server status and FFmpeg availability."""
         server = rtsp_server.get_rtsp_server()
+        await server.load_caps()
         
         self.write_json({
             "ffmpeg_available": server.is_ffmpeg_available(),
             "ffmpeg_version": server.get_ffmpeg_version(),
-            "rtsp_server_available": server.is_rtsp_server_available(),
+            "rtsp_server_available": await server.is_rtsp_server_available_async(),
             "streams": {
-                cam_id: {
-                    "camera_id": status.camera_id,
-                    "is_running": status.is_running,
-                    "rtsp_url": status.rtsp_url,
-                    "has_audio": status.has_audio,
-                    "error": status.error,
-                    "started_at": status.started_at,
-                }
+                cam_id: status.to_dict()
                 for cam_id, status in server.get_all_stream_status().items()
             }
         })
@@ -1647,14 +1823,7 @@ class RTSPStreamHandler(BaseHandler):
         status = server.get_stream_status(camera_id)
         
         if status:
-            self.write_json({
-                "camera_id": status.camera_id,
-                "is_running": status.is_running,
-                "rtsp_url": status.rtsp_url,
-                "has_audio": status.has_audio,
-                "error": status.error,
-                "started_at": status.started_at,
-            })
+            self.write_json(status.to_dict())
         else:
             self.write_json({
                 "camera_id": camera_id,
@@ -1668,13 +1837,14 @@ class RTSPStreamHandler(BaseHandler):
     async def post(self, camera_id: str) -> None:
         """Start or stop RTSP stream for a camera."""
         server = rtsp_server.get_rtsp_server()
+        await server.load_caps()
         
         if not server.is_ffmpeg_available():
             self.write_json({"error": "FFmpeg not available"}, status=500)
             return
             
         try:
-            data = tornado.escape.json_decode(self.request.body) if self.request.body else {}
+            data = _json_decode(self.request.body) if self.request.body else {}
         except json.JSONDecodeError:
             data = {}
             
@@ -1684,7 +1854,7 @@ class RTSPStreamHandler(BaseHandler):
             # Get camera config
             camera = self.config_store.get_camera(camera_id)
             if not camera:
-                self.write_json({"error": "Camera not found"}, status=404)
+                self.write_json_bytes(_ERR_CAMERA_NOT_FOUND, status=404)
                 return
                 
             # Find linked audio device from camera's rtsp_audio_device setting
@@ -1750,54 +1920,142 @@ class HLSProxyHandler(BaseHandler):
     
     async def get(self, path: str) -> None:
         """Proxy HLS requests to MediaMTX."""
-        import aiohttp
-        
         mediamtx_url = f"http://127.0.0.1:{self.MEDIAMTX_HLS_PORT}/{path}"
         
         try:
-            timeout = aiohttp.ClientTimeout(total=10)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(mediamtx_url) as response:
-                    if response.status != 200:
-                        logger.debug("HLS proxy: MediaMTX returned %d for %s", response.status, path)
-                        self.set_status(response.status)
-                        self.write(await response.text())
-                        return
-                    
-                    # Set appropriate content type
-                    content_type = response.headers.get("Content-Type", "application/octet-stream")
-                    self.set_header("Content-Type", content_type)
-                    
-                    # CORS headers for video playback
-                    self.set_header("Access-Control-Allow-Origin", "*")
-                    self.set_header("Access-Control-Allow-Methods", "GET, OPTIONS")
-                    self.set_header("Access-Control-Allow-Headers", "Content-Type")
-                    
-                    # Cache control for HLS segments
-                    if path.endswith(".m3u8"):
-                        # Playlist files should not be cached long
-                        self.set_header("Cache-Control", "no-cache, no-store, must-revalidate")
-                    elif path.endswith(".ts"):
-                        # Video segments can be cached briefly
-                        self.set_header("Cache-Control", "public, max-age=2")
-                    
-                    # Stream the content
-                    self.write(await response.read())
-                    
+            # Playlists and small segments: serve from the short-lived cache, with a
+            # single upstream fetch in flight per path (single-flight). Bodies above
+            # _HLS_CACHE_MAX_BODY are streamed and the path is marked uncacheable.
+            ttl = _hls_cache_ttl(path)
+            if ttl is not None and not _hls_too_large(path):
+                cached = _hls_cache_get(path)
+                written = False
+                if cached is None:
+                    async with contextlib.AsyncExitStack() as stack:
+                        oversized = None
+                        async with _hls_path_lock(path):
+                            cached = _hls_cache_get(path)
+                            if cached is None and not _hls_too_large(path):
+                                cached, oversized = await self._fetch_into_cache(
+                                    mediamtx_url, path, ttl, stack
+                                )
+                                # Neither: MediaMTX error, already written to the client
+                                written = cached is None and oversized is None
+                        if oversized is not None:
+                            # Lock released first: other viewers of the path don't wait on this client
+                            response, head = oversized
+                            await self._stream_response(response, path, head)
+                            return
+                if cached is not None:
+                    content_type, body = cached
+                    self._set_proxy_headers(path, content_type)
+                    self.write(body)
+                    return
+                if written:
+                    return
+                # Found too large while waiting for the lock: stream it below
+            
+            session = _get_hls_session()
+            async with session.get(mediamtx_url) as response:
+                if response.status != 200:
+                    logger.debug("HLS proxy: MediaMTX returned %d for %s", response.status, path)
+                    self.set_status(response.status)
+                    self.write(await response.text())
+                    return
+                await self._stream_response(response, path)
+
         except aiohttp.ClientConnectorError:
             logger.warning("HLS proxy: Cannot connect to MediaMTX on port %d", self.MEDIAMTX_HLS_PORT)
             self.set_status(503)
             self.write_json({"error": "HLS server not available", "hint": "MediaMTX may not be running"})
         except Exception as e:
+            if self._headers_written:
+                # Upstream failed mid-body: too late for an error status, so drop the
+                # connection rather than let Tornado end a truncated body cleanly
+                logger.error("HLS proxy error after headers were sent for %s: %s", path, e)
+                self.request.connection.close()
+                return
             logger.error("HLS proxy error: %s", e)
             self.set_status(500)
             self.write_json({"error": str(e)})
     
+    async def _fetch_into_cache(
+        self, url: str, path: str, ttl: float, stack: contextlib.AsyncExitStack
+    ) -> Tuple[Optional[Tuple[str, bytes]], Optional[Tuple[aiohttp.ClientResponse, bytes]]]:
+        """Fetch a playlist/segment from MediaMTX and store it in the HLS cache.
+        
+        The upstream response is entered on ``stack`` so that a body above
+        _HLS_CACHE_MAX_BODY can be streamed by the caller after it has
+        released the path lock.
+        
+        Returns:
+            ((content_type, body), None) on success.
+            (None, (response, head)) for a body over the cap (path marked
+            uncacheable; head holds the bytes already read).
+            (None, None) if MediaMTX returned an error (the error response
+            is already written to the client).
+        """
+        response = await stack.enter_async_context(_get_hls_session().get(url))
+        if response.status != 200:
+            logger.debug("HLS proxy: MediaMTX returned %d for %s", response.status, path)
+            self.set_status(response.status)
+            self.write(await response.text())
+            return None, None
+        content_type = response.headers.get("Content-Type", "application/octet-stream")
+        
+        content_length = response.headers.get("Content-Length")
+        if content_length and content_length.isdigit() and int(content_length) > _HLS_CACHE_MAX_BODY:
+            _hls_mark_too_large(path, ttl)
+            return None, (response, b"")
+        
+        # No (or small) Content-Length: buffer up to the cap, hand over past it
+        chunks: List[bytes] = []
+        size = 0
+        async for chunk in response.content.iter_chunked(65536):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > _HLS_CACHE_MAX_BODY:
+                _hls_mark_too_large(path, ttl)
+                return None, (response, b"".join(chunks))
+        body = b"".join(chunks)
+        _hls_cache_put(path, ttl, content_type, body)
+        return (content_type, body), None
+    
+    async def _stream_response(self, response: aiohttp.ClientResponse, path: str, head: bytes = b"") -> None:
+        """Forward an upstream body in 64 KB chunks (head: bytes already read from it)."""
+        content_type = response.headers.get("Content-Type", "application/octet-stream")
+        self._set_proxy_headers(path, content_type)
+
+        # Forward Content-Length so Tornado skips chunked encoding
+        # (only valid when aiohttp does not transparently decode the body)
+        content_length = response.headers.get("Content-Length")
+        if content_length and "Content-Encoding" not in response.headers:
+            self.set_header("Content-Length", content_length)
+
+        # Stream the content in 64 KB chunks instead of buffering whole segments
+        try:
+            if head:
+                self.write(head)
+                await self.flush()
+            async for chunk in response.content.iter_chunked(65536):
+                self.write(chunk)
+                await self.flush()
+        except tornado.iostream.StreamClosedError:
+            # Client disconnected
+            logger.debug("HLS proxy: Client disconnected during %s", path)
+    
+    def _set_proxy_headers(self, path: str, content_type: str) -> None:
+        """Set content type, CORS and cache-control headers for an HLS response."""
+        self.set_header("Content-Type", content_type)
+        for name, value in _HLS_CORS_HEADERS:
+            self.set_header(name, value)
+        for name, value in _HLS_HEADER_SETS.get(os.path.splitext(path)[1], ()):
+            self.set_header(name, value)
+    
     def options(self, path: str) -> None:
         """Handle CORS preflight requests."""
-        self.set_header("Access-Control-Allow-Origin", "*")
-        self.set_header("Access-Control-Allow-Methods", "GET, OPTIONS")
-        self.set_header("Access-Control-Allow-Headers", "Content-Type")
+        for name, value in _HLS_CORS_HEADERS:
+            self.set_header(name, value)
         self.set_status(204)
 
 
@@ -1854,7 +2112,7 @@ class UpdateHandler(BaseHandler):
             branch: string (default: "main") - for source updates
         """
         try:
-            data = tornado.escape.json_decode(self.request.body) if self.request.body else {}
+            data = _json_decode(self.request.body) if self.request.body else {}
         except json.JSONDecodeError:
             data = {}
         
@@ -1900,17 +2158,16 @@ class UpdateHandler(BaseHandler):
 class ServiceRestartHandler(BaseHandler):
     """Handler for restarting the service (Linux only)."""
     
+    # Pending delayed restart; the loop only keeps weak references to tasks
+    _restart_task: Optional[asyncio.Task] = None
+    
     async def post(self) -> None:
         """
         Restart the motion-frontend service.
         
         Only works on Linux with systemd.
         """
-        import platform
-        import subprocess
-        import asyncio
-        
-        if platform.system() != "Linux":
+        if not _IS_LINUX:
             self.write_json({
                 "success": False,
                 "error": "Service restart is only available on Linux"
@@ -1921,13 +2178,17 @@ class ServiceRestartHandler(BaseHandler):
             # Schedule the restart after sending response
             async def delayed_restart():
                 await asyncio.sleep(1)  # Give time for response to be sent
-                subprocess.run(
-                    ["sudo", "systemctl", "restart", "motion-frontend"],
-                    check=False
+                # The restart itself is carried out by systemd (PID 1), which then stops
+                # our whole cgroup; --no-block returns as soon as the job is queued.
+                proc = await asyncio.create_subprocess_exec(
+                    "sudo", "systemctl", "--no-block", "restart", "motion-frontend",
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL,
                 )
+                await proc.wait()  # Reap the child
             
             # Start the delayed restart
-            asyncio.create_task(delayed_restart())
+            ServiceRestartHandler._restart_task = asyncio.create_task(delayed_restart())
             
             self.write_json({
                 "success": True,
@@ -1948,34 +2209,65 @@ class LogDownloadHandler(BaseHandler):
     """Handler for downloading log files."""
     
     async def get(self) -> None:
-        """Download the current log file."""
-        from pathlib import Path
-        
-        log_file = Path(__file__).parent.parent / "logs" / "motion_frontend.log"
+        """Download the current log file.
         
-        if not log_file.exists():
-            self.set_status(404)
-            self.write_json({"error": "Log file not found"})
-            return
-        
-        try:
-            # Read log content
-            log_content = log_file.read_text(encoding="utf-8", errors="replace")
-            
-            # Set headers for file download
+        The file is streamed as raw bytes in 256 KB chunks (no UTF-8 decode),
+        so memory use stays constant regardless of log size. When running
+        behind nginx with ``log_accel_redirect`` configured, the transfer is
+        delegated to nginx via X-Accel-Redirect (sendfile, no Python copy).
+        """
+        accel_prefix = self.application.settings.get("log_accel_redirect")
+        if accel_prefix:
+            if not _LOG_FILE.is_file():
+                self.write_json({"error": "Log file not found"}, status=404)
+                return
             self.set_header("Content-Type", "text/plain; charset=utf-8")
             self.set_header(
                 "Content-Disposition",
-                f'attachment; filename="motion_frontend_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log"'
+                _LOG_DISPOSITION_FMT.format(time.strftime("%Y%m%d_%H%M%S"))
             )
-            
-            self.write(log_content)
+            self.set_header("X-Accel-Redirect", f"{accel_prefix.rstrip('/')}/{_LOG_FILE.name}")
+            return
+        
+        try:
+            log_file = open(_LOG_FILE, "rb")
+        except FileNotFoundError:
+            self.write_json({"error": "Log file not found"}, status=404)
+            return
+        
+        loop = asyncio.get_running_loop()
+        try:
+            with log_file:
+                # Snapshot the size: the logger may keep appending while we stream
+                remaining = os.fstat(log_file.fileno()).st_size
+                
+                # Set headers for file download
+                self.set_header("Content-Type", "text/plain; charset=utf-8")
+                self.set_header(
+                    "Content-Disposition",
+                    _LOG_DISPOSITION_FMT.format(time.strftime("%Y%m%d_%H%M%S"))
+                )
+                self.set_header("Content-Length", str(remaining))
+                
+                while remaining > 0:
+                    chunk = await loop.run_in_executor(
+                        None, log_file.read, min(_LOG_CHUNK_SIZE, remaining)
+                    )
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    self.write(chunk)
+                    await self.flush()
+        except tornado.iostream.StreamClosedError:
+            # Client disconnected
+            logger.debug("Log download: Client disconnected")
         except Exception as e:
-            self.set_status(500)
-            self.write_json({"error": str(e)})
+            logger.error("Log download error: %s", e)
+            if not self._headers_written:
+                self.write_json({"error": str(e)}, status=500)
 
 
-HANDLER_EXPORTS = [
+HANDLER_EXPORTS = (
     MainHandler,
     LoginHandler,
     LogoutHandler,
@@ -2018,4 +2310,4 @@ HANDLER_EXPORTS = [
     # Service control handlers
     ServiceRestartHandler,
     LogDownloadHandler,
-]
+)
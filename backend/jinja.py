@@ -1,10 +1,14 @@
-# File Version: 0.1.3
+# File Version: 0.1.8
 from __future__ import annotations
 
+import functools
+import logging
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Iterable, Mapping, Optional
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+logger = logging.getLogger(__name__)
 
 
 def _identity_translate(value: str, *args: Any, **kwargs: Any) -> str:
@@ -12,8 +16,31 @@ def _identity_translate(value: str, *args: Any, **kwargs: Any) -> str:
     return value
 
 
-def build_environment(template_path: Path) -> Environment:
-    loader = FileSystemLoader(str(template_path))
+def _build_bytecode_cache() -> Optional[BytecodeCache]:
+    """Return an on-disk cache of compiled templates, or None if unusable.
+
+    Jinja picks a per-user directory under the system temp dir and refuses
+    directories owned by another user.
+    """
+    try:
+        return FileSystemBytecodeCache()
+    except (OSError, RuntimeError) as exc:
+        logger.warning("Jinja bytecode cache disabled: %s", exc)
+        return None
+
+
+def build_environment(template_path: Path, auto_reload: bool = True) -> Environment:
+    """Return the shared Environment for ``template_path``.
+
+    Environments are memoized so every caller reuses the same in-process
+    template cache.
+    """
+    return _build_environment_cached(str(template_path), auto_reload)
+
+
+@functools.lru_cache(maxsize=32)
+def _build_environment_cached(template_path: str, auto_reload: bool) -> Environment:
+    loader = FileSystemLoader(template_path)
     env = Environment(  # noqa: S701 (we want full control)
         loader=loader,
         autoescape=select_autoescape(["html", "xml", "j2"]),
@@ -21,14 +48,34 @@ def build_environment(template_path: Path) -> Environment:
         trim_blocks=True,
         lstrip_blocks=True,
         extensions=["jinja2.ext.do"],
+        bytecode_cache=_build_bytecode_cache(),
+        # Production skips the per-render stat() of template files
+        auto_reload=auto_reload,
     )
     env.globals["_"] = _identity_translate
     return env
 
 
-def render(env: Environment, template_name: str, context: Dict[str, Any]) -> str:
-    template = env.get_template(template_name)
-    # Ensure _ is always available even if context tries to override it with None
-    if "_" not in context or context.get("_") is None:
-        context["_"] = _identity_translate
-    return template.render(**context)
+def precompile(env: Environment, names: Optional[Iterable[str]] = None) -> int:
+    """Load templates into the Environment cache ahead of the first request.
+
+    Defaults to every ``.html`` template the loader can see. Returns the
+    number of templates compiled.
+    """
+    if names is None:
+        names = env.list_templates(extensions=["html"])
+    count = 0
+    for name in names:
+        env.get_template(name)
+        count += 1
+    return count
+
+
+def render(env: Environment, template_name: str, context: Mapping[str, Any]) -> str:
+    """Render ``template_name`` with ``context``.
+
+    The context is treated as read-only, so immutable mappings such as
+    ``types.MappingProxyType`` can be shared between requests. ``_`` is
+    provided by ``env.globals``.
+    """
+    return env.get_template(template_name).render(context)
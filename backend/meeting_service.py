@@ -3,15 +3,18 @@
 Meeting API integration service for Motion Frontend.
 Handles heartbeat signaling and device status reporting to Meeting server.
 
-Version: 0.4.0
+Version: 0.4.18
 """
 
 import asyncio
+import json
 import logging
 import platform
+import random
 import socket
+import time
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +33,64 @@ try:
 except ImportError:
     REQUESTS_AVAILABLE = False
 
+# Optional: faster JSON encoding/decoding for Meeting requests
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize a request body, using orjson when installed (aiohttp expects str)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _json_loads(text: str) -> Any:
+    """Parse a response body, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _read_hostname() -> str:
+    """Return the device hostname, or "unknown" if it cannot be read."""
+    try:
+        return socket.gethostname()
+    except Exception:
+        return "unknown"
+
+
+def _probe_local_ip() -> Optional[str]:
+    """Return the address of the interface holding the default route (blocking)."""
+    try:
+        # Create a socket to determine the local IP (no packet is sent)
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("8.8.8.8", 80))
+            return s.getsockname()[0]
+    except Exception:
+        return None
+
+
+# Service ports advertised in the heartbeat (http is filled in per beat)
+_BASE_SERVICES: Dict[str, int] = {"ssh": 22, "vnc": 0, "mjpeg": 8081}
+
+# Public IP cache lifetime (seconds) and providers, queried concurrently
+_PUBLIC_IP_CACHE_TTL = 300.0
+_PUBLIC_IP_SERVICES = (
+    "https://api.ipify.org?format=json",
+    "https://httpbin.org/ip",
+    "https://api.my-ip.io/v2/ip.json",
+)
+
+# Upper bound (seconds) for the failure backoff between heartbeats
+_MAX_BACKOFF_DELAY = 1800.0
+
+# Seconds before the local IP is re-resolved (picks up DHCP/network changes)
+_LOCAL_IP_CACHE_TTL = 60.0
+
 
 class MeetingService:
     """
@@ -40,6 +101,30 @@ class MeetingService:
     - Status reporting (IP addresses, services, device info, cameras)
     """
     
+    # Long-lived singleton: no per-instance __dict__, slot attribute access
+    __slots__ = (
+        "_server_url",
+        "_device_key",
+        "_token_code",
+        "_heartbeat_interval",
+        "_heartbeat_task",
+        "_heartbeat_timer",
+        "_last_heartbeat",
+        "_last_heartbeat_success",
+        "_last_error",
+        "_fail_streak",
+        "_is_running",
+        "_session",
+        "_send_lock",
+        "_get_cameras_callback",
+        "_get_http_port_callback",
+        "_hostname",
+        "_static_payload",
+        "_local_ip_cache",
+        "_public_ip",
+        "_public_ip_last_fetch",
+    )
+    
     def __init__(self) -> None:
         self._server_url = ""
         self._device_key = ""
@@ -48,19 +133,37 @@ class MeetingService:
         
         # Runtime state
         self._heartbeat_task: Optional[asyncio.Task] = None
+        self._heartbeat_timer: Optional[asyncio.TimerHandle] = None
         self._last_heartbeat: Optional[datetime] = None
         self._last_heartbeat_success = False
         self._last_error: Optional[str] = None
+        self._fail_streak = 0  # consecutive failed heartbeats (drives backoff)
         self._is_running = False
         self._session: Optional[aiohttp.ClientSession] = None
+        self._send_lock = asyncio.Lock()
         
         # Callback to get camera info from config_store
         self._get_cameras_callback: Optional[Callable[[], List[Dict[str, Any]]]] = None
         self._get_http_port_callback: Optional[Callable[[], int]] = None
         
+        # Process-lifetime constants sent with every heartbeat
+        self._hostname = _read_hostname()
+        self._static_payload: Dict[str, Any] = {
+            "hostname": self._hostname,
+            "platform": {
+                "system": platform.system(),
+                "release": platform.release(),
+                "machine": platform.machine(),
+                "python": platform.python_version()
+            },
+        }
+        
+        # Cached local IP: (ip, monotonic fetch time)
+        self._local_ip_cache: Optional[Tuple[str, float]] = None
+        
         # Cached public IP (fetched periodically)
         self._public_ip: Optional[str] = None
-        self._public_ip_last_fetch: Optional[datetime] = None
+        self._public_ip_last_fetch = 0.0  # time.monotonic() of the last successful fetch
     
     def set_callbacks(
         self,
@@ -126,18 +229,45 @@ class MeetingService:
         self._is_running = True
         self._last_error = None
         
-        # Create aiohttp session
-        self._session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30),
-            headers={"Content-Type": "application/json"}
-        )
-        
-        # Start heartbeat loop
-        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        # Send the first heartbeat immediately; each beat schedules the next
+        logger.info("Meeting heartbeat scheduler started")
+        self._heartbeat_task = asyncio.create_task(self._heartbeat_once())
         return True
     
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Return the pooled HTTP session, creating it on first use.
+        
+        This is the only place a session is created; stop() closes it.
+        Creation has no await point, so concurrent callers on the event loop
+        cannot race into building two sessions.
+        """
+        if self._session is None or self._session.closed:
+            # Uses aiodns for non-blocking resolution when installed (aiohttp[speedups])
+            connector = aiohttp.TCPConnector(
+                limit=10,
+                limit_per_host=4,
+                # Outlive the heartbeat interval so each beat reuses the connection
+                keepalive_timeout=600,
+                use_dns_cache=True,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                json_serialize=_json_dumps,
+                timeout=aiohttp.ClientTimeout(total=30),
+                headers={"Content-Type": "application/json"}
+            )
+        return self._session
+    
     async def stop(self) -> None:
         """Stop the heartbeat service."""
+        # Cleared first so an in-flight beat does not schedule another one
+        self._is_running = False
+        
+        if self._heartbeat_timer:
+            self._heartbeat_timer.cancel()
+            self._heartbeat_timer = None
+        
         if self._heartbeat_task:
             self._heartbeat_task.cancel()
             try:
@@ -150,37 +280,72 @@ class MeetingService:
             await self._session.close()
             self._session = None
         
-        self._is_running = False
         logger.info("Meeting heartbeat service stopped")
     
-    async def _heartbeat_loop(self) -> None:
-        """Main heartbeat loop - sends periodic online signals."""
-        logger.info("Meeting heartbeat loop started")
+    def _schedule_heartbeat(self, delay: float) -> None:
+        """Arm a single timer for the next beat (no task sleeps in between)."""
+        self._heartbeat_timer = asyncio.get_running_loop().call_later(delay, self._on_heartbeat_timer)
+    
+    def _on_heartbeat_timer(self) -> None:
+        self._heartbeat_timer = None
+        if self._is_running:
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_once())
+    
+    def _next_heartbeat_delay(self) -> float:
+        """Heartbeat interval, backed off exponentially (with jitter) while beats fail.
         
-        # Send initial heartbeat immediately
-        await self._send_heartbeat()
+        A rejected beat (bad token, unknown device, server down) is retried
+        at 2x, 4x, ... the interval up to _MAX_BACKOFF_DELAY; the first
+        successful beat restores the normal interval. Only periodic beats
+        count as failures, so manual retries from the UI can't stretch it.
+        """
+        if not self._fail_streak:
+            return self._heartbeat_interval
+        backoff = self._heartbeat_interval * (2 ** min(self._fail_streak, 10))
+        cap = max(self._heartbeat_interval, _MAX_BACKOFF_DELAY)
+        return min(backoff, cap) + random.uniform(0, 5)
+    
+    async def _heartbeat_once(self) -> None:
+        """Send one periodic heartbeat, then schedule the next."""
+        try:
+            if not await self._send_heartbeat():
+                self._fail_streak += 1
+            delay = self._next_heartbeat_delay()
+        except asyncio.CancelledError:
+            logger.info("Heartbeat cancelled")
+            raise
+        except Exception as e:
+            logger.error("Heartbeat error: %s", e)
+            self._last_error = str(e)
+            delay = 10  # Retry sooner on error
         
-        while self._is_running:
-            try:
-                await asyncio.sleep(self._heartbeat_interval)
-                await self._send_heartbeat()
-            except asyncio.CancelledError:
-                logger.info("Heartbeat loop cancelled")
-                break
-            except Exception as e:
-                logger.error("Heartbeat loop error: %s", e)
-                self._last_error = str(e)
-                await asyncio.sleep(10)  # Wait before retry on error
+        if self._is_running:
+            self._schedule_heartbeat(delay)
     
     async def _send_heartbeat(self) -> bool:
+        """Send heartbeat to Meeting server, one request in flight at a time.
+        
+        A manual heartbeat issued while a periodic one is in progress waits
+        for it instead of racing it on the same URL and status fields.
+        """
+        async with self._send_lock:
+            success = await self._post_heartbeat()
+        if success:
+            # Any accepted beat, periodic or manual, ends the backoff
+            self._fail_streak = 0
+        return success
+    
+    async def _post_heartbeat(self) -> bool:
         """Send heartbeat to Meeting server with comprehensive device data."""
-        if not self._session:
+        if not AIOHTTP_AVAILABLE:
             return False
         
+        # Every send path (periodic, manual) goes through the one pooled session
+        session = self._get_session()
         url = f"{self._server_url}/api/devices/{self._device_key}/online"
         
         # Get IP addresses
-        local_ip = self._get_local_ip()
+        local_ip = await self._get_local_ip()
         public_ip = await self._get_public_ip()
         
         # Get HTTP port from callback
@@ -195,48 +360,42 @@ class MeetingService:
         cameras_info = []
         if self._get_cameras_callback:
             try:
-                cameras = self._get_cameras_callback()
-                for cam in cameras:
-                    cam_id = cam.get("id", "1")
-                    cameras_info.append({
-                        "id": cam_id,
-                        "name": cam.get("name", f"Camera {cam_id}"),
+                cameras_info = [
+                    {
+                        "id": (cam_id := cam.get("id", "1")),
+                        "name": cam.get("name") or f"Camera {cam_id}",
                         "enabled": cam.get("enabled", True),
                         "stream_url": f"/stream/{cam_id}/"
-                    })
+                    }
+                    for cam in self._get_cameras_callback()
+                ]
             except Exception as e:
                 logger.debug("Could not get camera info: %s", e)
         
-        # Build comprehensive payload
+        # Build comprehensive payload (platform info is computed once in __init__)
         payload = {
+            **self._static_payload,
             "ip_address": local_ip,
             "public_ip": public_ip,
-            "hostname": self._get_hostname(),
-            "platform": {
-                "system": platform.system(),
-                "release": platform.release(),
-                "machine": platform.machine(),
-                "python": platform.python_version()
-            },
-            "services": {
-                "ssh": 22,
-                "http": http_port,
-                "vnc": 0,
-                "mjpeg": 8081
-            },
+            "services": {**_BASE_SERVICES, "http": http_port},
             "cameras": cameras_info,
-            "note": f"Motion Frontend - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+            # Same "YYYY-MM-DD HH:MM:SS" text as strftime, without the format-code parser
+            "note": f"Motion Frontend - {datetime.now().isoformat(sep=' ', timespec='seconds')}"
         }
         
         try:
-            async with self._session.post(url, json=payload) as response:
+            async with session.post(url, json=payload) as response:
                 self._last_heartbeat = datetime.now()
                 
                 if response.status == 200:
-                    data = await response.json()
                     self._last_heartbeat_success = True
                     self._last_error = None
-                    logger.debug("Heartbeat sent successfully: %s", data)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        data = await response.json(loads=_json_loads)
+                        logger.debug("Heartbeat sent successfully: %s", data)
+                    else:
+                        # Drain the body so the connection goes back to the pool
+                        await response.read()
                     return True
                 else:
                     error_text = await response.text()
@@ -260,84 +419,80 @@ class MeetingService:
     
     async def _get_public_ip(self) -> Optional[str]:
         """Get public IP address (cached for 5 minutes)."""
-        now = datetime.now()
-        
         # Return cached IP if still valid (5 min cache)
-        if (self._public_ip and self._public_ip_last_fetch and 
-            (now - self._public_ip_last_fetch).total_seconds() < 300):
+        if self._public_ip and time.monotonic() - self._public_ip_last_fetch < _PUBLIC_IP_CACHE_TTL:
             return self._public_ip
         
-        # Try to fetch public IP from external service
-        public_ip_services = [
-            "https://api.ipify.org?format=json",
-            "https://httpbin.org/ip",
-            "https://api.my-ip.io/v2/ip.json"
-        ]
-        
-        for service_url in public_ip_services:
-            try:
-                async with self._session.get(service_url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        # Handle different response formats
-                        ip = data.get("ip") or data.get("origin") or data.get("ip_address")
-                        if ip:
-                            self._public_ip = ip.split(",")[0].strip()  # Handle multiple IPs
-                            self._public_ip_last_fetch = now
-                            logger.debug("Public IP fetched: %s", self._public_ip)
-                            return self._public_ip
-            except Exception as e:
-                logger.debug("Failed to fetch public IP from %s: %s", service_url, e)
-                continue
+        # Query all providers concurrently; the first valid answer wins
+        pending = {
+            asyncio.create_task(self._fetch_public_ip(url))
+            for url in _PUBLIC_IP_SERVICES
+        }
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    ip = task.result()
+                    if ip:
+                        self._public_ip = ip
+                        self._public_ip_last_fetch = time.monotonic()
+                        logger.debug("Public IP fetched: %s", self._public_ip)
+                        return self._public_ip
+        finally:
+            for task in pending:
+                task.cancel()
         
         return self._public_ip  # Return last known or None
     
-    def _get_hostname(self) -> str:
-        """Get device hostname."""
+    async def _fetch_public_ip(self, service_url: str) -> Optional[str]:
+        """Query one public IP provider. Returns None on any failure."""
         try:
-            return socket.gethostname()
-        except Exception:
-            return "unknown"
-            return False
+            async with self._get_session().get(service_url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
+                if resp.status == 200:
+                    data = await resp.json(loads=_json_loads)
+                    # Handle different response formats
+                    ip = data.get("ip") or data.get("origin") or data.get("ip_address")
+                    if ip:
+                        return ip.split(",")[0].strip()  # Handle multiple IPs
+        except Exception as e:
+            logger.debug("Failed to fetch public IP from %s: %s", service_url, e)
+        return None
     
-    def _get_local_ip(self) -> str:
-        """Get the local IP address."""
-        try:
-            # Create a socket to determine the local IP
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            ip = s.getsockname()[0]
-            s.close()
-            return ip
-        except Exception:
+    def _get_hostname(self) -> str:
+        """Get device hostname (resolved once at construction)."""
+        return self._hostname
+    
+    async def _get_local_ip(self) -> str:
+        """Get the local IP address (cached for 60 seconds).
+        
+        Cache misses run the socket probe in the default executor so a
+        slow routing lookup never stalls the event loop.
+        """
+        now = time.monotonic()
+        if self._local_ip_cache and now - self._local_ip_cache[1] < _LOCAL_IP_CACHE_TTL:
+            return self._local_ip_cache[0]
+        ip = await asyncio.get_running_loop().run_in_executor(None, _probe_local_ip)
+        if ip is None:
+            # Not cached: retry on the next beat once the network is back
             return "127.0.0.1"
+        self._local_ip_cache = (ip, now)
+        return ip
     
     async def send_manual_heartbeat(self) -> Dict[str, Any]:
         """Send a manual heartbeat (for testing/forcing)."""
         if not self.is_configured():
             return {"success": False, "error": "Service non configuré"}
         
-        if not self._session:
-            # Create temporary session for manual heartbeat
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=30),
-                headers={"Content-Type": "application/json"}
-            ) as session:
-                self._session = session
-                result = await self._send_heartbeat()
-                self._session = None
-                return {
-                    "success": result,
-                    "last_heartbeat": self._last_heartbeat.isoformat() if self._last_heartbeat else None,
-                    "error": self._last_error
-                }
-        else:
-            result = await self._send_heartbeat()
-            return {
-                "success": result,
-                "last_heartbeat": self._last_heartbeat.isoformat() if self._last_heartbeat else None,
-                "error": self._last_error
-            }
+        if not AIOHTTP_AVAILABLE:
+            return {"success": False, "error": "aiohttp non disponible"}
+        
+        # Uses the pooled session; keep-alive connections are closed in stop()
+        result = await self._send_heartbeat()
+        return {
+            "success": result,
+            "last_heartbeat": self._last_heartbeat.isoformat() if self._last_heartbeat else None,
+            "error": self._last_error
+        }
 
 
 # Global Meeting service instance
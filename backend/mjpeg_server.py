@@ -4,37 +4,313 @@ MJPEG streaming server for Motion Frontend.
 Captures frames from cameras and streams them via HTTP multipart.
 Each camera has its own dedicated HTTP server on a configurable port.
 
-Version: 0.9.6
+Version: 0.9.53
 """
 
 import asyncio
 import base64
+import functools
+import hashlib
 import logging
+import os
 import platform
+import re
 import socket
 import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from dataclasses import dataclass, field
-from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from typing import AsyncGenerator, Dict, Optional, List, Callable, Any
-from queue import Queue, Empty
+from typing import AsyncGenerator, Dict, Optional, List, Callable, Any, Mapping, Set, Tuple, Union
+from queue import Queue, Empty, Full
 import io
 
+from aiohttp import web
+
 logger = logging.getLogger(__name__)
 
 # Try to import OpenCV
 try:
     import cv2
+    import numpy as np
     OPENCV_AVAILABLE = True
 except ImportError:
     OPENCV_AVAILABLE = False
     logger.warning("OpenCV not available. MJPEG streaming will be disabled.")
 
+# Optional: libjpeg-turbo SIMD encoder, used instead of cv2.imencode when present
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+    _TURBOJPEG = TurboJPEG()
+    TURBOJPEG_AVAILABLE = True
+except Exception:  # ImportError, or the libturbojpeg shared library is missing
+    _TURBOJPEG = None
+    TURBOJPEG_AVAILABLE = False
+
+
+# Multipart part header, formatted with the JPEG length for every frame
+MJPEG_PART_HEADER = b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n"
+
+# Send buffer for stream clients. Only applied off Linux: setting SO_SNDBUF
+# there disables the kernel's TCP send buffer autotuning (up to tcp_wmem max).
+MJPEG_SNDBUF = 1 << 20
+_SET_SNDBUF = platform.system() != "Linux"
+
+# Cap on not-yet-sent bytes queued in the kernel per stream client: a slow client
+# backs up into its drop-oldest frame queue instead of a deep stale socket buffer
+MJPEG_NOTSENT_LOWAT = 1 << 17
+
+
+def _tune_stream_socket(sock: socket.socket) -> None:
+    """Apply the stream client socket options (best effort, TCP_NODELAY is set by aiohttp)."""
+    try:
+        if _SET_SNDBUF:
+            # Fewer partial sends per large JPEG (Linux autotunes, see _SET_SNDBUF)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, MJPEG_SNDBUF)
+        if hasattr(socket, "TCP_NOTSENT_LOWAT"):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NOTSENT_LOWAT, MJPEG_NOTSENT_LOWAT)
+    except OSError:
+        pass
+
+def _jpeg_encode_params(quality: int) -> List[int]:
+    """cv2.imencode() parameters for stream frames, built once per capture session.
+    
+    Pins the fast baseline settings (4:2:0 chroma, no Huffman optimization, not
+    progressive) so every OpenCV build produces the same compact output.
+    """
+    params = [
+        cv2.IMWRITE_JPEG_QUALITY, quality,
+        cv2.IMWRITE_JPEG_OPTIMIZE, 0,
+        cv2.IMWRITE_JPEG_PROGRESSIVE, 0,
+    ]
+    # Sampling factor flag exists since OpenCV 4.5.5
+    if hasattr(cv2, "IMWRITE_JPEG_SAMPLING_FACTOR"):
+        params += [cv2.IMWRITE_JPEG_SAMPLING_FACTOR, cv2.IMWRITE_JPEG_SAMPLING_FACTOR_420]
+    return params
+
+
+# The encoder is chosen once at import: one specialized _encode_jpeg, no per-frame test
+if _TURBOJPEG is not None:
+    def _encode_jpeg(frame: Any, quality: int, encode_params: List[int]) -> Any:
+        """Encode a BGR frame to JPEG with PyTurboJPEG.
+        
+        Encodes straight from the ndarray to bytes, no intermediate Mat buffer
+        (encode_params is only used by the OpenCV variant).
+        """
+        return _TURBOJPEG.encode(frame, quality=quality, pixel_format=TJPF_BGR, jpeg_subsample=TJSAMP_420)
+else:
+    def _encode_jpeg(frame: Any, quality: int, encode_params: List[int]) -> Any:
+        """Encode a BGR frame to JPEG with OpenCV.
+        
+        Returns OpenCV's uint8 buffer, not copied again here: callers build the
+        multipart packet straight from it (any bytes-like object works).
+        """
+        _, buffer = cv2.imencode('.jpg', frame, encode_params)
+        return buffer
+
+
+def _timed_encode_jpeg(frame: Any, quality: int, encode_params: List[int]) -> Tuple[Any, float]:
+    """_encode_jpeg() plus its duration in seconds (measured on the encoding thread)."""
+    start = time.perf_counter()
+    jpeg = _encode_jpeg(frame, quality, encode_params)
+    return jpeg, time.perf_counter() - start
+
+
+# Adaptive quality (CameraStream.adaptive_quality): when the encode time average
+# stays above 60% of the frame interval for 5 frames, quality drops by 5 (down to
+# 40); below 30% it climbs back by 5 toward the configured quality.
+ADAPTIVE_QUALITY_MIN = 40
+_ADAPTIVE_QUALITY_STEP = 5
+_ADAPTIVE_QUALITY_FRAMES = 5
+
+
+def _is_jpeg_buffer(frame: Any) -> bool:
+    """True if a captured frame is a raw JPEG buffer (starts with the SOI marker)."""
+    if frame is None or frame.ndim > 2 or frame.size < 2:
+        return False
+    flat = frame.reshape(-1)
+    return flat[0] == 0xFF and flat[1] == 0xD8
+
+
+@functools.lru_cache(maxsize=256)
+def _text_size(text: str, font_scale: float, thickness: int) -> tuple:
+    """Memoized cv2.getTextSize() for the overlay font: ((width, height), baseline)."""
+    return cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)
+
+
+@functools.lru_cache(maxsize=32)
+def _render_text_sprite(text: str, font_scale: float, thickness: int) -> Any:
+    """Rasterize overlay text on its black background box, once per distinct text.
+    
+    The box is opaque, so drawing the overlay is a plain ROI copy of this patch.
+    The text origin sits 2 px from the left edge and text height + 2 px from the top.
+    """
+    (text_width, text_height), baseline = _text_size(text, font_scale, thickness)
+    sprite = np.zeros((text_height + 3 + max(4, baseline), text_width + 5, 3), dtype=np.uint8)
+    cv2.putText(sprite, text, (2, text_height + 2), cv2.FONT_HERSHEY_SIMPLEX, font_scale, (255, 255, 255), thickness)
+    # Shared by every camera thread through the cache: never modified after this point
+    sprite.flags.writeable = False
+    return sprite
+
+
+@functools.lru_cache(maxsize=64)
+def _overlay_layout(text: str, right_aligned: bool, frame_width: int, frame_height: int,
+                    text_scale: int) -> Optional[Tuple[Any, slice, slice]]:
+    """Lay out one overlay side: (sprite, rows, cols) of its clipped frame ROI.
+    
+    Drawing is then a single `frame[rows, cols] = sprite` copy. Every input that affects the result is part of the cache key, so configuration
+    changes (text, scale, resolution) never need explicit invalidation.
+    """
+    # Calculate font scale based on image size and text scale setting
+    # Base scale is relative to 720p, text_scale is 1-10
+    base_scale = frame_height / 720.0
+    font_scale = base_scale * (text_scale / 5.0)  # Scale 5 = base size
+    font_scale = max(0.3, min(3.0, font_scale))  # Clamp to reasonable range
+    
+    thickness = max(1, int(font_scale * 2))
+    
+    # Padding from edges
+    padding = max(5, int(10 * base_scale))
+    
+    # Text baseline Y position (bottom of frame with padding)
+    y_pos = frame_height - padding - 4
+    
+    text_size = _text_size(text, font_scale, thickness)[0]
+    if right_aligned:
+        # Ensure x_pos is not negative
+        x_pos = max(padding, frame_width - text_size[0] - padding)
+    else:
+        x_pos = padding
+        # Ensure text fits within frame
+        if x_pos + text_size[0] > frame_width - padding:
+            # Truncate text if too long
+            while len(text) > 3 and _text_size(text + "...", font_scale, thickness)[0][0] > frame_width // 2:
+                text = text[:-1]
+            text += "..."
+            text_size = _text_size(text, font_scale, thickness)[0]
+    
+    # Pre-rendered text on its background box, copied into the frame
+    sprite = _render_text_sprite(text, font_scale, thickness)
+    
+    # Sprite top-left corner, then the exact ROI clipped to the frame (None if off-frame)
+    x, y = x_pos - 2, y_pos - text_size[1] - 2
+    sprite_height, sprite_width = sprite.shape[:2]
+    x0, y0 = max(0, x), max(0, y)
+    x1, y1 = min(frame_width, x + sprite_width), min(frame_height, y + sprite_height)
+    if x0 >= x1 or y0 >= y1:
+        return None
+    return sprite[y0 - y:y1 - y, x0 - x:x1 - x], slice(y0, y1), slice(x0, x1)
+
+
+# (epoch second, formatted local time) of the last timestamp overlay
+_timestamp_cache: List[Any] = [0, ""]
+
+
+def _overlay_timestamp(camera: Any, custom_text: str) -> str:
+    """Overlay handler for 'timestamp', formatted at most once per second."""
+    now = int(time.time())
+    if now != _timestamp_cache[0]:
+        _timestamp_cache[:] = [now, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))]
+    return _timestamp_cache[1]
+
+
+def _no_overlay_text(camera: Any, custom_text: str) -> str:
+    """Overlay handler for unknown overlay types."""
+    return ""
+
+
+def _build_resize_plan(src_width: int, src_height: int,
+                       dst_width: int, dst_height: int) -> List[Tuple[Tuple[int, int], int, Any]]:
+    """Resize steps (dsize, interpolation, reused destination buffer) for a fixed size pair.
+    
+    OpenCV's INTER_AREA is only fast (and exact) for 2x integer reductions, while
+    INTER_LINEAR is fast for any ratio but aliases on large downscales. Downscales
+    therefore halve with INTER_AREA as long as possible, then finish with INTER_LINEAR.
+    """
+    steps = []
+    while (src_width // 2 >= dst_width and src_height // 2 >= dst_height
+           and src_width % 2 == 0 and src_height % 2 == 0):
+        src_width, src_height = src_width // 2, src_height // 2
+        steps.append(((src_width, src_height), cv2.INTER_AREA))
+    if (src_width, src_height) != (dst_width, dst_height):
+        steps.append(((dst_width, dst_height), cv2.INTER_LINEAR))
+    # Destination buffers allocated once: no new array per frame
+    return [(dsize, interpolation, np.empty((dsize[1], dsize[0], 3), dtype=np.uint8))
+            for dsize, interpolation in steps]
+
+
+def _make_resizer(dst_width: int, dst_height: int) -> Callable[[Any], Any]:
+    """Resize stage specialized once per capture start, for frames needing a resize.
+    
+    The closure owns its resize plan, built on the first frame (and rebuilt if the
+    frame size changes), so the capture loop keeps no resize state of its own.
+    """
+    plan: List[Tuple[Tuple[int, int], int, Any]] = []
+    src_shape: Optional[Tuple[int, ...]] = None
+    
+    def resize(frame: Any) -> Any:
+        nonlocal plan, src_shape
+        if frame.shape[:2] != src_shape:
+            src_shape = frame.shape[:2]
+            plan = _build_resize_plan(src_shape[1], src_shape[0], dst_width, dst_height)
+        for dsize, interpolation, dst in plan:
+            frame = cv2.resize(frame, dsize, dst=dst, interpolation=interpolation)
+        return frame
+    
+    return resize
+
+
+# Static scene detection (CameraStream.dedupe_static): a frame is "unchanged" when no
+# cell of a 32x32 thumbnail differs by more than MJPEG_STATIC_TOLERANCE grey levels
+# from the last encoded frame. Unchanged frames are not encoded; the last packet is
+# re-sent every MJPEG_STATIC_KEEPALIVE seconds (below the 1 s placeholder timeout of
+# frame_generator) so clients keep a live stream.
+MJPEG_STATIC_TOLERANCE = 3
+MJPEG_STATIC_KEEPALIVE = 0.5
+_STATIC_SAMPLE_STEP = 8
+
+
+def _static_thumbnail(frame: Any) -> Any:
+    """32x32 average of every 8th pixel: sensor noise averages out, and it costs
+    well under a millisecond at 1080p (vs ~20 ms for the JPEG encode it can save)."""
+    return cv2.resize(frame[::_STATIC_SAMPLE_STEP, ::_STATIC_SAMPLE_STEP], (32, 32),
+                      interpolation=cv2.INTER_AREA)
+
+
+# v4l2-ctl --list-framesizes / --list-formats-ext output (_detect_v4l2_resolutions)
+_V4L2_DISCRETE_RE = re.compile(r'Size:\s+Discrete\s+(\d+)x(\d+)')
+_V4L2_STEPWISE_RE = re.compile(r'Size:\s+Stepwise\s+(\d+)x(\d+)\s+-\s+(\d+)x(\d+)')
+_V4L2_SIZE_RE = re.compile(r'(\d+)x(\d+)')
+
+
+# Minimal 1x1 black JPEG, used as placeholder when OpenCV is not available
+_PLACEHOLDER_NO_OPENCV = bytes.fromhex(
+    "FFD8FFE000104A46494600010100000100010000FFDB0043000806060706050807070709"
+    "09080A0C140D0C0B0B0C1912130F141D1A1F1E1D1A1C1C20242E2720222C231C1C283729"
+    "2C30313434341F27393D38323C2E333432FFC0000B080001000101011100FFC4001F0000"
+    "010501010101010100000000000000000102030405060708090A0BFFC400B51000020103"
+    "03020403050504040000017D01020300041105122131410613516107227114328191A108"
+    "2342B1C11552D1F02433627282090A161718191A25262728292A3435363738393A434445"
+    "464748494A535455565758595A636465666768696A737475767778797A83848586878889"
+    "8A92939495969798999AA2A3A4A5A6A7A8A9AAB2B3B4B5B6B7B8B9BAC2C3C4C5C6C7C8C9"
+    "CAD2D3D4D5D6D7D8D9DAE1E2E3E4E5E6E7E8E9EAF1F2F3F4F5F6F7F8F9FAFFDA00080101"
+    "00003F00FBD5DB20A8F145001450014500FFD9"
+)
+
 
 # Type for auth verification callback
 AuthVerifyCallback = Callable[[str, str], bool]
 
+# Recently accepted stream credentials: (camera_id, sha256(Authorization header)) -> accept time.
+# Spares the bcrypt check when clients reconnect; only successes are cached.
+_AUTH_CACHE: Dict[tuple, float] = {}
+_AUTH_CACHE_TTL = 30.0
+_AUTH_CACHE_MAX = 256
+
+
+def invalidate_auth_cache() -> None:
+    """Forget every cached stream login (called whenever the user store changes)."""
+    _AUTH_CACHE.clear()
+
 
 @dataclass
 class CameraStream:
@@ -58,176 +334,294 @@ class CameraStream:
     overlay_right_text: str = "timestamp"
     overlay_right_custom: str = ""
     overlay_text_scale: int = 3  # 1-10
+    overlay_background_opacity: float = 1.0  # Text box darkening, 0.0 (none) - 1.0 (opaque black)
+    
+    # Capture thread scheduling (Linux only, opt-in)
+    cpu_affinity: Optional[Set[int]] = None  # CPUs the capture thread is pinned to (None = any)
+    realtime_priority: int = 0  # SCHED_FIFO priority 1-99 (0 = normal scheduling, needs CAP_SYS_NICE)
+    
+    # Skip encoding while the scene is static (see MJPEG_STATIC_TOLERANCE)
+    dedupe_static: bool = False
+    # Lower JPEG quality while encoding can't keep up (see ADAPTIVE_QUALITY_MIN); opt-in
+    adaptive_quality: bool = False
     
     # Runtime state
     capture: Any = field(default=None, repr=False)
     is_running: bool = False
     frame_count: int = 0
-    last_frame: Optional[bytes] = None
+    # Latest JPEG as a complete multipart part, built once per frame for all clients
+    # (the bare JPEG is sliced out on demand, see last_frame)
+    last_frame_packet: Optional[bytes] = None
     last_frame_time: float = 0
     last_frame_size: int = 0  # Size of last frame in bytes
     error: Optional[str] = None
-    subscribers: List[Queue] = field(default_factory=list)
+    # Per-client frame queues fed by MJPEGServer._publish(): Queue for thread consumers,
+    # _AsyncFrameQueue for event loop consumers. Immutable snapshot, replaced under _lock
+    # (add_subscriber/remove_subscriber) so the capture thread reads it without locking.
+    subscribers: Tuple[Union[Queue, "_AsyncFrameQueue"], ...] = ()
     _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
     
-    # Stats tracking (for real-time FPS and bandwidth)
-    _stats_start_time: float = field(default=0, repr=False)
+    # Stats tracking (for real-time FPS and bandwidth), written by the capture thread only
+    _stats_start_time: float = field(default=0, repr=False)  # time.monotonic()
+    # time.time() - time.monotonic(), re-read once per stats window: frame timestamps
+    # need no wall-clock call per frame
+    _wall_offset: float = field(default=0, repr=False)
     _stats_frame_count: int = field(default=0, repr=False)
     _stats_bytes_sent: int = field(default=0, repr=False)
     _real_fps: float = field(default=0, repr=False)
     _bandwidth_kbps: float = field(default=0, repr=False)
     
-    # HTTP server for this camera's stream
+    # Adaptive quality state (capture thread only): quality in use, encode time
+    # average (s), and consecutive over (+) / under (-) budget frames
+    _effective_quality: int = field(default=0, repr=False)
+    _encode_ewma: float = field(default=0, repr=False)
+    _encode_streak: int = field(default=0, repr=False)
+    # Set by update_camera() when adaptive_quality is toggled; the capture thread
+    # applies the reset so it stays the only writer of the state above
+    _quality_reset: bool = field(default=False, repr=False)
+    
+    # Camera JPEGs forwarded without re-encoding (see MJPEGServer._capture_loop)
+    _passthrough_mjpeg: bool = field(default=False, repr=False)
+    
+    # aiohttp runner serving this camera's dedicated port
     _http_server: Any = field(default=None, repr=False)
-    _http_thread: Any = field(default=None, repr=False)
+    
+    # (packet, JPEG) of the last last_frame lookup, shared by all still-frame readers
+    _last_frame_cache: Optional[Tuple[bytes, bytes]] = field(default=None, repr=False)
+    
+    @property
+    def last_frame(self) -> Optional[bytes]:
+        """Latest JPEG frame, copied out of last_frame_packet once per frame and only when requested."""
+        packet = self.last_frame_packet
+        if packet is None:
+            return None
+        cached = self._last_frame_cache
+        if cached is not None and cached[0] is packet:
+            return cached[1]
+        # Strip the part header (ends with the first blank line) and the trailing CRLF
+        frame = packet[packet.index(b"\r\n\r\n") + 4:-2]
+        self._last_frame_cache = (packet, frame)
+        return frame
+    
+    def add_subscriber(self, queue: Union[Queue, "_AsyncFrameQueue"]) -> None:
+        """Register a frame queue (copy-on-write of the subscriber snapshot)."""
+        with self._lock:
+            self.subscribers = self.subscribers + (queue,)
+    
+    def remove_subscriber(self, queue: Union[Queue, "_AsyncFrameQueue"]) -> None:
+        """Unregister a frame queue, if present."""
+        with self._lock:
+            if queue in self.subscribers:
+                self.subscribers = tuple(q for q in self.subscribers if q is not queue)
 
 
-def create_mjpeg_handler(camera_stream: CameraStream):
-    """Factory function to create an MJPEG stream handler for a specific camera."""
+class _AsyncFrameQueue:
+    """Subscriber queue read on an asyncio loop and fed by the capture thread.
     
-    class MJPEGStreamHandler(BaseHTTPRequestHandler):
-        """HTTP request handler for dedicated MJPEG camera streams."""
-        
-        # Reference to the camera (set by factory)
-        camera = camera_stream
-        
-        def log_message(self, format: str, *args) -> None:
-            """Override to use our logger instead of stderr."""
-            logger.debug("MJPEG HTTP [%s:%d] %s", 
-                        self.camera.camera_id, self.camera.mjpeg_port,
-                        format % args)
-        
-        def _check_auth(self) -> bool:
-            """Check HTTP Basic authentication if enabled.
-            
-            Returns:
-                True if authentication is not required or credentials are valid.
-            """
-            if not self.camera.stream_auth_enabled:
-                return True
-            
-            if not self.camera.stream_auth_verify:
-                logger.warning("MJPEG auth enabled but no verify callback for camera %s", 
-                              self.camera.camera_id)
-                return False
-            
-            auth_header = self.headers.get("Authorization", "")
-            if not auth_header.startswith("Basic "):
-                return False
-            
-            try:
-                # Decode Base64 credentials
-                encoded_credentials = auth_header[6:]  # Remove "Basic " prefix
-                decoded = base64.b64decode(encoded_credentials).decode("utf-8")
-                username, password = decoded.split(":", 1)
-                
-                # Verify credentials using callback (uses UserManager)
-                if self.camera.stream_auth_verify(username, password):
-                    return True
-                    
-                logger.warning("MJPEG auth failed for camera %s: invalid credentials for user '%s'", 
-                              self.camera.camera_id, username)
-                return False
-            except Exception as e:
-                logger.warning("MJPEG auth error for camera %s: %s", 
-                              self.camera.camera_id, e)
-                return False
-        
-        def _send_auth_required(self):
-            """Send 401 Unauthorized response."""
-            self.send_response(401)
-            self.send_header("WWW-Authenticate", f'Basic realm="Camera {self.camera.camera_id} Stream"')
-            self.send_header("Content-Type", "text/html")
-            self.end_headers()
-            self.wfile.write(b"<html><body><h1>401 Unauthorized</h1><p>Authentication required</p></body></html>")
-        
-        def do_GET(self):
-            """Handle GET requests for MJPEG stream."""
-            # Check authentication if enabled
-            if not self._check_auth():
-                self._send_auth_required()
-                return
+    Packets are handed to the loop with call_soon_threadsafe() (batched per loop
+    by MJPEGServer._publish()) and the oldest one is dropped when full.
+    """
+    
+    __slots__ = ("_loop", "_queue")
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int = 2):
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+    
+    def put_nowait(self, packet: Optional[bytes]) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._deliver, packet)
+        except RuntimeError:
+            pass  # Loop already closed
+    
+    def _deliver(self, packet: Optional[bytes]) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(packet)
+    
+    async def get(self) -> Optional[bytes]:
+        return await self._queue.get()
+    
+    @staticmethod
+    def _deliver_all(queues: List["_AsyncFrameQueue"], packet: Optional[bytes]) -> None:
+        for queue in queues:
+            queue._deliver(packet)
+    
+    @staticmethod
+    def publish_batch(loop: asyncio.AbstractEventLoop, queues: List["_AsyncFrameQueue"],
+                      packet: Optional[bytes]) -> None:
+        """Deliver a packet to several queues of one loop with a single wakeup."""
+        try:
+            loop.call_soon_threadsafe(_AsyncFrameQueue._deliver_all, queues, packet)
+        except RuntimeError:
+            pass  # Loop already closed
+
+
+def _check_stream_auth(camera: CameraStream, auth_header: str) -> bool:
+    """Check HTTP Basic credentials for a camera's dedicated stream.
+    
+    Blocking (the verify callback hashes the password): run it in an executor.
+    
+    Returns:
+        True if credentials are valid.
+    """
+    if not camera.stream_auth_verify:
+        logger.warning("MJPEG auth enabled but no verify callback for camera %s", 
+                      camera.camera_id)
+        return False
+    
+    if not auth_header.startswith("Basic "):
+        return False
+    
+    # Same header accepted moments ago: skip decoding and password hashing
+    cache_key = (camera.camera_id, hashlib.sha256(auth_header.encode("utf-8")).digest())
+    accepted_at = _AUTH_CACHE.get(cache_key)
+    if accepted_at is not None and time.monotonic() - accepted_at < _AUTH_CACHE_TTL:
+        return True
+    
+    try:
+        # Decode Base64 credentials
+        encoded_credentials = auth_header[6:]  # Remove "Basic " prefix
+        decoded = base64.b64decode(encoded_credentials).decode("utf-8")
+        username, password = decoded.split(":", 1)
+        
+        # Verify credentials using callback (uses UserManager)
+        if camera.stream_auth_verify(username, password):
+            if len(_AUTH_CACHE) >= _AUTH_CACHE_MAX:
+                _AUTH_CACHE.clear()
+            _AUTH_CACHE[cache_key] = time.monotonic()
+            return True
             
-            if self.path == "/stream/" or self.path == "/stream":
-                self._stream_mjpeg()
-            elif self.path == "/" or self.path == "/status":
-                self._send_status()
-            else:
-                self.send_error(404, "Not Found")
-        
-        def _send_status(self):
-            """Send a simple status page."""
+        logger.warning("MJPEG auth failed for camera %s: invalid credentials for user '%s'", 
+                      camera.camera_id, username)
+        return False
+    except Exception as e:
+        logger.warning("MJPEG auth error for camera %s: %s", 
+                      camera.camera_id, e)
+        return False
+
+
+def create_mjpeg_app(camera_stream: CameraStream,
+                     cameras: Optional[Mapping[str, CameraStream]] = None) -> web.Application:
+    """Factory function to create the aiohttp application serving one camera's dedicated port.
+    
+    Besides its own camera on `/stream/`, the port also routes `/camera/<id>/stream/`
+    to any camera in `cameras`, so a single port (one firewall rule) can reach all streams.
+    Each camera's own authentication settings apply.
+    """
+    # Queues of the streams open on this port, woken up when the server stops
+    active_streams: set = set()
+    
+    def target_camera(request: web.Request) -> CameraStream:
+        camera_id = request.match_info.get("camera_id")
+        if camera_id is None:
+            return camera_stream
+        camera = cameras.get(camera_id) if cameras is not None else None
+        if camera is None:
+            raise web.HTTPNotFound()
+        return camera
+    
+    @web.middleware
+    async def auth_middleware(request: web.Request, handler):
+        """Require HTTP Basic authentication if enabled (all paths)."""
+        try:
+            camera = target_camera(request)
+        except web.HTTPNotFound:
+            camera = camera_stream  # Unknown camera: 404 only after the port's own auth
+        if camera.stream_auth_enabled:
+            authorized = await asyncio.get_running_loop().run_in_executor(
+                None, _check_stream_auth, camera, request.headers.get("Authorization", "")
+            )
+            if not authorized:
+                return web.Response(
+                    status=401,
+                    headers={"WWW-Authenticate": f'Basic realm="Camera {camera.camera_id} Stream"'},
+                    content_type="text/html",
+                    text="<html><body><h1>401 Unauthorized</h1><p>Authentication required</p></body></html>",
+                )
+        return await handler(request)
+    
+    # Rendered status page per camera, rebuilt only when a displayed value changes
+    status_pages: Dict[str, List[Any]] = {}
+    
+    async def send_status(request: web.Request) -> web.Response:
+        """Send a simple status page."""
+        camera = target_camera(request)
+        key = (camera.is_running, camera.name, camera.width, camera.height)
+        status_page = status_pages.setdefault(camera.camera_id, [None, b""])
+        if status_page[0] != key:
+            # Relative links: valid under both / and /camera/<id>/
             status_html = f"""<!DOCTYPE html>
 <html>
-<head><title>Camera {self.camera.camera_id} - {self.camera.name}</title></head>
+<head><title>Camera {camera.camera_id} - {camera.name}</title></head>
 <body>
-<h1>Camera {self.camera.camera_id}: {self.camera.name}</h1>
-<p>Status: {'Running' if self.camera.is_running else 'Stopped'}</p>
-<p>Resolution: {self.camera.width}x{self.camera.height}</p>
-<p>Stream: <a href="/stream/">/stream/</a></p>
-<img src="/stream/" width="640" />
+<h1>Camera {camera.camera_id}: {camera.name}</h1>
+<p>Status: {'Running' if camera.is_running else 'Stopped'}</p>
+<p>Resolution: {camera.width}x{camera.height}</p>
+<p>Stream: <a href="stream/">stream/</a></p>
+<img src="stream/" width="640" />
 </body>
 </html>"""
-            self.send_response(200)
-            self.send_header("Content-Type", "text/html")
-            self.send_header("Content-Length", str(len(status_html)))
-            self.end_headers()
-            self.wfile.write(status_html.encode("utf-8"))
-        
-        def _stream_mjpeg(self):
-            """Stream MJPEG frames continuously."""
-            self.send_response(200)
-            self.send_header("Content-Type", "multipart/x-mixed-replace; boundary=frame")
-            self.send_header("Cache-Control", "no-cache, no-store, must-revalidate")
-            self.send_header("Pragma", "no-cache")
-            self.send_header("Expires", "0")
-            self.send_header("Access-Control-Allow-Origin", "*")
-            self.end_headers()
-            
-            logger.info("MJPEG client connected to camera %s on port %d", 
-                       self.camera.camera_id, self.camera.mjpeg_port)
-            
-            frame_interval = 1.0 / max(1, self.camera.fps)
-            last_frame_time = 0
-            
-            try:
-                while self.camera.is_running:
-                    current_time = time.time()
-                    
-                    # Rate limiting
-                    if current_time - last_frame_time < frame_interval * 0.8:
-                        time.sleep(0.01)
-                        continue
-                    
-                    # Get current frame
-                    frame = self.camera.last_frame
-                    if frame is None:
-                        time.sleep(0.05)
-                        continue
-                    
-                    # Send multipart frame
-                    try:
-                        self.wfile.write(b"--frame\r\n")
-                        self.wfile.write(b"Content-Type: image/jpeg\r\n")
-                        self.wfile.write(f"Content-Length: {len(frame)}\r\n".encode())
-                        self.wfile.write(b"\r\n")
-                        self.wfile.write(frame)
-                        self.wfile.write(b"\r\n")
-                        self.wfile.flush()
-                        
-                        last_frame_time = current_time
-                    except (BrokenPipeError, ConnectionResetError):
-                        break
-                    except Exception as e:
-                        logger.debug("Stream write error: %s", e)
-                        break
-                        
-            except Exception as e:
-                logger.debug("MJPEG stream ended: %s", e)
-            finally:
-                logger.info("MJPEG client disconnected from camera %s", self.camera.camera_id)
+            status_page[:] = [key, status_html.encode("utf-8")]
+        return web.Response(body=status_page[1], content_type="text/html", charset="utf-8")
     
-    return MJPEGStreamHandler
+    async def stream_mjpeg(request: web.Request) -> web.StreamResponse:
+        """Stream MJPEG frames continuously."""
+        camera = target_camera(request)
+        response = web.StreamResponse(headers={
+            "Content-Type": "multipart/x-mixed-replace; boundary=frame",
+            "Cache-Control": "no-cache, no-store, must-revalidate",
+            "Pragma": "no-cache",
+            "Expires": "0",
+            "Access-Control-Allow-Origin": "*",
+        })
+        sock = request.transport.get_extra_info("socket") if request.transport else None
+        if sock is not None:
+            _tune_stream_socket(sock)
+        await response.prepare(request)
+        
+        logger.info("MJPEG client connected to camera %s on port %d", 
+                   camera.camera_id, camera_stream.mjpeg_port)
+        
+        # Bounded per-client queue: a slow client drops old frames instead of lagging
+        queue = _AsyncFrameQueue(asyncio.get_running_loop())
+        active_streams.add(queue)
+        camera.add_subscriber(queue)
+        
+        try:
+            while camera.is_running:
+                try:
+                    packet = await asyncio.wait_for(queue.get(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    continue
+                if packet is None:
+                    break  # Capture loop or server stopped
+                
+                # Pre-built multipart part (header, JPEG, trailer), shared by all clients
+                await response.write(packet)
+        except (ConnectionError, OSError):
+            pass  # Client went away
+        except Exception as e:
+            logger.debug("MJPEG stream ended: %s", e)
+        finally:
+            active_streams.discard(queue)
+            camera.remove_subscriber(queue)
+            logger.info("MJPEG client disconnected from camera %s", camera.camera_id)
+        return response
+    
+    async def on_shutdown(app: web.Application) -> None:
+        # End open streams right away instead of waiting for the shutdown timeout
+        for queue in list(active_streams):
+            queue._deliver(None)
+    
+    app = web.Application(middlewares=[auth_middleware])
+    for prefix in ("", "/camera/{camera_id}"):
+        app.router.add_get(prefix + "/stream/", stream_mjpeg)
+        app.router.add_get(prefix + "/stream", stream_mjpeg)
+        app.router.add_get(prefix + "/", send_status)
+        app.router.add_get(prefix + "/status", send_status)
+    app.on_shutdown.append(on_shutdown)
+    return app
 
 
 class MJPEGServer:
@@ -253,44 +647,24 @@ class MJPEGServer:
         self._stop_events: Dict[str, threading.Event] = {}
         self._global_lock = threading.Lock()
         
-        # Generate placeholder frame
+        # Event loop thread serving every dedicated port (see _get_http_loop)
+        self._http_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http_loop_thread: Optional[threading.Thread] = None
+        self._http_loop_lock = threading.Lock()
+        
+        # JPEG encoders shared by all capture threads (cv2/TurboJPEG release the GIL);
+        # each camera keeps at most one frame in flight, see _capture_loop
+        self._encode_pool = ThreadPoolExecutor(max_workers=min(os.cpu_count() or 1, 4),
+                                               thread_name_prefix="mjpeg-encode")
+        
+        # Generate placeholder frame (and its ready-to-send multipart packet)
         self._generate_placeholder()
+        self._placeholder_packet = self._format_mjpeg_frame(self.PLACEHOLDER_FRAME)
     
     def _generate_placeholder(self) -> None:
         """Generate a placeholder frame for unavailable cameras."""
         if not OPENCV_AVAILABLE:
-            # Minimal 1x1 black JPEG
-            self.PLACEHOLDER_FRAME = bytes([
-                0xFF, 0xD8, 0xFF, 0xE0, 0x00, 0x10, 0x4A, 0x46, 0x49, 0x46, 0x00, 0x01,
-                0x01, 0x00, 0x00, 0x01, 0x00, 0x01, 0x00, 0x00, 0xFF, 0xDB, 0x00, 0x43,
-                0x00, 0x08, 0x06, 0x06, 0x07, 0x06, 0x05, 0x08, 0x07, 0x07, 0x07, 0x09,
-                0x09, 0x08, 0x0A, 0x0C, 0x14, 0x0D, 0x0C, 0x0B, 0x0B, 0x0C, 0x19, 0x12,
-                0x13, 0x0F, 0x14, 0x1D, 0x1A, 0x1F, 0x1E, 0x1D, 0x1A, 0x1C, 0x1C, 0x20,
-                0x24, 0x2E, 0x27, 0x20, 0x22, 0x2C, 0x23, 0x1C, 0x1C, 0x28, 0x37, 0x29,
-                0x2C, 0x30, 0x31, 0x34, 0x34, 0x34, 0x1F, 0x27, 0x39, 0x3D, 0x38, 0x32,
-                0x3C, 0x2E, 0x33, 0x34, 0x32, 0xFF, 0xC0, 0x00, 0x0B, 0x08, 0x00, 0x01,
-                0x00, 0x01, 0x01, 0x01, 0x11, 0x00, 0xFF, 0xC4, 0x00, 0x1F, 0x00, 0x00,
-                0x01, 0x05, 0x01, 0x01, 0x01, 0x01, 0x01, 0x01, 0x00, 0x00, 0x00, 0x00,
-                0x00, 0x00, 0x00, 0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08,
-                0x09, 0x0A, 0x0B, 0xFF, 0xC4, 0x00, 0xB5, 0x10, 0x00, 0x02, 0x01, 0x03,
-                0x03, 0x02, 0x04, 0x03, 0x05, 0x05, 0x04, 0x04, 0x00, 0x00, 0x01, 0x7D,
-                0x01, 0x02, 0x03, 0x00, 0x04, 0x11, 0x05, 0x12, 0x21, 0x31, 0x41, 0x06,
-                0x13, 0x51, 0x61, 0x07, 0x22, 0x71, 0x14, 0x32, 0x81, 0x91, 0xA1, 0x08,
-                0x23, 0x42, 0xB1, 0xC1, 0x15, 0x52, 0xD1, 0xF0, 0x24, 0x33, 0x62, 0x72,
-                0x82, 0x09, 0x0A, 0x16, 0x17, 0x18, 0x19, 0x1A, 0x25, 0x26, 0x27, 0x28,
-                0x29, 0x2A, 0x34, 0x35, 0x36, 0x37, 0x38, 0x39, 0x3A, 0x43, 0x44, 0x45,
-                0x46, 0x47, 0x48, 0x49, 0x4A, 0x53, 0x54, 0x55, 0x56, 0x57, 0x58, 0x59,
-                0x5A, 0x63, 0x64, 0x65, 0x66, 0x67, 0x68, 0x69, 0x6A, 0x73, 0x74, 0x75,
-                0x76, 0x77, 0x78, 0x79, 0x7A, 0x83, 0x84, 0x85, 0x86, 0x87, 0x88, 0x89,
-                0x8A, 0x92, 0x93, 0x94, 0x95, 0x96, 0x97, 0x98, 0x99, 0x9A, 0xA2, 0xA3,
-                0xA4, 0xA5, 0xA6, 0xA7, 0xA8, 0xA9, 0xAA, 0xB2, 0xB3, 0xB4, 0xB5, 0xB6,
-                0xB7, 0xB8, 0xB9, 0xBA, 0xC2, 0xC3, 0xC4, 0xC5, 0xC6, 0xC7, 0xC8, 0xC9,
-                0xCA, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7, 0xD8, 0xD9, 0xDA, 0xE1, 0xE2,
-                0xE3, 0xE4, 0xE5, 0xE6, 0xE7, 0xE8, 0xE9, 0xEA, 0xF1, 0xF2, 0xF3, 0xF4,
-                0xF5, 0xF6, 0xF7, 0xF8, 0xF9, 0xFA, 0xFF, 0xDA, 0x00, 0x08, 0x01, 0x01,
-                0x00, 0x00, 0x3F, 0x00, 0xFB, 0xD5, 0xDB, 0x20, 0xA8, 0xF1, 0x45, 0x00,
-                0x14, 0x50, 0x01, 0x45, 0x00, 0xFF, 0xD9
-            ])
+            self.PLACEHOLDER_FRAME = _PLACEHOLDER_NO_OPENCV
             return
         
         try:
@@ -308,12 +682,47 @@ class MJPEGServer:
             cv2.putText(img, text, (text_x, text_y), font, 1.5, (100, 100, 100), 2)
             
             # Encode to JPEG
-            _, buffer = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, 70])
-            self.PLACEHOLDER_FRAME = buffer.tobytes()
+            self.PLACEHOLDER_FRAME = bytes(_encode_jpeg(img, 70, _jpeg_encode_params(70)))
         except Exception as e:
             logger.error("Failed to generate placeholder frame: %s", e)
             self.PLACEHOLDER_FRAME = b''
     
+    def _get_http_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the event loop serving the dedicated ports, starting its thread if needed.
+        
+        All MJPEG clients of all cameras share this single loop: waiting viewers
+        cost a coroutine each instead of a blocked OS thread.
+        """
+        with self._http_loop_lock:
+            if self._http_loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, daemon=True, name="mjpeg-http")
+                thread.start()
+                self._http_loop = loop
+                self._http_loop_thread = thread
+            return self._http_loop
+    
+    def _stop_http_loop(self) -> None:
+        """Stop the dedicated ports' event loop thread."""
+        with self._http_loop_lock:
+            loop, thread = self._http_loop, self._http_loop_thread
+            self._http_loop = None
+            self._http_loop_thread = None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=2.0)
+        if not loop.is_running():
+            loop.close()
+    
+    @staticmethod
+    async def _start_site(runner: web.AppRunner, server_socket: socket.socket) -> None:
+        """Set up an aiohttp runner and start serving on an already bound socket."""
+        await runner.setup()
+        # Open streams are cancelled after 1 s instead of aiohttp's 60 s default
+        await web.SockSite(runner, server_socket, shutdown_timeout=1.0).start()
+    
     def _wait_for_port_available(self, port: int, timeout: int = 10) -> bool:
         """Wait for a port to become available.
         
@@ -377,9 +786,6 @@ class MJPEGServer:
         
         for attempt in range(retries):
             try:
-                # Create handler class with reference to this camera
-                handler_class = create_mjpeg_handler(camera)
-                
                 # Create HTTP server on the configured port
                 server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
                 server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
@@ -389,30 +795,20 @@ class MJPEGServer:
                         server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
                     except (OSError, AttributeError):
                         pass  # Not supported on this system
-                server_socket.bind(("0.0.0.0", camera.mjpeg_port))
-                server_socket.listen(5)
-                
-                camera._http_server = HTTPServer(("0.0.0.0", camera.mjpeg_port), handler_class, bind_and_activate=False)
-                camera._http_server.socket = server_socket
-                
-                # Start server in background thread
-                def serve():
-                    logger.info("Starting HTTP server for camera %s on port %d", 
-                               camera.camera_id, camera.mjpeg_port)
-                    try:
-                        camera._http_server.serve_forever()
-                    except Exception as e:
-                        if camera._http_server is not None:  # Only log if not intentionally stopped
-                            logger.error("HTTP server error for camera %s: %s", camera.camera_id, e)
-                    finally:
-                        logger.debug("HTTP server serve_forever ended for camera %s", camera.camera_id)
-                
-                camera._http_thread = threading.Thread(
-                    target=serve,
-                    daemon=True,
-                    name=f"mjpeg-http-{camera.camera_id}"
-                )
-                camera._http_thread.start()
+                try:
+                    server_socket.bind(("0.0.0.0", camera.mjpeg_port))
+                    server_socket.listen(128)
+                    server_socket.setblocking(False)
+                    
+                    # Served by the shared event loop thread (one coroutine per client)
+                    runner = web.AppRunner(create_mjpeg_app(camera, self._cameras), access_log=None)
+                    asyncio.run_coroutine_threadsafe(
+                        self._start_site(runner, server_socket), self._get_http_loop()
+                    ).result(timeout=5.0)
+                except BaseException:
+                    server_socket.close()
+                    raise
+                camera._http_server = runner
                 
                 logger.info("Dedicated HTTP server started for camera %s on port %d",
                            camera.camera_id, camera.mjpeg_port)
@@ -448,36 +844,20 @@ class MJPEGServer:
             camera: The camera stream to stop HTTP server for.
         """
         if camera._http_server is not None:
-            http_server = camera._http_server
+            runner = camera._http_server
             camera._http_server = None  # Clear reference immediately
             
-            def shutdown_server():
-                try:
-                    http_server.shutdown()
-                    # Close the socket explicitly to release the port
-                    try:
-                        http_server.socket.close()
-                    except Exception:
-                        pass
-                    http_server.server_close()
-                    logger.debug("HTTP server closed for camera %s", camera.camera_id)
-                except Exception as e:
-                    logger.debug("Error during HTTP server shutdown: %s", e)
-            
-            # Run shutdown in a separate thread to avoid blocking
-            shutdown_thread = threading.Thread(target=shutdown_server, daemon=True)
-            shutdown_thread.start()
-            shutdown_thread.join(timeout=2.0)  # Wait max 2 seconds
-            
-            if shutdown_thread.is_alive():
-                logger.warning("HTTP server shutdown taking too long for camera %s", camera.camera_id)
-            else:
+            loop = self._http_loop
+            if loop is None:
+                return
+            try:
+                # Closes the listening socket (releases the port) and ends open streams
+                asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result(timeout=3.0)
                 logger.info("HTTP server stopped for camera %s", camera.camera_id)
-        
-        if camera._http_thread is not None:
-            if camera._http_thread.is_alive():
-                camera._http_thread.join(timeout=2.0)
-            camera._http_thread = None
+            except FutureTimeoutError:
+                logger.warning("HTTP server shutdown taking too long for camera %s", camera.camera_id)
+            except Exception as e:
+                logger.debug("Error during HTTP server shutdown: %s", e)
 
     def add_camera(
         self,
@@ -496,8 +876,13 @@ class MJPEGServer:
         overlay_right_text: str = "timestamp",
         overlay_right_custom: str = "",
         overlay_text_scale: int = 3,
+        overlay_background_opacity: float = 1.0,
         stream_auth_enabled: bool = False,
-        stream_auth_verify: Optional[AuthVerifyCallback] = None
+        stream_auth_verify: Optional[AuthVerifyCallback] = None,
+        cpu_affinity: Optional[Set[int]] = None,
+        realtime_priority: int = 0,
+        dedupe_static: bool = False,
+        adaptive_quality: bool = False
     ) -> bool:
         """Add a camera to the server.
         
@@ -517,8 +902,13 @@ class MJPEGServer:
             overlay_right_text: Right overlay type.
             overlay_right_custom: Custom text for right overlay.
             overlay_text_scale: Text scale (1-10).
+            overlay_background_opacity: Opacity of the black box behind overlay text (0.0-1.0).
             stream_auth_enabled: Whether HTTP Basic authentication is required.
             stream_auth_verify: Callback function to verify credentials (username, password) -> bool.
+            cpu_affinity: CPUs to pin the capture thread to (Linux, None = no pinning).
+            realtime_priority: SCHED_FIFO priority for the capture thread (Linux, 0 = disabled).
+            dedupe_static: Skip JPEG encoding of frames identical to the last one sent.
+            adaptive_quality: Lower JPEG quality temporarily when encoding is too slow.
             
         Returns:
             True if camera was added successfully.
@@ -544,8 +934,13 @@ class MJPEGServer:
                 overlay_right_text=overlay_right_text,
                 overlay_right_custom=overlay_right_custom,
                 overlay_text_scale=overlay_text_scale,
+                overlay_background_opacity=max(0.0, min(1.0, overlay_background_opacity)),
                 stream_auth_enabled=stream_auth_enabled,
                 stream_auth_verify=stream_auth_verify,
+                cpu_affinity=set(cpu_affinity) if cpu_affinity else None,
+                realtime_priority=realtime_priority,
+                dedupe_static=dedupe_static,
+                adaptive_quality=adaptive_quality,
             )
             logger.info("Added camera %s: %s (device=%s, capture=%dx%d, stream=%dx%d, port=%d, auth=%s)", 
                        camera_id, name, device_path, width, height,
@@ -582,7 +977,10 @@ class MJPEGServer:
         overlay_left_custom: Optional[str] = None,
         overlay_right_text: Optional[str] = None,
         overlay_right_custom: Optional[str] = None,
-        overlay_text_scale: Optional[int] = None
+        overlay_text_scale: Optional[int] = None,
+        overlay_background_opacity: Optional[float] = None,
+        dedupe_static: Optional[bool] = None,
+        adaptive_quality: Optional[bool] = None
     ) -> bool:
         """Update camera settings. Requires restart of the camera for size/fps changes."""
         camera = self._cameras.get(camera_id)
@@ -601,6 +999,14 @@ class MJPEGServer:
                 camera.overlay_right_custom = overlay_right_custom
             if overlay_text_scale is not None:
                 camera.overlay_text_scale = max(1, min(10, overlay_text_scale))
+            if overlay_background_opacity is not None:
+                camera.overlay_background_opacity = max(0.0, min(1.0, overlay_background_opacity))
+            if dedupe_static is not None:
+                camera.dedupe_static = dedupe_static
+            if adaptive_quality is not None and adaptive_quality != camera.adaptive_quality:
+                camera.adaptive_quality = adaptive_quality
+                # Back to the configured quality on the next encode (see _finish_encode)
+                camera._quality_reset = True
         
         # Check if we need to restart camera (size/fps/quality changes)
         needs_restart = any([
@@ -712,6 +1118,21 @@ class MJPEGServer:
         """Stop all cameras."""
         for camera_id in list(self._cameras.keys()):
             self.stop_camera(camera_id)
+        self._stop_http_loop()
+    
+    # Overlay type -> text producer (camera, custom_text), one dict lookup per side and frame
+    _OVERLAY_HANDLERS: Dict[str, Callable[[CameraStream, str], str]] = {
+        "disabled": lambda camera, text: "",
+        "camera_name": lambda camera, text: camera.name,
+        "timestamp": _overlay_timestamp,
+        "custom": lambda camera, text: text,
+        "capture_info": lambda camera, text: f"{camera.width}x{camera.height} @ {camera._real_fps:.1f}fps",
+    }
+    
+    @staticmethod
+    def _overlay_enabled(camera: CameraStream) -> bool:
+        """True if at least one overlay side is configured."""
+        return camera.overlay_left_text != "disabled" or camera.overlay_right_text != "disabled"
     
     def _get_overlay_text(self, camera: CameraStream, overlay_type: str, custom_text: str) -> str:
         """Generate overlay text based on type.
@@ -724,17 +1145,12 @@ class MJPEGServer:
         Returns:
             The text to display, or empty string if disabled.
         """
-        if overlay_type == "disabled":
-            return ""
-        elif overlay_type == "camera_name":
-            return camera.name
-        elif overlay_type == "timestamp":
-            return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        elif overlay_type == "custom":
-            return custom_text
-        elif overlay_type == "capture_info":
-            return f"{camera.width}x{camera.height} @ {camera._real_fps:.1f}fps"
-        return ""
+        return self._OVERLAY_HANDLERS.get(overlay_type, _no_overlay_text)(camera, custom_text)
+    
+    def _overlay_texts(self, camera: CameraStream) -> Tuple[str, str]:
+        """Current (left, right) overlay texts, empty for disabled sides."""
+        return (self._get_overlay_text(camera, camera.overlay_left_text, camera.overlay_left_custom),
+                self._get_overlay_text(camera, camera.overlay_right_text, camera.overlay_right_custom))
     
     def _draw_overlay(self, frame, camera: CameraStream) -> None:
         """Draw text overlay on frame (in-place modification).
@@ -743,8 +1159,7 @@ class MJPEGServer:
             frame: OpenCV frame (numpy array) to draw on.
             camera: Camera stream with overlay settings.
         """
-        left_text = self._get_overlay_text(camera, camera.overlay_left_text, camera.overlay_left_custom)
-        right_text = self._get_overlay_text(camera, camera.overlay_right_text, camera.overlay_right_custom)
+        left_text, right_text = self._overlay_texts(camera)
         
         if not left_text and not right_text:
             return
@@ -752,62 +1167,78 @@ class MJPEGServer:
         # Get actual frame dimensions from the frame itself, not camera config
         frame_height, frame_width = frame.shape[:2]
         
-        # Calculate font scale based on image size and text scale setting
-        # Base scale is relative to 720p, text_scale is 1-10
-        base_scale = frame_height / 720.0
-        font_scale = base_scale * (camera.overlay_text_scale / 5.0)  # Scale 5 = base size
-        font_scale = max(0.3, min(3.0, font_scale))  # Clamp to reasonable range
-        
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        thickness = max(1, int(font_scale * 2))
-        
-        # Padding from edges
-        padding = max(5, int(10 * base_scale))
+        # Layout (scale, truncation, clipped ROI) and sprite are memoized per text and
+        # geometry: each side is one ROI pass per frame
+        opacity = camera.overlay_background_opacity
+        for text, right_aligned in ((left_text, False), (right_text, True)):
+            if text:
+                layout = _overlay_layout(text, right_aligned, frame_width, frame_height,
+                                         camera.overlay_text_scale)
+                if layout is not None:
+                    sprite, rows, cols = layout
+                    if opacity >= 1.0:
+                        # Opaque box: plain copy
+                        frame[rows, cols] = sprite
+                    else:
+                        # Translucent box in one fused pass: the ROI is darkened by the
+                        # opacity and the white glyphs (255 in the black sprite) saturate
+                        roi = frame[rows, cols]
+                        cv2.addWeighted(roi, 1.0 - opacity, sprite, 1.0, 0, dst=roi)
+    
+    @staticmethod
+    def _apply_thread_scheduling(camera: CameraStream) -> None:
+        """Pin the calling capture thread and raise its priority, if configured (Linux).
         
-        # Calculate Y position (bottom of frame with padding)
-        # Text baseline is at y_pos, so we need space for descenders
-        text_height = cv2.getTextSize("Ay", font, font_scale, thickness)[0][1]
-        y_pos = frame_height - padding - 4
+        Keeping capture + encode on fixed cores preserves cache locality of the frame
+        buffers; SCHED_FIFO keeps the frame cadence steady under CPU load.
+        """
+        if camera.cpu_affinity and hasattr(os, "sched_setaffinity"):
+            try:
+                os.sched_setaffinity(0, camera.cpu_affinity)  # 0 = calling thread
+                logger.debug("Camera %s capture thread pinned to CPUs %s",
+                            camera.camera_id, sorted(camera.cpu_affinity))
+            except (OSError, ValueError) as e:
+                logger.warning("Camera %s: cannot set CPU affinity %s: %s",
+                              camera.camera_id, sorted(camera.cpu_affinity), e)
+        
+        if camera.realtime_priority > 0 and hasattr(os, "sched_setscheduler"):
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(camera.realtime_priority))
+                logger.debug("Camera %s capture thread set to SCHED_FIFO priority %d",
+                            camera.camera_id, camera.realtime_priority)
+            except (OSError, ValueError) as e:
+                logger.warning("Camera %s: cannot set SCHED_FIFO priority %d (needs CAP_SYS_NICE): %s",
+                              camera.camera_id, camera.realtime_priority, e)
+    
+    @staticmethod
+    def _open_capture(device_index: Union[int, str], is_windows: bool,
+                      is_linux: bool) -> Tuple[Any, str]:
+        """Open a capture device with the platform's preferred backend.
         
-        # Draw left text
-        if left_text:
-            text_size = cv2.getTextSize(left_text, font, font_scale, thickness)[0]
-            x_pos = padding
-            
-            # Ensure text fits within frame
-            if x_pos + text_size[0] > frame_width - padding:
-                # Truncate text if too long
-                while len(left_text) > 3 and cv2.getTextSize(left_text + "...", font, font_scale, thickness)[0][0] > frame_width // 2:
-                    left_text = left_text[:-1]
-                left_text += "..."
-                text_size = cv2.getTextSize(left_text, font, font_scale, thickness)[0]
-            
-            # Draw background rectangle for readability
-            bg_rect_start = (max(0, x_pos - 2), max(0, y_pos - text_size[1] - 2))
-            bg_rect_end = (min(frame_width, x_pos + text_size[0] + 2), min(frame_height, y_pos + 4))
-            cv2.rectangle(frame, bg_rect_start, bg_rect_end, (0, 0, 0), -1)
-            
-            # Draw text
-            cv2.putText(frame, left_text, (x_pos, y_pos), font, font_scale, (255, 255, 255), thickness)
+        Windows (numeric index): Media Foundation if it delivers MJPG natively (no
+        YUY2 software conversion, lower latency than DirectShow), else DirectShow.
+        Linux: V4L2. Elsewhere: OpenCV's default.
         
-        # Draw right text
-        if right_text:
-            text_size = cv2.getTextSize(right_text, font, font_scale, thickness)[0]
-            x_pos = frame_width - text_size[0] - padding
-            
-            # Ensure x_pos is not negative
-            x_pos = max(padding, x_pos)
-            
-            # Draw background rectangle for readability
-            bg_rect_start = (max(0, x_pos - 2), max(0, y_pos - text_size[1] - 2))
-            bg_rect_end = (min(frame_width, x_pos + text_size[0] + 2), min(frame_height, y_pos + 4))
-            cv2.rectangle(frame, bg_rect_start, bg_rect_end, (0, 0, 0), -1)
-            
-            # Draw text
-            cv2.putText(frame, right_text, (x_pos, y_pos), font, font_scale, (255, 255, 255), thickness)
+        Returns:
+            (capture, backend name); the capture may not be opened.
+        """
+        if is_windows and isinstance(device_index, int):
+            mjpg = cv2.VideoWriter_fourcc(*"MJPG")
+            cap = cv2.VideoCapture(device_index, cv2.CAP_MSMF)
+            if cap.isOpened():
+                cap.set(cv2.CAP_PROP_FOURCC, mjpg)
+                if int(cap.get(cv2.CAP_PROP_FOURCC)) == mjpg:
+                    return cap, "MSMF"
+            cap.release()
+            return cv2.VideoCapture(device_index, cv2.CAP_DSHOW), "DirectShow"
+        if is_linux:
+            return cv2.VideoCapture(device_index, cv2.CAP_V4L2), "V4L2"
+        # Default: let OpenCV choose
+        return cv2.VideoCapture(device_index), "default"
     
     def _capture_loop(self, camera: CameraStream, stop_event: threading.Event) -> None:
         """Main capture loop running in a separate thread."""
+        self._apply_thread_scheduling(camera)
         camera.is_running = True
         camera.error = None
         frame_interval = 1.0 / camera.fps
@@ -828,21 +1259,28 @@ class MJPEGServer:
         
         # Open capture device with platform-appropriate backend
         try:
-            if is_windows and isinstance(device_index, int):
-                # Windows: use DirectShow backend for numeric indices
-                cap = cv2.VideoCapture(device_index, cv2.CAP_DSHOW)
-                logger.debug("Using DirectShow backend for device %s", device_index)
-            elif is_linux:
-                # Linux: use V4L2 backend
-                cap = cv2.VideoCapture(device_index, cv2.CAP_V4L2)
-                logger.debug("Using V4L2 backend for device %s", device_index)
-            else:
-                # Default: let OpenCV choose
-                cap = cv2.VideoCapture(device_index)
+            cap, backend = self._open_capture(device_index, is_windows, is_linux)
+            logger.debug("Using %s backend for device %s", backend, device_index)
             
             if not cap.isOpened():
                 raise RuntimeError(f"Cannot open camera device: {camera.device_path}")
             
+            # Native MJPEG passthrough (V4L2): with no resize and no overlay, the
+            # camera's own JPEGs are forwarded as-is instead of decode + re-encode
+            passthrough = (
+                is_linux
+                and camera.stream_width in (0, camera.width)
+                and camera.stream_height in (0, camera.height)
+                and not self._overlay_enabled(camera)
+            )
+            if is_linux:
+                # Ask for compressed MJPEG frames (half the USB bandwidth of YUYV, higher
+                # fps at large sizes); V4L2 keeps the current format if unsupported.
+                # FOURCC must be requested before the frame size
+                cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+            if passthrough:
+                cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+            
             # Configure capture
             cap.set(cv2.CAP_PROP_FRAME_WIDTH, camera.width)
             cap.set(cv2.CAP_PROP_FRAME_HEIGHT, camera.height)
@@ -852,11 +1290,16 @@ class MJPEGServer:
             cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
             
             camera.capture = cap
-            logger.info("Camera %s opened: %dx%d @ %d fps",
+            camera._passthrough_mjpeg = passthrough
+            fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+            pixel_format = fourcc.to_bytes(4, "little").decode("ascii", "replace").strip("\x00 ") if fourcc > 0 else "?"
+            logger.info("Camera %s opened: %dx%d @ %d fps, format %s%s",
                        camera.camera_id,
                        int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
                        int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
-                       int(cap.get(cv2.CAP_PROP_FPS)))
+                       int(cap.get(cv2.CAP_PROP_FPS)),
+                       pixel_format or "?",
+                       " (MJPEG passthrough)" if passthrough else "")
         
         except Exception as e:
             camera.error = str(e)
@@ -865,22 +1308,56 @@ class MJPEGServer:
             return
         
         # Capture loop
-        encode_params = [cv2.IMWRITE_JPEG_QUALITY, camera.quality]
+        camera._effective_quality = camera.quality
+        camera._encode_ewma = 0
+        camera._encode_streak = 0
+        camera._quality_reset = False
+        encode_quality = camera.quality
+        encode_params = _jpeg_encode_params(encode_quality)
         
         # Determine output resolution
         output_width = camera.stream_width if camera.stream_width > 0 else camera.width
         output_height = camera.stream_height if camera.stream_height > 0 else camera.height
         need_resize = (output_width != camera.width or output_height != camera.height)
+        # Resize stage (None: frames are already at the output size)
+        resize_frame = _make_resizer(output_width, output_height) if need_resize else None
+        # Decoded frames are read into two alternating buffers (reallocated by OpenCV
+        # only if the size changes): no per-frame capture allocation, and the frame
+        # being encoded is never overwritten by the next read
+        capture_bufs: List[Any] = [None, None]
+        capture_slot = 0
+        
+        # Encode of the previous frame, running on the pool while the next one is read
+        pending: Optional[Future] = None
+        
+        # (thumbnail, overlay texts) of the last encoded frame, for dedupe_static
+        static_ref: Optional[Tuple[Any, Tuple[str, str]]] = None
         
         if need_resize:
             logger.info("Camera %s: will resize from %dx%d to %dx%d",
                        camera.camera_id, camera.width, camera.height, output_width, output_height)
         
+        # First stats window; one monotonic clock read per iteration drives the loop
+        camera._stats_start_time = time.monotonic()
+        camera._wall_offset = time.time() - camera._stats_start_time
+        camera._stats_frame_count = 0
+        camera._stats_bytes_sent = 0
+        
         while not stop_event.is_set():
             loop_start = time.monotonic()
             
             try:
-                ret, frame = cap.read()
+                if pending is not None and pending.done():
+                    # Previous frame encoded during the frame-rate sleep: publish it now
+                    encoded, pending = pending, None
+                    self._finish_encode(camera, encoded, loop_start, frame_interval)
+                
+                ret, frame = cap.read(capture_bufs[capture_slot])
+                
+                if pending is not None:
+                    # Keep per-camera frame order: publish the previous frame first
+                    encoded, pending = pending, None
+                    self._finish_encode(camera, encoded, loop_start, frame_interval)
                 
                 if not ret:
                     camera.error = "Failed to read frame"
@@ -888,50 +1365,62 @@ class MJPEGServer:
                     time.sleep(0.1)
                     continue
                 
-                # Resize frame if output resolution differs from capture resolution
-                if need_resize:
-                    frame = cv2.resize(frame, (output_width, output_height), interpolation=cv2.INTER_LINEAR)
-                
-                # Apply text overlay if configured (on resized frame)
-                self._draw_overlay(frame, camera)
-                
-                # Encode to JPEG
-                _, buffer = cv2.imencode('.jpg', frame, encode_params)
-                jpeg_bytes = buffer.tobytes()
+                if passthrough and not _is_jpeg_buffer(frame):
+                    # Driver ignored the MJPG request: fall back to decoded frames
+                    logger.warning("Camera %s: device does not deliver MJPEG, re-encoding frames",
+                                  camera.camera_id)
+                    passthrough = False
+                    camera._passthrough_mjpeg = False
+                    cap.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+                    continue
                 
-                # Update camera state
-                current_time = time.time()
-                frame_size = len(jpeg_bytes)
-                with camera._lock:
-                    camera.last_frame = jpeg_bytes
-                    camera.last_frame_time = current_time
-                    camera.last_frame_size = frame_size
-                    camera.frame_count += 1
-                    camera.error = None
+                if passthrough and not self._overlay_enabled(camera):
+                    # Camera JPEG forwarded untouched
+                    self._emit_frame(camera, frame, loop_start)
+                else:
+                    if passthrough:
+                        # Overlay enabled at runtime: decode the camera JPEG to draw on it
+                        frame = cv2.imdecode(frame, cv2.IMREAD_COLOR)
+                    else:
+                        capture_bufs[capture_slot] = frame
+                        capture_slot ^= 1
                     
-                    # Update real-time stats (reset every second)
-                    camera._stats_frame_count += 1
-                    camera._stats_bytes_sent += frame_size
-                    elapsed = current_time - camera._stats_start_time
-                    if elapsed >= 1.0:
-                        camera._real_fps = camera._stats_frame_count / elapsed
-                        camera._bandwidth_kbps = (camera._stats_bytes_sent * 8) / (elapsed * 1000)
-                        camera._stats_start_time = current_time
-                        camera._stats_frame_count = 0
-                        camera._stats_bytes_sent = 0
-                
-                # Notify subscribers
-                for subscriber_queue in camera.subscribers[:]:
-                    try:
-                        # Non-blocking put, drop old frames if queue is full
-                        if subscriber_queue.full():
-                            try:
-                                subscriber_queue.get_nowait()
-                            except Empty:
-                                pass
-                        subscriber_queue.put_nowait(jpeg_bytes)
-                    except Exception:
-                        pass
+                    # Resize frame if output resolution differs from capture resolution
+                    if resize_frame is not None:
+                        frame = resize_frame(frame)
+                    
+                    # Static scene: nothing to encode while picture and overlay texts are unchanged
+                    static = False
+                    if camera.dedupe_static:
+                        thumb = _static_thumbnail(frame)
+                        overlay_texts = self._overlay_texts(camera)
+                        static = (static_ref is not None
+                                  and camera.last_frame_packet is not None
+                                  and static_ref[1] == overlay_texts
+                                  and static_ref[0].shape == thumb.shape
+                                  and cv2.norm(thumb, static_ref[0], cv2.NORM_INF) <= MJPEG_STATIC_TOLERANCE)
+                        if not static:
+                            static_ref = (thumb, overlay_texts)
+                    else:
+                        static_ref = None
+                    
+                    if static:
+                        camera.frame_count += 1
+                        now = loop_start + camera._wall_offset
+                        if now - camera.last_frame_time >= MJPEG_STATIC_KEEPALIVE:
+                            camera.last_frame_time = now
+                            self._publish(camera, camera.last_frame_packet)
+                    else:
+                        # Apply text overlay if configured (on resized frame)
+                        if self._overlay_enabled(camera):
+                            self._draw_overlay(frame, camera)
+                        
+                        if camera._effective_quality != encode_quality:
+                            encode_quality = camera._effective_quality
+                            encode_params = _jpeg_encode_params(encode_quality)
+                        
+                        # Encode to JPEG on the pool, overlapping the next read; published by the next iteration
+                        pending = self._encode_pool.submit(_timed_encode_jpeg, frame, encode_quality, encode_params)
             
             except Exception as e:
                 camera.error = str(e)
@@ -944,11 +1433,112 @@ class MJPEGServer:
                 time.sleep(sleep_time)
         
         # Cleanup
+        if pending is not None:
+            pending.cancel()
         cap.release()
         camera.capture = None
+        camera._passthrough_mjpeg = False
         camera.is_running = False
+        # Wake blocked subscribers so they notice the stop immediately
+        self._publish(camera, None)
         logger.info("Camera %s capture loop ended", camera.camera_id)
     
+    def _finish_encode(self, camera: CameraStream, encoded: Future, now: float,
+                       frame_interval: float) -> None:
+        """Publish a completed pool encode and feed its duration to adaptive quality."""
+        jpeg_bytes, encode_time = encoded.result()
+        if camera._quality_reset:
+            camera._quality_reset = False
+            camera._effective_quality = camera.quality
+            camera._encode_ewma = 0
+            camera._encode_streak = 0
+        if camera.adaptive_quality:
+            self._adapt_quality(camera, encode_time, frame_interval)
+        self._emit_frame(camera, jpeg_bytes, now)
+    
+    @staticmethod
+    def _adapt_quality(camera: CameraStream, encode_time: float, frame_interval: float) -> None:
+        """Step camera._effective_quality down under encode pressure, back up with headroom."""
+        camera._encode_ewma = ewma = (camera._encode_ewma * 0.8 + encode_time * 0.2
+                                      if camera._encode_ewma else encode_time)
+        if ewma > frame_interval * 0.6:
+            camera._encode_streak = max(camera._encode_streak, 0) + 1
+        elif ewma < frame_interval * 0.3:
+            camera._encode_streak = min(camera._encode_streak, 0) - 1
+        else:
+            camera._encode_streak = 0
+        
+        quality = camera._effective_quality
+        if camera._encode_streak >= _ADAPTIVE_QUALITY_FRAMES and quality > ADAPTIVE_QUALITY_MIN:
+            quality = max(ADAPTIVE_QUALITY_MIN, quality - _ADAPTIVE_QUALITY_STEP)
+        elif camera._encode_streak <= -_ADAPTIVE_QUALITY_FRAMES and quality < camera.quality:
+            quality = min(camera.quality, quality + _ADAPTIVE_QUALITY_STEP)
+        else:
+            return
+        camera._encode_streak = 0
+        camera._effective_quality = quality
+        logger.debug("Camera %s: JPEG quality %d (encode %.1f ms, frame interval %.1f ms)",
+                    camera.camera_id, quality, ewma * 1000, frame_interval * 1000)
+    
+    def _emit_frame(self, camera: CameraStream, jpeg_bytes: Any, now: float) -> None:
+        """Store a new JPEG as the camera's latest frame and send it to subscribers.
+        
+        Called from the capture thread only (single writer of frame state and stats),
+        with the iteration's time.monotonic() reading as `now`.
+        """
+        frame_size = memoryview(jpeg_bytes).nbytes
+        # Single copy of the JPEG, straight from the encoder buffer into the packet
+        packet = self._format_mjpeg_frame(jpeg_bytes, frame_size)
+        # Single writer (capture thread): plain attribute stores, no lock needed
+        camera.last_frame_packet = packet
+        camera.last_frame_time = now + camera._wall_offset
+        camera.last_frame_size = frame_size
+        camera.frame_count += 1
+        camera.error = None
+        
+        # Update real-time stats (reset every second)
+        camera._stats_frame_count += 1
+        camera._stats_bytes_sent += frame_size
+        elapsed = now - camera._stats_start_time
+        if elapsed >= 1.0:
+            camera._real_fps = camera._stats_frame_count / elapsed
+            camera._bandwidth_kbps = (camera._stats_bytes_sent * 8) / (elapsed * 1000)
+            camera._stats_start_time = now
+            camera._stats_frame_count = 0
+            camera._stats_bytes_sent = 0
+            # Follow wall-clock adjustments (NTP) once per window
+            camera._wall_offset = time.time() - now
+        
+        # Notify subscribers (dedicated-port clients and Tornado streams)
+        self._publish(camera, packet)
+    
+    @staticmethod
+    def _publish(camera: CameraStream, packet: Optional[bytes]) -> None:
+        """Push a multipart packet into every subscriber queue, dropping the oldest when full.
+        
+        None is the end-of-stream marker sent when the capture loop exits.
+        """
+        subscribers = camera.subscribers  # Immutable snapshot: no lock, no copy
+        # Loop-fed clients are grouped so each event loop is woken once per frame
+        async_queues: Dict[asyncio.AbstractEventLoop, List[_AsyncFrameQueue]] = {}
+        for subscriber_queue in subscribers:
+            if isinstance(subscriber_queue, _AsyncFrameQueue):
+                async_queues.setdefault(subscriber_queue._loop, []).append(subscriber_queue)
+                continue
+            try:
+                subscriber_queue.put_nowait(packet)
+            except Full:
+                try:
+                    subscriber_queue.get_nowait()
+                except Empty:
+                    pass
+                try:
+                    subscriber_queue.put_nowait(packet)
+                except Full:
+                    pass
+        for loop, queues in async_queues.items():
+            _AsyncFrameQueue.publish_batch(loop, queues, packet)
+    
     def get_frame(self, camera_id: str) -> Optional[bytes]:
         """Get the latest frame from a camera.
         
@@ -962,9 +1552,9 @@ class MJPEGServer:
         if not camera:
             return self.PLACEHOLDER_FRAME
         
-        with camera._lock:
-            if camera.last_frame:
-                return camera.last_frame
+        frame = camera.last_frame
+        if frame:
+            return frame
         
         return self.PLACEHOLDER_FRAME
     
@@ -975,7 +1565,9 @@ class MJPEGServer:
             camera_id: The camera ID.
             
         Returns:
-            A Queue that will receive frames, or None if camera doesn't exist.
+            A Queue that will receive complete multipart packets (see
+            MJPEG_PART_HEADER), or None if camera doesn't exist.
+            For thread consumers; coroutines use frame_generator().
         """
         camera = self._cameras.get(camera_id)
         if not camera:
@@ -983,14 +1575,14 @@ class MJPEGServer:
         
         # Create a queue with limited size to prevent memory issues
         queue = Queue(maxsize=2)
-        camera.subscribers.append(queue)
+        camera.add_subscriber(queue)
         return queue
     
     def unsubscribe(self, camera_id: str, queue: Queue) -> None:
         """Unsubscribe from a camera's frame stream."""
         camera = self._cameras.get(camera_id)
-        if camera and queue in camera.subscribers:
-            camera.subscribers.remove(queue)
+        if camera:
+            camera.remove_subscriber(queue)
     
     async def frame_generator(self, camera_id: str) -> AsyncGenerator[bytes, None]:
         """Async generator that yields MJPEG frames.
@@ -1003,36 +1595,39 @@ class MJPEGServer:
         camera = self._cameras.get(camera_id)
         if not camera:
             # Yield placeholder once
-            yield self._format_mjpeg_frame(self.PLACEHOLDER_FRAME)
+            yield self._placeholder_packet
             return
         
-        queue = self.subscribe(camera_id)
-        if not queue:
-            yield self._format_mjpeg_frame(self.PLACEHOLDER_FRAME)
-            return
+        # Fed straight onto this (Tornado) loop by the capture thread: no executor
+        # hop per frame, same drop-oldest queue as the dedicated ports
+        queue = _AsyncFrameQueue(asyncio.get_running_loop())
+        camera.add_subscriber(queue)
         
         try:
             while True:
                 try:
                     # Wait for frame with timeout
-                    frame = await asyncio.get_event_loop().run_in_executor(
-                        None, lambda: queue.get(timeout=1.0)
-                    )
-                    yield self._format_mjpeg_frame(frame)
-                except Empty:
+                    packet = await asyncio.wait_for(queue.get(), timeout=1.0)
+                    # None marks a stopped capture loop: keep serving the placeholder
+                    yield packet if packet is not None else self._placeholder_packet
+                except asyncio.TimeoutError:
                     # Send placeholder on timeout
-                    yield self._format_mjpeg_frame(self.PLACEHOLDER_FRAME)
+                    yield self._placeholder_packet
         finally:
-            self.unsubscribe(camera_id, queue)
-    
-    def _format_mjpeg_frame(self, frame_data: bytes) -> bytes:
-        """Format a frame for MJPEG streaming."""
-        return (
-            b"--frame\r\n"
-            b"Content-Type: image/jpeg\r\n"
-            b"Content-Length: " + str(len(frame_data)).encode() + b"\r\n"
-            b"\r\n" + frame_data + b"\r\n"
-        )
+            camera.remove_subscriber(queue)
+    
+    @staticmethod
+    def _format_mjpeg_frame(frame_data: Any, frame_size: Optional[int] = None) -> bytes:
+        """Format a frame for MJPEG streaming.
+        
+        Args:
+            frame_data: JPEG as any bytes-like object (bytes, encoder ndarray buffer).
+            frame_size: Its size in bytes, if already known.
+        """
+        if frame_size is None:
+            frame_size = memoryview(frame_data).nbytes
+        # One allocation and a single copy of the JPEG; only the length is formatted
+        return b"".join((MJPEG_PART_HEADER % frame_size, frame_data, b"\r\n"))
     
     def get_camera_status(self, camera_id: str) -> Dict:
         """Get the status of a camera."""
@@ -1057,11 +1652,18 @@ class MJPEGServer:
             "fps": camera.fps,
             "real_fps": round(camera._real_fps, 1),
             "quality": camera.quality,
+            # Quality actually used for encoding (lower than quality under adaptive pressure)
+            "effective_quality": camera._effective_quality or camera.quality,
             "mjpeg_port": camera.mjpeg_port,
             "frame_count": camera.frame_count,
             "last_frame_time": camera.last_frame_time,
             "last_frame_size": camera.last_frame_size,
             "bandwidth_kbps": round(camera._bandwidth_kbps, 1),
+            "mjpeg_passthrough": camera._passthrough_mjpeg,
+            # "camera": JPEGs produced by the camera's own hardware encoder (no CPU encode)
+            "jpeg_encoder": ("camera" if camera._passthrough_mjpeg and not self._overlay_enabled(camera)
+                             else get_jpeg_encoder()),
+            "dedupe_static": camera.dedupe_static,
             "error": camera.error,
             "subscriber_count": len(camera.subscribers),
         }
@@ -1145,18 +1747,8 @@ class MJPEGServer:
             except ValueError:
                 device_index = device_path
             
-            # Open capture device with platform-appropriate backend
-            if is_windows and isinstance(device_index, int):
-                # Windows: use DirectShow backend
-                cap = cv2.VideoCapture(device_index, cv2.CAP_DSHOW)
-                result["backend"] = "DirectShow"
-            elif is_linux:
-                # Linux: use V4L2 backend
-                cap = cv2.VideoCapture(device_index, cv2.CAP_V4L2)
-                result["backend"] = "V4L2"
-            else:
-                cap = cv2.VideoCapture(device_index)
-                result["backend"] = "default"
+            # Open capture device with platform-appropriate backend (same choice as capture)
+            cap, result["backend"] = self._open_capture(device_index, is_windows, is_linux)
             
             if not cap.isOpened():
                 # More helpful error message
@@ -1234,7 +1826,6 @@ class MJPEGServer:
             Dictionary with detected capabilities.
         """
         import subprocess
-        import re
         
         result = {
             "supported_resolutions": [],
@@ -1272,19 +1863,17 @@ class MJPEGServer:
                 logger.debug("v4l2-ctl --list-formats-ext output:\n%s", output)
             
             # Parse discrete sizes: "Size: Discrete 640x480"
-            discrete_pattern = r'Size:\s+Discrete\s+(\d+)x(\d+)'
             resolutions = []
             
-            for match in re.finditer(discrete_pattern, output):
+            for match in _V4L2_DISCRETE_RE.finditer(output):
                 width, height = int(match.group(1)), int(match.group(2))
                 res = f"{width}x{height}"
                 if res not in resolutions:
                     resolutions.append(res)
             
             # Also parse from --list-formats-ext format: "[0]: 'MJPG' ... 640x480"
-            ext_pattern = r'(\d+)x(\d+)'
             if not resolutions:
-                for match in re.finditer(ext_pattern, output):
+                for match in _V4L2_SIZE_RE.finditer(output):
                     width, height = int(match.group(1)), int(match.group(2))
                     # Filter reasonable resolutions (not too small, reasonable aspect ratio)
                     if width >= 160 and height >= 120 and width <= 4096 and height <= 2160:
@@ -1295,8 +1884,7 @@ class MJPEGServer:
             # Parse stepwise sizes if no discrete sizes found
             # "Size: Stepwise 160x120 - 1920x1080 with step 8/8"
             if not resolutions:
-                stepwise_pattern = r'Size:\s+Stepwise\s+(\d+)x(\d+)\s+-\s+(\d+)x(\d+)'
-                match = re.search(stepwise_pattern, output)
+                match = _V4L2_STEPWISE_RE.search(output)
                 if match:
                     min_w, min_h = int(match.group(1)), int(match.group(2))
                     max_w, max_h = int(match.group(3)), int(match.group(4))
@@ -1351,3 +1939,11 @@ def get_mjpeg_server() -> MJPEGServer:
 def is_opencv_available() -> bool:
     """Check if OpenCV is available."""
     return OPENCV_AVAILABLE
+
+
+def get_jpeg_encoder() -> str:
+    """Name of the CPU JPEG encoder used for stream frames ("turbojpeg" or "opencv").
+    
+    Cameras in MJPEG passthrough skip it entirely (their status reports "camera").
+    """
+    return "turbojpeg" if _TURBOJPEG is not None else "opencv"
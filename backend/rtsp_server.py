@@ -1,4 +1,4 @@
-# File Version: 0.5.3
+# File Version: 0.5.23
 """
 RTSP Server module for Motion Frontend.
 
@@ -16,19 +16,79 @@ Requires:
 """
 
 import asyncio
+import functools
 import logging
 import os
 import platform
 import shutil
 import subprocess
 import re
+import time
 import unicodedata
-from dataclasses import dataclass, field
-from typing import Dict, Optional, List, Tuple
+from collections import deque
+from dataclasses import dataclass, field, fields
+from typing import Any, Deque, Dict, FrozenSet, Optional, List, Set, Tuple
 from pathlib import Path
 
+try:
+    from rapidfuzz import fuzz, process as fuzz_process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# One `ffmpeg -list_devices` probe (video and audio together) is reused this long
+_DSHOW_CACHE_TTL = 10.0
+
+# FFmpeg stderr lines kept per publisher (reported as the stream error)
+_STDERR_TAIL_LINES = 200
+# asyncio StreamReader limit for FFmpeg publishers' stderr (long log lines are
+# buffered whole; _drain_stderr keeps the pipe itself from filling up)
+_PIPE_BUFFER_SIZE = 1 << 20
+
+# Upper bound on encoder threads per software-encoded stream
+_MAX_ENCODER_THREADS = 4
+
+# A failed FFmpeg search is not repeated for this long
+_FFMPEG_MISS_TTL = 60.0
+
+# Minimum RapidFuzz WRatio score (0-100) for a fuzzy DirectShow name match
+_DSHOW_MATCH_CUTOFF = 85
+
+# Device line of `ffmpeg -list_devices`: [dshow @ ...] "Device Name" (type)
+_DSHOW_RE = re.compile(r'\[dshow @ [^\]]+\]\s*"([^"]+)"\s*\((\w+)\)')
+# First line of `ffmpeg -version`
+_FFMPEG_VER_RE = re.compile(r'ffmpeg version (\S+)')
+# Encoder line of `ffmpeg -encoders`: " V....D h264_nvenc   NVIDIA NVENC H.264 encoder"
+_ENCODER_RE = re.compile(r'^\s*[VAS][A-Z.]{5}\s+(?!=)(\S+)', re.MULTILINE)
+
+# Hardware H.264 encoders tried (in order) instead of libx264, per platform
+_HW_H264_ENCODERS = {
+    "windows": ("h264_nvenc", "h264_qsv", "h264_amf"),
+    "linux": ("h264_nvenc", "h264_qsv", "h264_vaapi"),
+    "darwin": ("h264_videotoolbox",),
+}
+_VAAPI_DEVICE = "/dev/dri/renderD128"
+
+# Camera formats: `ffmpeg -f dshow -list_options true` (vcodec=h264 / pixel_format=yuyv422)
+# and `v4l2-ctl --list-formats-ext` ([1]: 'H264' (H.264, compressed))
+_DSHOW_FORMAT_RE = re.compile(r'(?:vcodec|pixel_format)=(\w+)')
+_V4L2_FORMAT_RE = re.compile(r"\[\d+\]:\s*'(\w+)'")
+
+# Most common nuisance characters in device names, dropped before NFKD
+_CTRL_STRIP = str.maketrans('', '', '®™©')
+
+
+@functools.lru_cache(maxsize=256)
+def _normalize_device_name(name: str) -> str:
+    """Normalize device name for comparison (remove special chars, lowercase)."""
+    stripped = name.translate(_CTRL_STRIP)
+    if stripped.isascii():
+        return stripped.casefold().strip()
+    # NFKD splits accented letters so the ASCII encode keeps their base letter
+    return unicodedata.normalize('NFKD', stripped).encode('ascii', 'ignore').decode('ascii').casefold().strip()
+
 
 @dataclass
 class RTSPStreamConfig:
@@ -56,6 +116,10 @@ class RTSPStreamConfig:
     video_codec: str = "libx264"
     preset: str = "ultrafast"  # For low latency
     tune: str = "zerolatency"
+    # Replace the default libx264 with a working hardware H.264 encoder if one is found
+    hardware_encoding: bool = True
+    # Forward the camera's own H.264 (`-c:v copy`) instead of encoding, when offered
+    stream_copy: bool = True
 
 
 @dataclass
@@ -68,6 +132,46 @@ class RTSPStreamStatus:
     pid: Optional[int] = None
     has_audio: bool = False
     started_at: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization (API fields only)."""
+        return {
+            "camera_id": self.camera_id,
+            "is_running": self.is_running,
+            "rtsp_url": self.rtsp_url,
+            "has_audio": self.has_audio,
+            "error": self.error,
+            "started_at": self.started_at,
+        }
+
+
+@dataclass(frozen=True)
+class _FFmpegCaps:
+    """What the FFmpeg binary offers; probed once per binary (see RTSPServer.refresh_caps)."""
+    path: str
+    version: Optional[str]
+    encoders: FrozenSet[str]
+    hwaccels: FrozenSet[str]
+
+
+@dataclass
+class _StreamHandle:
+    """One FFmpeg publisher, shared by every camera whose stream signature matches."""
+    process: asyncio.subprocess.Process
+    signature: Tuple[Any, ...]
+    rtsp_url: str
+    started_at: str
+    camera_ids: Set[str] = field(default_factory=set)
+    # Last stderr lines, filled by a reader task so the pipe never fills up
+    stderr_tail: Deque[str] = field(default_factory=lambda: deque(maxlen=_STDERR_TAIL_LINES))
+    stderr_task: Optional["asyncio.Task[None]"] = None
+    
+    @property
+    def refcount(self) -> int:
+        return len(self.camera_ids)
+    
+    def stderr_text(self) -> str:
+        return "\n".join(self.stderr_tail)
 
 
 class RTSPServer:
@@ -76,22 +180,45 @@ class RTSPServer:
     
     Each camera can have its own RTSP stream on a dedicated port.
     Audio from linked audio device is mixed into the stream if available.
+    
+    Cameras whose configs produce the same output (same capture, encoding
+    options and RTSP port/path, see _stream_signature) share one FFmpeg
+    publisher; it is stopped when the last of them stops. Any difference,
+    including a different path, starts a separate publisher.
     """
     
     def __init__(self):
-        self._streams: Dict[str, subprocess.Popen] = {}
+        # camera_id -> publisher handle (several ids may share one handle)
+        self._streams: Dict[str, _StreamHandle] = {}
+        self._publishers: Dict[Tuple[Any, ...], _StreamHandle] = {}
         self._stream_status: Dict[str, RTSPStreamStatus] = {}
         self._platform = platform.system().lower()
         self._ffmpeg_path: Optional[str] = None
+        # Set when the last FFmpeg search failed; retried after _FFMPEG_MISS_TTL
+        self._ffmpeg_missing: bool = False
+        self._ffmpeg_probe_ts: float = 0.0
         self._base_rtsp_port = 8554
+        # (device name, type) pairs from the last DirectShow probe, and its time
+        self._dshow_devices: List[Tuple[str, str]] = []
+        self._dshow_probed_at: float = 0.0
+        # Normalized form of each cached device name (computed once per probe)
+        self._dshow_normalized: Dict[str, str] = {}
+        # FFmpeg path/version/encoders/hwaccels, and the first hardware H.264
+        # encoder that passed a test encode ("" if none); probed once
+        self._caps: Optional[_FFmpegCaps] = None
+        # When _caps was probed (0 = never) and whether that probe completed;
+        # a missing binary or failed probe is kept for _FFMPEG_MISS_TTL
+        self._caps_probed_at: float = 0.0
+        self._caps_complete: bool = False
+        self._caps_future: Optional["asyncio.Future[Optional[_FFmpegCaps]]"] = None
+        self._hw_encoder: Optional[str] = None
+        # Capture formats per resolved video device (cleared with the device cache)
+        self._camera_formats: Dict[str, List[str]] = {}
+        self._extend_search_path()
         
-    def _find_ffmpeg(self) -> Optional[str]:
-        """Find FFmpeg executable."""
-        if self._ffmpeg_path:
-            return self._ffmpeg_path
-            
-        # Refresh PATH from environment (for winget installations)
-        import os
+    @staticmethod
+    def _extend_search_path() -> None:
+        """Add winget/chocolatey FFmpeg locations to PATH (once, at construction)."""
         try:
             system_path = os.environ.get("PATH", "")
             # Add common Windows paths for winget and chocolatey installs
@@ -107,6 +234,13 @@ class RTSPServer:
             os.environ["PATH"] = system_path
         except Exception:
             pass
+        
+    def _find_ffmpeg(self) -> Optional[str]:
+        """Find FFmpeg executable (a miss is cached for _FFMPEG_MISS_TTL seconds)."""
+        if self._ffmpeg_path:
+            return self._ffmpeg_path
+        if self._ffmpeg_missing and time.monotonic() - self._ffmpeg_probe_ts < _FFMPEG_MISS_TTL:
+            return None
             
         # Try to find ffmpeg in PATH
         ffmpeg = shutil.which("ffmpeg")
@@ -126,18 +260,22 @@ class RTSPServer:
                 # Winget install location
                 Path(os.path.expandvars(r"%LOCALAPPDATA%\Microsoft\WinGet\Links\ffmpeg.exe")),
             ]
-            # Search in some common dev directories
+            # Search in some common dev directories (<dev>/<dir>/bin/ffmpeg.exe,
+            # one level deep instead of a recursive walk)
             dev_paths = [
                 Path("C:/Dev_VSCode"),
                 Path("C:/Projects"),
                 Path("C:/tools"),
             ]
             for dev_path in dev_paths:
-                if dev_path.exists():
-                    for ffmpeg_dir in dev_path.rglob("ffmpeg*.exe"):
-                        if ffmpeg_dir.name.lower() == "ffmpeg.exe":
-                            common_paths.append(ffmpeg_dir)
-                            break
+                try:
+                    with os.scandir(dev_path) as entries:
+                        for entry in entries:
+                            if entry.is_dir() and "ffmpeg" in entry.name.lower():
+                                common_paths.append(Path(entry.path) / "bin" / "ffmpeg.exe")
+                                common_paths.append(Path(entry.path) / "ffmpeg.exe")
+                except OSError:
+                    continue
         else:
             common_paths = [
                 Path("/usr/bin/ffmpeg"),
@@ -147,35 +285,145 @@ class RTSPServer:
         for path in common_paths:
             if path.exists():
                 self._ffmpeg_path = str(path)
+                self._ffmpeg_missing = False
                 logger.info("Found FFmpeg at: %s", path)
                 return self._ffmpeg_path
                 
+        self._ffmpeg_missing = True
+        self._ffmpeg_probe_ts = time.monotonic()
         logger.warning("FFmpeg not found in PATH or common locations")
         return None
         
     def is_ffmpeg_available(self) -> bool:
-        """Check if FFmpeg is available."""
-        return self._find_ffmpeg() is not None
+        """Check if FFmpeg is available (found and answering `-version`)."""
+        caps = self._get_caps()
+        return caps is not None and caps.version is not None
+    
+    def _caps_fresh(self) -> bool:
+        """True when the cached capabilities (or their absence) can be served as-is."""
+        if not self._caps_probed_at:
+            return False
+        return self._caps_complete or time.monotonic() - self._caps_probed_at < _FFMPEG_MISS_TTL
+    
+    async def load_caps(self) -> Optional[_FFmpegCaps]:
+        """
+        Probe FFmpeg capabilities in the default executor, off the event loop.
+        
+        Async callers await this before the synchronous getters
+        (is_ffmpeg_available, get_ffmpeg_version), which then read the cache.
+        Concurrent callers share one probe.
+        """
+        if self._caps_fresh():
+            return self._caps
+        if self._caps_future is None or self._caps_future.done():
+            self._caps_future = asyncio.get_running_loop().run_in_executor(None, self._get_caps)
+        return await asyncio.shield(self._caps_future)
+    
+    def _get_caps(self) -> Optional[_FFmpegCaps]:
+        """
+        FFmpeg capabilities, probed on first use and then served from memory.
+        
+        `-version`, `-encoders` and `-hwaccels` run concurrently. A complete
+        probe is kept until refresh_caps(); a missing binary or an incomplete
+        probe is kept for _FFMPEG_MISS_TTL seconds before retrying. Blocking:
+        call load_caps() from coroutines.
+        """
+        if self._caps_fresh():
+            return self._caps
+        ffmpeg = self._find_ffmpeg()
+        if not ffmpeg:
+            self._caps = None
+            self._caps_complete = False
+            self._caps_probed_at = time.monotonic()
+            return None
+        
+        commands = {
+            "-version": [ffmpeg, "-version"],
+            "-encoders": [ffmpeg, "-hide_banner", "-encoders"],
+            "-hwaccels": [ffmpeg, "-hide_banner", "-hwaccels"],
+        }
+        outputs: Dict[str, str] = {}
+        procs: Dict[str, subprocess.Popen] = {}
+        complete = False
+        try:
+            for flag, cmd in commands.items():
+                procs[flag] = subprocess.Popen(
+                    cmd,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    encoding='utf-8',
+                    errors='replace'
+                )
+            for flag, proc in procs.items():
+                outputs[flag] = proc.communicate(timeout=10)[0]
+            complete = True
+        except Exception as e:
+            logger.error("Failed to probe FFmpeg capabilities: %s", e)
+            for proc in procs.values():
+                if proc.poll() is None:
+                    proc.kill()
+        
+        version = None
+        # Extract version from first line
+        first_line = outputs.get("-version", "").split('\n', 1)[0]
+        if first_line:
+            match = _FFMPEG_VER_RE.search(first_line)
+            version = match.group(1) if match else first_line
+        # `-hwaccels`: a title line, then one method per line
+        hwaccels = [line.strip() for line in outputs.get("-hwaccels", "").splitlines()[1:]]
+        
+        caps = _FFmpegCaps(
+            path=ffmpeg,
+            version=version,
+            encoders=frozenset(_ENCODER_RE.findall(outputs.get("-encoders", ""))),
+            hwaccels=frozenset(h for h in hwaccels if h),
+        )
+        self._caps = caps
+        self._caps_complete = complete
+        self._caps_probed_at = time.monotonic()
+        if complete:
+            logger.info("FFmpeg %s: %d encoders, hwaccels: %s", version, len(caps.encoders),
+                        ", ".join(sorted(caps.hwaccels)) or "none")
+        else:
+            logger.warning("FFmpeg capability probe incomplete, retrying in %.0f s", _FFMPEG_MISS_TTL)
+        return caps
+    
+    def refresh_caps(self) -> None:
+        """Forget the FFmpeg location and capabilities (re-probed on next use)."""
+        self._caps = None
+        self._caps_probed_at = 0.0
+        self._caps_complete = False
+        self._hw_encoder = None
+        self._ffmpeg_path = None
+        self._ffmpeg_missing = False
     
     def _normalize_device_name(self, name: str) -> str:
-        """Normalize device name for comparison (remove special chars, lowercase)."""
-        # Normalize Unicode (NFKD removes special chars like ®)
-        normalized = unicodedata.normalize('NFKD', name)
-        # Remove non-ASCII characters
-        ascii_name = normalized.encode('ASCII', 'ignore').decode('ASCII')
-        # Lowercase and strip
-        return ascii_name.lower().strip()
+        """Normalize device name for comparison (see module-level _normalize_device_name)."""
+        return _normalize_device_name(name)
+    
+    def invalidate_device_cache(self) -> None:
+        """Forget the cached DirectShow device lists and camera formats (next lookup re-probes)."""
+        self._dshow_probed_at = 0.0
+        self._camera_formats.clear()
     
     def _list_dshow_devices(self, device_type: str = "video") -> List[str]:
         """
         List available DirectShow devices using FFmpeg.
         
+        A single probe lists video and audio devices; it is cached for
+        _DSHOW_CACHE_TTL seconds so stream starts (video + audio lookups, several
+        cameras) share it.
+        
         Args:
             device_type: "video" or "audio"
             
         Returns:
             List of device names as reported by FFmpeg.
         """
+        if self._dshow_probed_at and time.monotonic() - self._dshow_probed_at < _DSHOW_CACHE_TTL:
+            return self._filter_dshow_devices(device_type)
+        
         ffmpeg = self._find_ffmpeg()
         if not ffmpeg:
             return []
@@ -192,33 +440,43 @@ class RTSPServer:
             # FFmpeg outputs device list to stderr
             output = result.stderr
             
-            devices = []
+            entries = []
             
             # FFmpeg format: [dshow @ ...] "Device Name" (type)
             # where type is "video", "audio", or "none"
             # Followed by: [dshow @ ...]   Alternative name "@device_pnp_..."
-            for line in output.split('\n'):
+            for line in output.splitlines():
                 # Match lines like: [dshow @ ...] "Microsoft® LifeCam HD-5000" (video)
-                match = re.search(r'\[dshow @ [^\]]+\]\s*"([^"]+)"\s*\((\w+)\)', line)
+                match = _DSHOW_RE.search(line)
                 if match:
-                    device_name = match.group(1)
-                    detected_type = match.group(2)
-                    # Match by type (video, audio) or accept 'none' which can be either
-                    if detected_type == device_type or detected_type == "none":
-                        devices.append(device_name)
-                        logger.debug("Found DirectShow %s device: %s", device_type, device_name)
-                            
-            logger.debug("Found %d DirectShow %s devices: %s", len(devices), device_type, devices)
-            return devices
+                    entries.append((match.group(1), match.group(2)))
+                    logger.debug("Found DirectShow %s device: %s", match.group(2), match.group(1))
+            
+            self._dshow_devices = entries
+            self._dshow_normalized = {
+                device: self._normalize_device_name(device) for device, _ in entries
+            }
+            self._dshow_probed_at = time.monotonic()
         except Exception as e:
             logger.error("Failed to list DirectShow devices: %s", e)
             return []
+        
+        devices = self._filter_dshow_devices(device_type)
+        logger.debug("Found %d DirectShow %s devices: %s", len(devices), device_type, devices)
+        return devices
+    
+    def _filter_dshow_devices(self, device_type: str) -> List[str]:
+        """Cached DirectShow devices of a type ('none' entries can be either type)."""
+        return [name for name, detected_type in self._dshow_devices
+                if detected_type == device_type or detected_type == "none"]
     
     def _find_matching_dshow_device(self, name: str, device_type: str = "video") -> Optional[str]:
         """
         Find the exact DirectShow device name that matches the given name.
         
-        Uses fuzzy matching to handle special characters (e.g., ® symbol).
+        Uses fuzzy matching to handle special characters (e.g., ® symbol):
+        exact name, then normalized name, then RapidFuzz WRatio above
+        _DSHOW_MATCH_CUTOFF (substring containment if RapidFuzz is missing).
         
         Args:
             name: Camera/device name (may be missing special chars)
@@ -237,50 +495,169 @@ class RTSPServer:
             
         # Try normalized matching
         normalized_search = self._normalize_device_name(name)
-        for device in devices:
-            normalized_device = self._normalize_device_name(device)
+        norm_devices = [
+            (self._dshow_normalized.get(device) or self._normalize_device_name(device), device)
+            for device in devices
+        ]
+        for normalized_device, device in norm_devices:
             if normalized_search == normalized_device:
                 logger.info("Matched device '%s' to DirectShow device '%s'", name, device)
                 return device
-            # Also try if one contains the other
-            if normalized_search in normalized_device or normalized_device in normalized_search:
-                logger.info("Partial match: '%s' to DirectShow device '%s'", name, device)
+        
+        if RAPIDFUZZ_AVAILABLE:
+            # Edit-distance score tolerates model-number drift and partial names
+            best = fuzz_process.extractOne(
+                normalized_search,
+                [normalized for normalized, _ in norm_devices],
+                scorer=fuzz.WRatio,
+                score_cutoff=_DSHOW_MATCH_CUTOFF,
+            )
+            if best is not None:
+                device = norm_devices[best[2]][1]
+                logger.info("Fuzzy match (score %.0f): '%s' to DirectShow device '%s'", best[1], name, device)
                 return device
+        else:
+            # Fallback without RapidFuzz: one name contains the other
+            for normalized_device, device in norm_devices:
+                if normalized_search in normalized_device or normalized_device in normalized_search:
+                    logger.info("Partial match: '%s' to DirectShow device '%s'", name, device)
+                    return device
                 
         logger.warning("Could not find matching DirectShow device for '%s'. Available: %s", name, devices)
         return None
         
     def get_ffmpeg_version(self) -> Optional[str]:
-        """Get FFmpeg version string."""
+        """Get FFmpeg version string (cached with the other capabilities)."""
+        caps = self._get_caps()
+        return caps.version if caps else None
+    
+    def _probe_encoders(self) -> FrozenSet[str]:
+        """Names of the encoders compiled into FFmpeg (`ffmpeg -encoders`, cached)."""
+        caps = self._get_caps()
+        return caps.encoders if caps else frozenset()
+    
+    def _get_hw_encoder(self) -> Optional[str]:
+        """
+        First hardware H.264 encoder that actually works on this machine (cached).
+        
+        Builds often ship NVENC/QSV/AMF regardless of the installed GPU, so each
+        candidate listed by `ffmpeg -encoders` must also encode a test frame.
+        """
+        if self._hw_encoder is not None:
+            return self._hw_encoder or None
         ffmpeg = self._find_ffmpeg()
         if not ffmpeg:
             return None
-            
+        
+        available = self._probe_encoders()
+        self._hw_encoder = ""
+        for encoder in _HW_H264_ENCODERS.get(self._platform, ()):
+            if encoder not in available:
+                continue
+            if encoder == "h264_vaapi" and not os.path.exists(_VAAPI_DEVICE):
+                continue
+            cmd = [ffmpeg, "-hide_banner", "-loglevel", "error"]
+            cmd.extend(self._get_hw_global_args(encoder))
+            cmd.extend(["-f", "lavfi", "-i", "color=c=black:s=256x144:r=1", "-frames:v", "1"])
+            cmd.extend(["-c:v", encoder])
+            cmd.extend(self._get_pixel_format_args(encoder))
+            cmd.extend(["-f", "null", "-"])
+            try:
+                result = subprocess.run(cmd, capture_output=True, timeout=10)
+            except Exception as e:
+                logger.debug("Hardware encoder %s test failed: %s", encoder, e)
+                continue
+            if result.returncode == 0:
+                self._hw_encoder = encoder
+                logger.info("Using hardware H.264 encoder for RTSP: %s", encoder)
+                break
+            logger.debug("Hardware encoder %s unusable: %s", encoder,
+                         result.stderr.decode("utf-8", errors="replace").strip())
+        else:
+            logger.info("No usable hardware H.264 encoder, RTSP uses libx264")
+        return self._hw_encoder or None
+    
+    def _probe_camera_formats(self, device: str) -> List[str]:
+        """Lower-case capture formats/codecs a video device offers (cached per device)."""
+        if device in self._camera_formats:
+            return self._camera_formats[device]
+        
+        formats: List[str] = []
         try:
-            result = subprocess.run(
-                [ffmpeg, "-version"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            # Extract version from first line
-            first_line = result.stdout.split('\n')[0]
-            match = re.search(r'ffmpeg version (\S+)', first_line)
-            if match:
-                return match.group(1)
-            return first_line
+            if self._platform == "windows":
+                ffmpeg = self._find_ffmpeg()
+                if not ffmpeg:
+                    return []
+                result = subprocess.run(
+                    [ffmpeg, "-hide_banner", "-f", "dshow", "-list_options", "true", "-i", f"video={device}"],
+                    capture_output=True,
+                    text=True,
+                    timeout=10,
+                    encoding='utf-8',
+                    errors='replace'
+                )
+                # FFmpeg outputs the options to stderr
+                found = _DSHOW_FORMAT_RE.findall(result.stderr)
+            else:
+                result = subprocess.run(
+                    ["v4l2-ctl", "-d", device, "--list-formats-ext"],
+                    capture_output=True,
+                    text=True,
+                    timeout=5
+                )
+                found = _V4L2_FORMAT_RE.findall(result.stdout)
+            for fmt in found:
+                fmt = fmt.lower()
+                if fmt not in formats:
+                    formats.append(fmt)
         except Exception as e:
-            logger.error("Failed to get FFmpeg version: %s", e)
-            return None
+            logger.debug("Could not list capture formats of %s: %s", device, e)
+        
+        logger.debug("Capture formats of %s: %s", device, formats)
+        self._camera_formats[device] = formats
+        return formats
     
-    def _get_video_input_args(self, config: RTSPStreamConfig) -> List[str]:
-        """Get FFmpeg input arguments for video capture."""
-        args = []
+    def _select_video_encoder(self, config: RTSPStreamConfig) -> str:
+        """
+        Video encoder for a stream.
         
+        With the default libx264: "copy" if the camera delivers H.264 itself,
+        else a working hardware encoder, else libx264.
+        """
+        if config.video_codec != "libx264":
+            return config.video_codec
+        if config.stream_copy and "h264" in self._probe_camera_formats(self._resolve_video_device(config)):
+            return "copy"
+        if config.hardware_encoding:
+            return self._get_hw_encoder() or config.video_codec
+        return config.video_codec
+    
+    def _encoder_threads(self) -> int:
+        """Thread count for a new software encoder, given the publishers already running."""
+        n_streams = len(self._publishers) + 1
+        return max(1, min(_MAX_ENCODER_THREADS, (os.cpu_count() or 1) // n_streams))
+    
+    @staticmethod
+    def _get_hw_global_args(encoder: str) -> List[str]:
+        """Global FFmpeg options an encoder needs before the inputs."""
+        if encoder == "h264_vaapi":
+            return ["-vaapi_device", _VAAPI_DEVICE]
+        return []
+    
+    @staticmethod
+    def _get_pixel_format_args(encoder: str) -> List[str]:
+        """Pixel format (or upload filter) fed to the encoder."""
+        if encoder == "h264_vaapi":
+            return ["-vf", "format=nv12,hwupload"]
+        if encoder == "h264_qsv":
+            return ["-pix_fmt", "nv12"]
+        return ["-pix_fmt", "yuv420p"]
+    
+    def _resolve_video_device(self, config: RTSPStreamConfig) -> str:
+        """DirectShow device name (Windows) or /dev/videoN path (Linux) for a camera."""
+        device = config.camera_device
         if self._platform == "windows":
-            # DirectShow input on Windows
             # If device is just a number (OpenCV index), try to use the camera name
-            device = config.camera_device
             if device.isdigit():
                 # Use camera name as DirectShow device name instead of index
                 # FFmpeg DirectShow needs the actual device name, not OpenCV index
@@ -289,10 +666,22 @@ class RTSPServer:
             # Try to find exact DirectShow device name (may have special chars like ®)
             exact_device = self._find_matching_dshow_device(device, "video")
             if exact_device:
-                device = exact_device
-            else:
-                logger.warning("Could not find exact DirectShow match for '%s', trying as-is", device)
-            
+                return exact_device
+            logger.warning("Could not find exact DirectShow match for '%s', trying as-is", device)
+            return device
+        if not device.startswith("/dev/"):
+            device = f"/dev/video{device}"
+        return device
+    
+    def _get_video_input_args(self, config: RTSPStreamConfig) -> List[str]:
+        """Get FFmpeg input arguments for video capture."""
+        args = []
+        device = self._resolve_video_device(config)
+        # Ask the camera for its H.264 stream when it is forwarded as-is
+        stream_copy = self._select_video_encoder(config) == "copy"
+        
+        if self._platform == "windows":
+            # DirectShow input on Windows
             # Build arguments - on Windows, let FFmpeg auto-detect resolution if not standard
             # Common webcam resolutions that should work
             common_resolutions = [
@@ -300,6 +689,8 @@ class RTSPServer:
                 "1280x720", "800x600", "960x544", "800x448", "424x240", "352x288"
             ]
             args.extend(["-f", "dshow"])
+            if stream_copy:
+                args.extend(["-vcodec", "h264"])
             # Only specify resolution if it's a common webcam resolution
             if config.resolution in common_resolutions:
                 args.extend(["-video_size", config.resolution])
@@ -313,11 +704,10 @@ class RTSPServer:
             ])
         else:
             # V4L2 input on Linux
-            device = config.camera_device
-            if not device.startswith("/dev/"):
-                device = f"/dev/video{device}"
+            args.extend(["-f", "v4l2"])
+            if stream_copy:
+                args.extend(["-input_format", "h264"])
             args.extend([
-                "-f", "v4l2",
                 "-video_size", config.resolution,
                 "-framerate", str(config.framerate),
                 "-i", device
@@ -360,16 +750,43 @@ class RTSPServer:
         args = []
         
         # Video encoding
-        args.extend([
-            "-c:v", config.video_codec,
-            "-preset", config.preset,
-            "-tune", config.tune,
-            "-b:v", f"{config.video_bitrate}k",
-            "-maxrate", f"{config.video_bitrate * 2}k",
-            "-bufsize", f"{config.video_bitrate}k",
-            "-pix_fmt", "yuv420p",
-            "-g", str(config.framerate * 2),  # GOP size = 2 seconds
-        ])
+        video_codec = self._select_video_encoder(config)
+        if video_codec == "copy":
+            # Camera already delivers H.264: no rate control, pixel format or GOP to set
+            args.extend(["-c:v", "copy"])
+        else:
+            if video_codec == "h264_nvenc":
+                args.extend(["-c:v", video_codec, "-preset", "p1", "-tune", "ll", "-rc", "cbr"])
+            elif video_codec == "h264_qsv":
+                args.extend(["-c:v", video_codec, "-preset", "veryfast"])
+            elif video_codec == "h264_amf":
+                args.extend(["-c:v", video_codec, "-usage", "ultralowlatency", "-quality", "speed", "-rc", "cbr"])
+            elif video_codec == "h264_videotoolbox":
+                args.extend(["-c:v", video_codec, "-realtime", "true"])
+            elif video_codec == "h264_vaapi":
+                args.extend(["-c:v", video_codec])
+            else:
+                args.extend([
+                    "-c:v", video_codec,
+                    "-preset", config.preset,
+                    "-tune", config.tune,
+                ])
+                # Software encoders otherwise start ~1 thread per CPU each:
+                # share the cores between running publishers (+ this one)
+                threads = self._encoder_threads()
+                args.extend(["-threads", str(threads)])
+                if video_codec == "libx264":
+                    args.extend([
+                        "-x264-params",
+                        f"threads={threads}:sliced-threads=1:sync-lookahead=0:rc-lookahead=0",
+                    ])
+            args.extend([
+                "-b:v", f"{config.video_bitrate}k",
+                "-maxrate", f"{config.video_bitrate * 2}k",
+                "-bufsize", f"{config.video_bitrate}k",
+            ])
+            args.extend(self._get_pixel_format_args(video_codec))
+            args.extend(["-g", str(config.framerate * 2)])  # GOP size = 2 seconds
         
         # Audio encoding (if audio present)
         if has_audio:
@@ -445,6 +862,50 @@ class RTSPServer:
         finally:
             sock.close()
     
+    @staticmethod
+    async def _probe_rtsp_port(port: int, timeout: float = 0.05) -> bool:
+        """Non-blocking check that something accepts connections on the local port."""
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", port), timeout)
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        return True
+    
+    async def _await_rtsp_port(self, port: int, total: float = 5.0) -> bool:
+        """Wait until something listens on the port, retrying with 50 ms -> 500 ms backoff."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + total
+        delay = 0.05
+        while True:
+            if await self._probe_rtsp_port(port):
+                return True
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.5)
+    
+    @staticmethod
+    async def _run_command(cmd: List[str], timeout: float) -> Tuple[int, str, str]:
+        """Run a short command asynchronously; returns (returncode, stdout, stderr)."""
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise
+        return (
+            proc.returncode,
+            stdout.decode("utf-8", errors="replace"),
+            stderr.decode("utf-8", errors="replace"),
+        )
+    
     def is_rtsp_server_available(self) -> bool:
         """Check if a proper RTSP server is available (MediaMTX/rtsp-simple-server).
         
@@ -468,6 +929,26 @@ class RTSPServer:
             
         logger.warning("No RTSP server available on port %d", self._base_rtsp_port)
         return False
+    
+    async def is_rtsp_server_available_async(self) -> bool:
+        """is_rtsp_server_available() without blocking the event loop.
+        
+        The port is probed with an async connect and the MediaMTX lookup
+        (PATH scan, filesystem checks) runs in the default executor.
+        """
+        if await self._probe_rtsp_port(self._base_rtsp_port):
+            logger.info("RTSP server detected on port %d", self._base_rtsp_port)
+            return True
+        
+        if self._platform != "windows":
+            loop = asyncio.get_running_loop()
+            mediamtx_path = await loop.run_in_executor(None, self._find_mediamtx)
+            if mediamtx_path:
+                logger.info("MediaMTX binary found at %s but service not listening", mediamtx_path)
+                return True
+            
+        logger.warning("No RTSP server available on port %d", self._base_rtsp_port)
+        return False
         
     def _get_rtsp_output_args(self, config: RTSPStreamConfig) -> List[str]:
         """Get FFmpeg RTSP output arguments."""
@@ -499,6 +980,7 @@ class RTSPServer:
             "-loglevel", "warning",
             "-y",  # Overwrite output
         ])
+        cmd.extend(self._get_hw_global_args(self._select_video_encoder(config)))
         
         # Video input
         cmd.extend(self._get_video_input_args(config))
@@ -515,6 +997,45 @@ class RTSPServer:
         
         return cmd, has_audio
         
+    @staticmethod
+    def _stream_signature(config: RTSPStreamConfig) -> Tuple[Any, ...]:
+        """
+        Key under which identical publishers are shared.
+        
+        Every config field except camera_id: the capture, every encoder/audio
+        option and the output port/path. A publisher is therefore only shared
+        when it would push exactly the same stream to the same RTSP URL.
+        """
+        return tuple(
+            getattr(config, f.name) for f in fields(config) if f.name != "camera_id"
+        )
+    
+    @staticmethod
+    async def _drain_stderr(handle: _StreamHandle) -> None:
+        """Read FFmpeg stderr until EOF into the handle's ring buffer."""
+        stream = handle.process.stderr
+        try:
+            while line := await stream.readline():
+                text = line.decode("utf-8", errors="replace").rstrip()
+                handle.stderr_tail.append(text)
+                logger.debug("FFmpeg[%s]: %s", handle.process.pid, text)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug("FFmpeg stderr reader stopped: %s", e)
+    
+    def _release_handle(self, camera_id: str) -> Optional[_StreamHandle]:
+        """Detach a camera from its publisher; returns the handle if no camera uses it anymore."""
+        handle = self._streams.pop(camera_id, None)
+        if handle is None:
+            return None
+        handle.camera_ids.discard(camera_id)
+        if handle.camera_ids:
+            return None
+        if self._publishers.get(handle.signature) is handle:
+            del self._publishers[handle.signature]
+        return handle
+    
     async def start_stream(self, config: RTSPStreamConfig) -> RTSPStreamStatus:
         """Start RTSP stream for a camera.
         
@@ -532,6 +1053,21 @@ class RTSPServer:
             has_audio=config.audio_device_id is not None
         )
         
+        # Reuse a running publisher for the same capture instead of encoding twice
+        signature = self._stream_signature(config)
+        shared = self._publishers.get(signature)
+        if shared is not None and shared.process.returncode is None:
+            shared.camera_ids.add(camera_id)
+            self._streams[camera_id] = shared
+            status.is_running = True
+            status.pid = shared.process.pid
+            status.rtsp_url = shared.rtsp_url
+            status.started_at = shared.started_at
+            logger.info("RTSP stream for camera %s shares the running publisher %s (%d users)",
+                        camera_id, shared.rtsp_url, shared.refcount)
+            self._stream_status[camera_id] = status
+            return status
+        
         # On Linux, check if Motion is using the camera
         if self._platform != "windows":
             from . import system_info
@@ -551,7 +1087,7 @@ class RTSPServer:
         
         # Check if RTSP server (MediaMTX) is available
         logger.info("Checking RTSP server availability for camera %s on port %d...", camera_id, config.rtsp_port)
-        if not self.is_rtsp_server_available():
+        if not await self.is_rtsp_server_available_async():
             status.is_running = False
             if self._platform == "windows":
                 status.error = (
@@ -572,19 +1108,16 @@ class RTSPServer:
         
         # On Linux, ensure MediaMTX service is running
         if self._platform != "windows":
-            if not self._is_rtsp_port_listening(config.rtsp_port):
+            if not await self._probe_rtsp_port(config.rtsp_port):
                 logger.info("MediaMTX not listening on port %d, attempting to start service...", config.rtsp_port)
                 try:
                     # Check if service exists and its state
-                    result = subprocess.run(
-                        ["systemctl", "is-active", "mediamtx"],
-                        capture_output=True,
-                        text=True,
-                        timeout=5
+                    returncode, stdout, _ = await self._run_command(
+                        ["systemctl", "is-active", "mediamtx"], timeout=5
                     )
-                    logger.debug("MediaMTX service status: %s (code %d)", result.stdout.strip(), result.returncode)
+                    logger.debug("MediaMTX service status: %s (code %d)", stdout.strip(), returncode)
                     
-                    if result.returncode != 0:
+                    if returncode != 0:
                         # Service not running - check if we can start it
                         # First, check if we're running as root or have passwordless sudo
                         can_use_sudo = False
@@ -596,38 +1129,26 @@ class RTSPServer:
                         else:
                             # Check if we have passwordless sudo for systemctl
                             try:
-                                check = subprocess.run(
-                                    ["sudo", "-n", "systemctl", "is-enabled", "mediamtx"],
-                                    capture_output=True,
-                                    text=True,
-                                    timeout=5
+                                check_code, check_out, _ = await self._run_command(
+                                    ["sudo", "-n", "systemctl", "is-enabled", "mediamtx"], timeout=5
                                 )
-                                can_use_sudo = (check.returncode == 0 or "enabled" in check.stdout or "disabled" in check.stdout)
-                                logger.debug("Passwordless sudo check: returncode=%d, can_use=%s", check.returncode, can_use_sudo)
+                                can_use_sudo = (check_code == 0 or "enabled" in check_out or "disabled" in check_out)
+                                logger.debug("Passwordless sudo check: returncode=%d, can_use=%s", check_code, can_use_sudo)
                             except Exception as e:
                                 logger.debug("Passwordless sudo not available: %s", e)
                         
                         if can_use_sudo:
                             logger.info("Attempting to start MediaMTX service...")
                             start_cmd = ["systemctl", "start", "mediamtx"] if os.geteuid() == 0 else ["sudo", "-n", "systemctl", "start", "mediamtx"]
-                            start_result = subprocess.run(
-                                start_cmd,
-                                capture_output=True,
-                                text=True,
-                                timeout=15
-                            )
-                            if start_result.returncode != 0:
-                                logger.warning("Could not start MediaMTX service: %s", start_result.stderr)
+                            start_code, _, start_err = await self._run_command(start_cmd, timeout=15)
+                            if start_code != 0:
+                                logger.warning("Could not start MediaMTX service: %s", start_err)
                                 # Don't fail - the service might start automatically or be managed externally
                             else:
                                 logger.info("MediaMTX service started successfully")
                                 # Wait for the service to be ready
-                                import time
-                                for i in range(5):
-                                    time.sleep(1)
-                                    if self._is_rtsp_port_listening(config.rtsp_port):
-                                        logger.info("MediaMTX now listening on port %d", config.rtsp_port)
-                                        break
+                                if await self._await_rtsp_port(config.rtsp_port):
+                                    logger.info("MediaMTX now listening on port %d", config.rtsp_port)
                                 else:
                                     logger.warning("MediaMTX service started but port %d not yet listening", config.rtsp_port)
                         else:
@@ -641,7 +1162,10 @@ class RTSPServer:
                     logger.error("Could not check/start MediaMTX service: %s", e)
         
         try:
-            cmd, has_audio = self._build_ffmpeg_command(config)
+            # Device lookups may probe FFmpeg (DirectShow listing): keep them off the loop
+            cmd, has_audio = await asyncio.get_running_loop().run_in_executor(
+                None, self._build_ffmpeg_command, config
+            )
             status.has_audio = has_audio
             
             logger.info("="*60)
@@ -651,39 +1175,55 @@ class RTSPServer:
             logger.info("="*60)
             
             # Start FFmpeg process
+            popen_kwargs: Dict[str, Any] = {}
             if self._platform == "windows":
                 # Windows: CREATE_NO_WINDOW flag
-                CREATE_NO_WINDOW = 0x08000000
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    creationflags=CREATE_NO_WINDOW
-                )
-            else:
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE
-                )
+                popen_kwargs["creationflags"] = 0x08000000
+            # FFmpeg writes nothing useful to stdout; stderr is drained by a task
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+                limit=_PIPE_BUFFER_SIZE,
+                **popen_kwargs
+            )
                 
-            self._streams[camera_id] = process
+            handle = _StreamHandle(
+                process=process,
+                signature=signature,
+                rtsp_url=f"rtsp://{{host}}:{config.rtsp_port}{config.rtsp_path}",
+                started_at=__import__("datetime").datetime.now().isoformat(),
+                camera_ids={camera_id},
+            )
+            handle.stderr_task = asyncio.create_task(self._drain_stderr(handle))
+            self._streams[camera_id] = handle
+            self._publishers[signature] = handle
             
             # Wait a bit to check if process started successfully
-            await asyncio.sleep(1.0)
+            try:
+                await asyncio.wait_for(process.wait(), 1.0)
+            except asyncio.TimeoutError:
+                pass
             
-            if process.poll() is not None:
-                # Process terminated
-                _, stderr = process.communicate(timeout=2)
-                error_msg = stderr.decode("utf-8", errors="replace") if stderr else "Unknown error"
+            if process.returncode is not None:
+                # Process terminated: let the reader collect the rest of stderr
+                try:
+                    await asyncio.wait_for(asyncio.shield(handle.stderr_task), 2)
+                except asyncio.TimeoutError:
+                    pass
+                error_msg = handle.stderr_text() or "Unknown error"
                 status.is_running = False
                 status.error = error_msg
+                for joined_id in list(handle.camera_ids):
+                    self._release_handle(joined_id)
+                    if joined_id in self._stream_status:
+                        self._stream_status[joined_id].is_running = False
                 logger.error("RTSP stream failed to start: %s", error_msg)
             else:
                 status.is_running = True
                 status.pid = process.pid
-                status.rtsp_url = f"rtsp://{{host}}:{config.rtsp_port}{config.rtsp_path}"
-                status.started_at = __import__("datetime").datetime.now().isoformat()
+                status.rtsp_url = handle.rtsp_url
+                status.started_at = handle.started_at
                 logger.info("RTSP stream started on port %d for camera %s", config.rtsp_port, camera_id)
                 
         except Exception as e:
@@ -695,24 +1235,31 @@ class RTSPServer:
         return status
         
     async def stop_stream(self, camera_id: str) -> bool:
-        """Stop RTSP stream for a camera."""
+        """Stop RTSP stream for a camera (the publisher stops with its last user)."""
         if camera_id not in self._streams:
             logger.warning("No RTSP stream running for camera %s", camera_id)
             return False
             
-        process = self._streams[camera_id]
+        handle = self._release_handle(camera_id)
+        if camera_id in self._stream_status:
+            self._stream_status[camera_id].is_running = False
+        if handle is None:
+            logger.info("RTSP stream detached for camera %s (publisher still in use)", camera_id)
+            return True
+        process = handle.process
         
         try:
             # Terminate gracefully
-            process.terminate()
+            if process.returncode is None:
+                process.terminate()
             
             # Wait for process to end
             try:
-                process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
+                await asyncio.wait_for(process.wait(), 5)
+            except asyncio.TimeoutError:
                 # Force kill if not responding
                 process.kill()
-                process.wait(timeout=2)
+                await asyncio.wait_for(process.wait(), 2)
                 
             logger.info("RTSP stream stopped for camera %s", camera_id)
             
@@ -720,9 +1267,8 @@ class RTSPServer:
             logger.error("Error stopping RTSP stream: %s", e)
             return False
         finally:
-            del self._streams[camera_id]
-            if camera_id in self._stream_status:
-                self._stream_status[camera_id].is_running = False
+            if handle.stderr_task is not None:
+                handle.stderr_task.cancel()
                 
         return True
         
@@ -738,17 +1284,13 @@ class RTSPServer:
         
         if status and camera_id in self._streams:
             # Check if process is still running
-            process = self._streams[camera_id]
-            if process.poll() is not None:
+            handle = self._streams[camera_id]
+            process = handle.process
+            if process.returncode is not None:
                 status.is_running = False
-                # Try to get error from stderr
-                try:
-                    _, stderr = process.communicate(timeout=1)
-                    if stderr:
-                        status.error = stderr.decode("utf-8", errors="replace")
-                except:
-                    pass
-                del self._streams[camera_id]
+                # Error comes from the stderr ring (the reader task owns the pipe)
+                status.error = handle.stderr_text() or f"FFmpeg exited with code {process.returncode}"
+                self._release_handle(camera_id)
                 
         return status
         
@@ -1,7 +1,8 @@
-# File Version: 0.19.4
+# File Version: 0.19.12
 from __future__ import annotations
 
 import argparse
+import asyncio
 import logging
 import signal
 import sys
@@ -56,9 +57,16 @@ from .handlers import (
     RTSPStreamHandler,
     HLSProxyHandler,
 )
-from .jinja import build_environment
+from .jinja import build_environment, precompile
 from .settings import ServerSettings
 
+# Optional: libuv-based event loop (faster socket I/O for streams and proxies)
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 Route = Tuple[str, Type[tornado.web.RequestHandler], Optional[dict]]
 
 
@@ -83,58 +91,63 @@ def _detect_version(changelog_path: Path) -> str:
     return "dev"
 
 
+# Application routes, built once at import (static files route added per app)
+_ROUTES: Tuple[Route, ...] = (
+    (r"/", MainHandler, None),
+    (r"/login/?", LoginHandler, None),
+    (r"/logout/?", LogoutHandler, None),
+    (r"/version/?", VersionHandler, None),
+    (r"/api/config/main/?", ConfigMainHandler, None),
+    (r"/api/config/list/?", ConfigListHandler, None),
+    # Camera routes
+    (r"/api/config/camera/add/?", CameraAddHandler, None),
+    (r"/api/config/camera/(?P<camera_id>[\w-]+)/sections/?", CameraConfigSectionsHandler, None),
+    (r"/api/config/camera/(?P<camera_id>[\w-]+)/?", ConfigCameraHandler, None),
+    (r"/api/config/camera/(?P<camera_id>[\w-]+)/delete/?", CameraDeleteHandler, None),
+    (r"/api/cameras/detect/?", CameraDetectHandler, None),
+    (r"/api/cameras/capabilities/(?P<device_path>.+)/?", CameraCapabilitiesHandler, None),
+    (r"/api/cameras/controls/(?P<device_path>.+)/?", CameraControlsHandler, None),
+    (r"/api/cameras/filters/?", CameraFilterPatternsHandler, None),
+    # Audio routes
+    (r"/api/config/audio/add/?", AudioAddHandler, None),
+    (r"/api/config/audio/list/?", AudioListHandler, None),
+    (r"/api/config/audio/(?P<audio_id>[\w-]+)/sections/?", AudioConfigSectionsHandler, None),
+    (r"/api/config/audio/(?P<audio_id>[\w-]+)/?", AudioConfigHandler, None),
+    (r"/api/config/audio/(?P<audio_id>[\w-]+)/delete/?", AudioDeleteHandler, None),
+    (r"/api/audio/detect/?", AudioDetectHandler, None),
+    (r"/api/audio/filters/?", AudioFilterPatternsHandler, None),
+    # RTSP routes
+    (r"/api/rtsp/?", RTSPStatusHandler, None),
+    (r"/api/rtsp/(?P<camera_id>[\w-]+)/?", RTSPStreamHandler, None),
+    # HLS proxy route (proxies to MediaMTX on port 8888)
+    (r"/hls/(?P<path>.*)/?", HLSProxyHandler, None),
+    # Other API routes
+    (r"/api/mjpeg/?", MJPEGControlHandler, None),
+    (r"/api/meeting/?", MeetingHandler, None),
+    (r"/api/logging/?", LoggingConfigHandler, None),
+    (r"/api/update/?", UpdateHandler, None),
+    (r"/api/service/restart/?", ServiceRestartHandler, None),
+    (r"/api/logs/download/?", LogDownloadHandler, None),
+    # User management routes
+    (r"/api/user/me/?", CurrentUserHandler, None),
+    (r"/api/user/password/?", PasswordChangeHandler, None),
+    (r"/api/users/?", UserHandler, None),
+    (r"/api/users/reset-password/?", UserPasswordResetHandler, None),
+    (r"/api/users/enable/?", UserEnableHandler, None),
+    (r"/health/?", HealthHandler, None),
+    (r"/frame/(?P<camera_id>[\w-]+)/?", FrameHandler, None),
+    (r"/stream/(?P<camera_id>[\w-]+)/?", MJPEGStreamHandler, None),
+)
+
+
 def _build_routes(static_path: Path) -> Sequence[Route]:
-    return [
-        (r"/", MainHandler, None),
-        (r"/login/?", LoginHandler, None),
-        (r"/logout/?", LogoutHandler, None),
-        (r"/version/?", VersionHandler, None),
-        (r"/api/config/main/?", ConfigMainHandler, None),
-        (r"/api/config/list/?", ConfigListHandler, None),
-        # Camera routes
-        (r"/api/config/camera/add/?", CameraAddHandler, None),
-        (r"/api/config/camera/(?P<camera_id>[\w-]+)/sections/?", CameraConfigSectionsHandler, None),
-        (r"/api/config/camera/(?P<camera_id>[\w-]+)/?", ConfigCameraHandler, None),
-        (r"/api/config/camera/(?P<camera_id>[\w-]+)/delete/?", CameraDeleteHandler, None),
-        (r"/api/cameras/detect/?", CameraDetectHandler, None),
-        (r"/api/cameras/capabilities/(?P<device_path>.+)/?", CameraCapabilitiesHandler, None),
-        (r"/api/cameras/controls/(?P<device_path>.+)/?", CameraControlsHandler, None),
-        (r"/api/cameras/filters/?", CameraFilterPatternsHandler, None),
-        # Audio routes
-        (r"/api/config/audio/add/?", AudioAddHandler, None),
-        (r"/api/config/audio/list/?", AudioListHandler, None),
-        (r"/api/config/audio/(?P<audio_id>[\w-]+)/sections/?", AudioConfigSectionsHandler, None),
-        (r"/api/config/audio/(?P<audio_id>[\w-]+)/?", AudioConfigHandler, None),
-        (r"/api/config/audio/(?P<audio_id>[\w-]+)/delete/?", AudioDeleteHandler, None),
-        (r"/api/audio/detect/?", AudioDetectHandler, None),
-        (r"/api/audio/filters/?", AudioFilterPatternsHandler, None),
-        # RTSP routes
-        (r"/api/rtsp/?", RTSPStatusHandler, None),
-        (r"/api/rtsp/(?P<camera_id>[\w-]+)/?", RTSPStreamHandler, None),
-        # HLS proxy route (proxies to MediaMTX on port 8888)
-        (r"/hls/(?P<path>.*)/?", HLSProxyHandler, None),
-        # Other API routes
-        (r"/api/mjpeg/?", MJPEGControlHandler, None),
-        (r"/api/meeting/?", MeetingHandler, None),
-        (r"/api/logging/?", LoggingConfigHandler, None),
-        (r"/api/update/?", UpdateHandler, None),
-        (r"/api/service/restart/?", ServiceRestartHandler, None),
-        (r"/api/logs/download/?", LogDownloadHandler, None),
-        # User management routes
-        (r"/api/user/me/?", CurrentUserHandler, None),
-        (r"/api/user/password/?", PasswordChangeHandler, None),
-        (r"/api/users/?", UserHandler, None),
-        (r"/api/users/reset-password/?", UserPasswordResetHandler, None),
-        (r"/api/users/enable/?", UserEnableHandler, None),
-        (r"/health/?", HealthHandler, None),
-        (r"/frame/(?P<camera_id>[\w-]+)/?", FrameHandler, None),
-        (r"/stream/(?P<camera_id>[\w-]+)/?", MJPEGStreamHandler, None),
+    return _ROUTES + (
         (
             r"/static/(.*)",
             tornado.web.StaticFileHandler,
             {"path": str(static_path)},
         ),
-    ]
+    )
 
 
 def build_application(settings: ServerSettings, config_store: Optional[ConfigStore] = None) -> tornado.web.Application:
@@ -144,7 +157,12 @@ def build_application(settings: ServerSettings, config_store: Optional[ConfigSto
         raise FileNotFoundError(f"Static directory missing: {settings.static_path}")
 
     store = config_store or ConfigStore()
-    jinja_env = build_environment(settings.template_path)
+    jinja_env = build_environment(
+        settings.template_path,
+        auto_reload=settings.environment != "production",
+    )
+    if settings.environment == "production":
+        precompile(jinja_env)
     version = _detect_version(settings.changelog_path)
 
     app_settings = {
@@ -157,6 +175,7 @@ def build_application(settings: ServerSettings, config_store: Optional[ConfigSto
         "git_commit": settings.environment,
         "cookie_secret": "motion_frontend_dev_secret_change_in_production_2024",
         "login_url": "/login",
+        "log_accel_redirect": settings.log_accel_redirect,
     }
     routes = _build_routes(settings.static_path)
     return tornado.web.Application(routes, **app_settings)
@@ -172,6 +191,7 @@ def _parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
     parser.add_argument("--changelog", default="CHANGELOG.md", help="Relative or absolute changelog path")
     parser.add_argument("--environment", default="development", help="Environment label (development/production/staging)")
     parser.add_argument("--log-level", default="INFO", choices=["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"], help="Python logging level")
+    parser.add_argument("--log-accel-redirect", default="", help="nginx internal location serving the logs directory (e.g. /_internal_logs/); enables X-Accel-Redirect log downloads", metavar="PREFIX")
     return parser.parse_args(argv)
 
 
@@ -274,11 +294,18 @@ def _attach_signal_handlers(server: tornado.httpserver.HTTPServer, loop: tornado
             svc = meeting_service.get_meeting_service()
             if svc:
                 logging.info("Stopping Meeting service...")
-                svc.stop()
-                logging.info("Meeting service stopped")
+                # stop() is a coroutine (cancels the heartbeat, closes the pooled session)
+                loop.add_callback(svc.stop)
         except Exception as e:
             logging.error("Error stopping Meeting service: %s", e)
-        
+
+        # Close the shared HLS proxy session (keep-alive pool to MediaMTX)
+        try:
+            from .handlers import close_hls_session
+            loop.add_callback(close_hls_session)
+        except Exception as e:
+            logging.error("Error closing HLS proxy session: %s", e)
+
         # Now stop the HTTP server
         server.stop()
         logging.info("HTTP server stopped, scheduling IOLoop stop...")
@@ -300,6 +327,8 @@ async def _start_rtsp_streams_on_boot(config_store: ConfigStore) -> None:
     import platform
     
     rtsp = rtsp_server.get_rtsp_server()
+    # Warm the FFmpeg capability cache in the executor (status handlers read it)
+    await rtsp.load_caps()
     if not rtsp.is_ffmpeg_available():
         logging.warning("FFmpeg not available, skipping RTSP auto-start")
         return
@@ -405,8 +434,14 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         static_path=_resolve_path(root, args.static_path),
         environment=args.environment,
         changelog_path=_resolve_path(root, args.changelog),
+        log_accel_redirect=args.log_accel_redirect,
     )
 
+    # Must run before anything creates the IOLoop (HTTPServer.listen does)
+    if UVLOOP_AVAILABLE:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logging.info("Using uvloop event loop")
+
     app = build_application(settings, config_store)
     server = tornado.httpserver.HTTPServer(app)
     server.listen(settings.port, address=settings.host)
@@ -1,4 +1,4 @@
-# File Version: 0.1.0
+# File Version: 0.1.1
 from __future__ import annotations
 
 import os
@@ -15,6 +15,8 @@ class ServerSettings:
     static_path: Path = Path("static")
     environment: str = "development"
     changelog_path: Path = Path("CHANGELOG.md")
+    # nginx internal location serving logs/ (enables X-Accel-Redirect log downloads)
+    log_accel_redirect: str = ""
 
     @classmethod
     def from_env(cls, base_path: Optional[Path] = None) -> "ServerSettings":
@@ -26,4 +28,5 @@ class ServerSettings:
             static_path=root / os.getenv("MFE_STATIC_PATH", "static"),
             environment=os.getenv("MFE_ENV", "development"),
             changelog_path=root / os.getenv("MFE_CHANGELOG", "CHANGELOG.md"),
+            log_accel_redirect=os.getenv("MFE_LOG_ACCEL_REDIRECT", ""),
         )
@@ -1,4 +1,4 @@
-# File Version: 1.2.0
+# File Version: 1.2.1
 """
 GitHub Update Module for Motion Frontend.
 
@@ -25,6 +25,7 @@ import shutil
 import subprocess
 import sys
 import tempfile
+import time
 import zipfile
 from dataclasses import dataclass
 from datetime import datetime
@@ -46,6 +47,10 @@ GITHUB_SOURCE_ZIP_URL = f"https://github.com/{GITHUB_OWNER}/{GITHUB_REPO}/archiv
 # Project root (where the updater should operate)
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
+# Cache TTLs (seconds) for GitHub lookups, to absorb frontend polling
+UPDATE_CHECK_CACHE_TTL = 60
+SOURCE_CHECK_CACHE_TTL = 300
+
 
 @dataclass
 class SourceInfo:
@@ -204,17 +209,33 @@ def compare_versions(v1: str, v2: str) -> int:
     return -1 if parsed1[3] < parsed2[3] else 1
 
 
+# (mtime_ns, version) of the last CHANGELOG.md parse
+_version_cache: Optional[Tuple[int, str]] = None
+
+
 def get_current_version() -> str:
-    """Get the current version from CHANGELOG.md."""
+    """Get the current version from CHANGELOG.md.
+    
+    The parsed version is cached against the file's mtime, so a changelog
+    replaced by an update is picked up immediately at the cost of one stat().
+    """
+    global _version_cache
     changelog_path = PROJECT_ROOT / "CHANGELOG.md"
     try:
+        mtime_ns = changelog_path.stat().st_mtime_ns
+        if _version_cache is not None and _version_cache[0] == mtime_ns:
+            return _version_cache[1]
+        version = "0.0.0"
         with changelog_path.open("r", encoding="utf-8") as f:
             for line in f:
                 line = line.strip()
                 if line.startswith("## "):
                     parts = line.split()
                     if len(parts) >= 2:
-                        return parts[1]
+                        version = parts[1]
+                        break
+        _version_cache = (mtime_ns, version)
+        return version
     except FileNotFoundError:
         logger.warning("CHANGELOG.md not found at %s", changelog_path)
     return "0.0.0"
@@ -738,6 +759,16 @@ async def perform_update(include_prereleases: bool = False, auto_restart: bool =
 _updater_lock = asyncio.Lock() if hasattr(asyncio, 'Lock') else None
 _update_in_progress = False
 
+# Successful check results: key -> (expiry, result)
+_update_check_cache: Dict[bool, Tuple[float, UpdateCheckResult]] = {}
+_source_check_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
+def clear_check_caches() -> None:
+    """Drop cached update/source check results (e.g. after an update)."""
+    _update_check_cache.clear()
+    _source_check_cache.clear()
+
 
 async def get_update_status() -> Dict[str, Any]:
     """Get current update status."""
@@ -760,9 +791,17 @@ async def trigger_update_check(include_prereleases: bool = False) -> UpdateCheck
         
     Returns:
         UpdateCheckResult with update information.
+        Successful results are cached for UPDATE_CHECK_CACHE_TTL seconds.
     """
+    cached = _update_check_cache.get(include_prereleases)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    
     loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, check_for_updates, include_prereleases)
+    result = await loop.run_in_executor(None, check_for_updates, include_prereleases)
+    if not result.error:
+        _update_check_cache[include_prereleases] = (time.monotonic() + UPDATE_CHECK_CACHE_TTL, result)
+    return result
 
 
 async def trigger_update(include_prereleases: bool = False) -> UpdateResult:
@@ -789,7 +828,10 @@ async def trigger_update(include_prereleases: bool = False) -> UpdateResult:
     
     try:
         _update_in_progress = True
-        return await perform_update(include_prereleases)
+        result = await perform_update(include_prereleases)
+        if result.success:
+            clear_check_caches()
+        return result
     finally:
         _update_in_progress = False
 
@@ -1060,7 +1102,10 @@ async def trigger_source_update(branch: str = GITHUB_DEFAULT_BRANCH) -> UpdateRe
     
     try:
         _update_in_progress = True
-        return await perform_source_update(branch)
+        result = await perform_source_update(branch)
+        if result.success:
+            clear_check_caches()
+        return result
     finally:
         _update_in_progress = False
 
@@ -1074,6 +1119,14 @@ async def trigger_source_check(branch: str = GITHUB_DEFAULT_BRANCH) -> Dict[str,
         
     Returns:
         Dictionary with source information.
+        Successful results are cached per branch for SOURCE_CHECK_CACHE_TTL seconds.
     """
+    cached = _source_check_cache.get(branch)
+    if cached and cached[0] > time.monotonic():
+        return dict(cached[1])
+    
     loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, check_source_updates, branch)
\ No newline at end of file
+    result = await loop.run_in_executor(None, check_source_updates, branch)
+    if not result.get("error"):
+        _source_check_cache[branch] = (time.monotonic() + SOURCE_CHECK_CACHE_TTL, result)
+    return dict(result)
\ No newline at end of file
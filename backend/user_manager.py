@@ -3,7 +3,7 @@
 User management module for Motion Frontend.
 Handles user authentication, password hashing with bcrypt, and user CRUD operations.
 
-Version: 0.1.0
+Version: 0.1.2
 """
 
 import json
@@ -104,6 +104,8 @@ class UserManager:
         self._users_path = users_path or self.DEFAULT_USERS_PATH
         self._users: Dict[str, User] = {}
         self._dirty = False
+        # Serialized list_users() payload, reset on every save (all mutations save)
+        self._users_json: Optional[bytes] = None
         
         self._load_users()
         
@@ -127,6 +129,10 @@ class UserManager:
     
     def _save_users(self) -> None:
         """Save users to JSON file."""
+        self._users_json = None
+        # A disabled/deleted user or a new password must not ride on a cached stream login
+        from .mjpeg_server import invalidate_auth_cache
+        invalidate_auth_cache()
         try:
             self._users_path.parent.mkdir(parents=True, exist_ok=True)
             data = {
@@ -320,6 +326,12 @@ class UserManager:
         """List all users (without password hashes)."""
         return [user.to_dict() for user in self._users.values()]
     
+    def list_users_json(self) -> bytes:
+        """Return ``{"users": list_users()}`` as encoded JSON, cached until the next change."""
+        if self._users_json is None:
+            self._users_json = json.dumps({"users": self.list_users()}).encode()
+        return self._users_json
+    
     def create_user(
         self,
         username: str,
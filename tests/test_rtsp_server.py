@@ -0,0 +1,70 @@
+"""Tests for RTSP publisher sharing in backend.rtsp_server."""
+
+import asyncio
+import sys
+import unittest
+from unittest import mock
+
+from backend import rtsp_server
+
+
+class SharedPublisherTests(unittest.TestCase):
+    """Publishers are only shared between configs that produce the same output."""
+
+    def setUp(self) -> None:
+        self.server = rtsp_server.RTSPServer()
+
+        async def port_open(port, timeout=0.05):
+            return True
+
+        # MediaMTX "already listening" and Motion not running: no systemctl calls
+        self.server._probe_rtsp_port = port_open
+        patcher = mock.patch("backend.system_info.is_motion_running", return_value=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Stand-in publisher: a process that stays alive until terminated
+        self.server._build_ffmpeg_command = lambda config: (
+            [sys.executable, "-c", "import time; time.sleep(30)"], False
+        )
+
+    def _config(self, camera_id: str, rtsp_path: str) -> rtsp_server.RTSPStreamConfig:
+        return rtsp_server.RTSPStreamConfig(
+            camera_id=camera_id,
+            camera_device="/dev/video0",
+            camera_name="Webcam",
+            rtsp_port=8554,
+            rtsp_path=rtsp_path,
+        )
+
+    def test_different_paths_get_separate_publishers(self) -> None:
+        async def scenario():
+            first = await self.server.start_stream(self._config("1", "/cam1"))
+            second = await self.server.start_stream(self._config("2", "/cam2"))
+            running = (first.is_running, second.is_running)
+            await self.server.stop_all_streams()
+            return first, second, running
+
+        first, second, running = asyncio.run(scenario())
+        self.assertEqual(running, (True, True))
+        self.assertNotEqual(first.pid, second.pid)
+        self.assertTrue(first.rtsp_url.endswith("/cam1"))
+        self.assertTrue(second.rtsp_url.endswith("/cam2"))
+
+    def test_identical_output_shares_publisher(self) -> None:
+        async def scenario():
+            first = await self.server.start_stream(self._config("1", "/cam1"))
+            second = await self.server.start_stream(self._config("2", "/cam1"))
+            refcount = self.server._streams["1"].refcount
+            await self.server.stop_stream("1")
+            still_running = self.server._streams["2"].process.returncode is None
+            await self.server.stop_all_streams()
+            return first, second, refcount, still_running
+
+        first, second, refcount, still_running = asyncio.run(scenario())
+        self.assertEqual(first.pid, second.pid)
+        self.assertEqual(refcount, 2)
+        self.assertTrue(still_running)
+
+
+if __name__ == "__main__":
+    unittest.main()
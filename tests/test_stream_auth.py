@@ -0,0 +1,52 @@
+"""Tests for the stream login cache in backend.mjpeg_server."""
+
+import base64
+import tempfile
+import unittest
+from pathlib import Path
+
+from backend import mjpeg_server
+from backend.user_manager import UserManager
+
+
+def _basic(username: str, password: str) -> str:
+    token = base64.b64encode(f"{username}:{password}".encode("utf-8")).decode("ascii")
+    return f"Basic {token}"
+
+
+class StreamAuthCacheTests(unittest.TestCase):
+    """A cached stream login never outlives a change to the user store."""
+
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.users = UserManager(Path(tmp.name) / "users.json")
+        self.users.create_user("viewer1", "secret-pass")
+        mjpeg_server.invalidate_auth_cache()
+        self.addCleanup(mjpeg_server.invalidate_auth_cache)
+        self.camera = mjpeg_server.CameraStream(
+            camera_id="1",
+            device_path="0",
+            stream_auth_enabled=True,
+            stream_auth_verify=self.users.verify_credentials,
+        )
+
+    def test_disabled_user_rejected_on_next_request(self) -> None:
+        header = _basic("viewer1", "secret-pass")
+        self.assertTrue(mjpeg_server._check_stream_auth(self.camera, header))
+
+        self.users.update_user("viewer1", enabled=False)
+
+        self.assertFalse(mjpeg_server._check_stream_auth(self.camera, header))
+
+    def test_deleted_user_rejected_on_next_request(self) -> None:
+        header = _basic("viewer1", "secret-pass")
+        self.assertTrue(mjpeg_server._check_stream_auth(self.camera, header))
+
+        self.users.delete_user("viewer1")
+
+        self.assertFalse(mjpeg_server._check_stream_auth(self.camera, header))
+
+
+if __name__ == "__main__":
+    unittest.main()